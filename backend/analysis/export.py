@@ -0,0 +1,188 @@
+"""
+列式运行导出 (供离线分析)
+
+每轮模拟导出到 <root>/<时间>_<流量文件名>/ 目录:
+- meta.json            楼宇信息、控制器、流量文件、最终指标、各表的分块数与列编码
+- ticks_00000.npz ...  每 tick 每部电梯一行: 位置、目标楼层、运行状态、方向、载客数
+- floors_00000.npz ... 每 tick 每层一行: 上行/下行候梯人数
+- passengers_00000.npz ... 每位乘客一行: 起止楼层、到达/上车/下车 tick、电梯、状态 (下车时写入, 轮末补齐未完成者)
+各表按列缓存, 每 chunk_rows 行写出一个压缩的 NumPy 分块, 内存占用与运行长度无关。
+numpy 只在第一次写分块时导入, 未启用导出时后端不会加载任何分析库。
+"""
+import json
+import os
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from elevator_saga.core.models import Direction, ElevatorStatus, PassengerStatus
+
+RUN_STATUS_CODES = {
+    ElevatorStatus.STOPPED: 0,
+    ElevatorStatus.START_UP: 1,
+    ElevatorStatus.CONSTANT_SPEED: 2,
+    ElevatorStatus.START_DOWN: 3,
+}
+DIRECTION_CODES = {Direction.STOPPED: 0, Direction.UP: 1, Direction.DOWN: -1}
+PASSENGER_STATUS_CODES = {
+    PassengerStatus.WAITING: 0,
+    PassengerStatus.IN_ELEVATOR: 1,
+    PassengerStatus.COMPLETED: 2,
+    PassengerStatus.CANCELLED: 3,
+}
+
+# 表名 -> {列名: dtype}
+TABLES = {
+    "ticks": {"tick": "int32", "elevator": "int16", "position": "float32", "target_floor": "int16",
+              "run_status": "int8", "direction": "int8", "load": "int16"},
+    "floors": {"tick": "int32", "floor": "int16", "up_waiting": "int16", "down_waiting": "int16"},
+    "passengers": {"id": "int32", "origin": "int16", "destination": "int16", "arrive_tick": "int32",
+                   "pickup_tick": "int32", "dropoff_tick": "int32", "elevator": "int16", "status": "int8"},
+}
+
+
+class ColumnChunkWriter(object):
+    """按列缓存行, 每 chunk_rows 行写出一个压缩分块 <name>_00000.npz, <name>_00001.npz, ..."""
+
+    def __init__(self, directory: str, name: str, columns: Dict[str, str], chunk_rows: int = 50000):
+        self.directory = directory
+        self.name = name
+        self.columns = columns
+        self.chunk_rows = chunk_rows
+        self.rows = 0
+        self.chunks = 0
+        self._data: List[List[Any]] = [[] for _ in columns]
+
+    def append(self, *values) -> None:
+        for column, value in zip(self._data, values):
+            column.append(value)
+        if len(self._data[0]) >= self.chunk_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._data[0]:
+            return
+        import numpy as np
+
+        arrays = {name: np.asarray(values, dtype=dtype)
+                  for (name, dtype), values in zip(self.columns.items(), self._data)}
+        np.savez_compressed(os.path.join(self.directory, f"{self.name}_{self.chunks:05d}.npz"), **arrays)
+        self.rows += len(self._data[0])
+        self.chunks += 1
+        self._data = [[] for _ in self.columns]
+
+
+def load_table(run_dir: str, name: str) -> Dict[str, Any]:
+    """读取并拼接一张表的全部分块, 返回 {列名: numpy 数组}"""
+    import numpy as np
+
+    chunks = sorted(f for f in os.listdir(run_dir) if f.startswith(name + "_") and f.endswith(".npz"))
+    columns = TABLES[name]
+    if not chunks:
+        return {column: np.empty(0, dtype=dtype) for column, dtype in columns.items()}
+    parts = [np.load(os.path.join(run_dir, f)) for f in chunks]
+    return {column: np.concatenate([part[column] for part in parts]) for column in columns}
+
+
+def load_meta(run_dir: str) -> Dict[str, Any]:
+    with open(os.path.join(run_dir, "meta.json"), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _traffic_name(traffic_info: Optional[Dict[str, Any]]) -> str:
+    """模拟器只报告流量文件下标, 按模拟器的顺序 (文件名排序) 还原文件名"""
+    if not traffic_info or "current_index" not in traffic_info:
+        return "unknown"
+    index = int(traffic_info["current_index"])
+    from tuning.runner import list_traffic_files
+
+    files = list_traffic_files()
+    return files[index].stem if 0 <= index < len(files) else f"traffic{index}"
+
+
+class RunExporter(object):
+    """由控制器基类在 on_init / 每 tick / 乘客下车 / 轮末调用"""
+
+    def __init__(self, root_dir: str, chunk_rows: int = 50000):
+        self.root_dir = root_dir
+        self.chunk_rows = chunk_rows
+        self.run_dir: Optional[str] = None
+        self.meta: Dict[str, Any] = {}
+        self.writers: Dict[str, ColumnChunkWriter] = {}
+
+    @property
+    def active(self) -> bool:
+        return self.run_dir is not None
+
+    def start_run(self, controller_name: str, building: Dict[str, Any], traffic_info: Optional[Dict[str, Any]]) -> None:
+        self.close()
+        traffic = _traffic_name(traffic_info)
+        run_dir = os.path.join(self.root_dir, f"{time.strftime('%Y%m%d-%H%M%S')}_{traffic}")
+        suffix = 1
+        while os.path.exists(run_dir):
+            suffix += 1
+            run_dir = os.path.join(self.root_dir, f"{time.strftime('%Y%m%d-%H%M%S')}_{traffic}_{suffix}")
+        os.makedirs(run_dir)
+        self.run_dir = run_dir
+        self.writers = {name: ColumnChunkWriter(run_dir, name, columns, self.chunk_rows) for name, columns in TABLES.items()}
+        self.meta = {
+            "controller": controller_name,
+            "traffic": traffic,
+            "building": dict(building),
+            "started_at": time.time(),
+            "finished": False,
+            "metrics": None,
+            "codes": {
+                "run_status": {status.value: code for status, code in RUN_STATUS_CODES.items()},
+                "direction": {direction.value: code for direction, code in DIRECTION_CODES.items()},
+                "passenger_status": {status.value: code for status, code in PASSENGER_STATUS_CODES.items()},
+            },
+        }
+        self._write_meta()
+        print(f"导出本轮运行数据到 {run_dir}")
+
+    def record_tick(self, tick: int, state) -> None:
+        """state: SimulationState"""
+        if not self.active:
+            return
+        ticks = self.writers["ticks"]
+        for e in state.elevators:
+            ticks.append(tick, e.id, e.current_floor_float, e.target_floor, RUN_STATUS_CODES.get(e.run_status, -1),
+                         DIRECTION_CODES.get(e.target_floor_direction, 0), len(e.passengers))
+        floors = self.writers["floors"]
+        for f in state.floors:
+            floors.append(tick, f.floor, len(f.up_queue), len(f.down_queue))
+
+    def record_passenger(self, record) -> None:
+        """record: scene_records.PassengerRecord"""
+        if not self.active or record is None:
+            return
+        self.writers["passengers"].append(
+            record.id, record.origin, record.destination, record.arrive_tick, record.pickup_tick, record.dropoff_tick,
+            -1 if record.elevator_id is None else record.elevator_id, PASSENGER_STATUS_CODES[record.status],
+        )
+
+    def finish_run(self, unfinished_passengers: Iterable, metrics: Dict[str, Any]) -> None:
+        """补齐未完成的乘客, 写出剩余分块和最终指标"""
+        if not self.active:
+            return
+        for record in unfinished_passengers:
+            self.record_passenger(record)
+        self.meta["finished"] = True
+        self.meta["metrics"] = dict(metrics)
+        self.close()
+
+    def close(self) -> None:
+        """写出剩余分块并结束本轮导出 (中途结束的运行 meta.json 中 finished 为 false)"""
+        if not self.active:
+            return
+        for writer in self.writers.values():
+            writer.flush()
+        self.meta["tables"] = {name: {"rows": w.rows, "chunks": w.chunks, "columns": w.columns}
+                               for name, w in self.writers.items()}
+        self._write_meta()
+        self.run_dir = None
+        self.writers = {}
+
+    def _write_meta(self) -> None:
+        with open(os.path.join(self.run_dir, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(self.meta, f, indent=2, ensure_ascii=False)
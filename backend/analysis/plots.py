@@ -0,0 +1,115 @@
+"""
+运行报告: 读取 analysis.export 导出的运行目录, 生成候梯/到达时间分布和电梯利用率图表。
+pandas / matplotlib / seaborn 只在生成报告时导入。
+"""
+import os
+from typing import Any, Dict, List, Tuple
+
+from .export import load_meta, load_table
+
+
+def _import_analytics():
+    try:
+        import matplotlib
+
+        matplotlib.use("Agg")  # 无显示环境下直接写文件
+        import matplotlib.pyplot as plt
+        import pandas as pd
+        import seaborn as sns
+    except ImportError as e:
+        raise RuntimeError(f"Reports require pandas, matplotlib and seaborn ({e}): pip install -r requirements.txt")
+    return pd, plt, sns
+
+
+def load_run(run_dir: str) -> Tuple[Dict[str, Any], Any, Any]:
+    """返回 (meta, 乘客表, 电梯 tick 表), 表为 pandas.DataFrame"""
+    pd, _, _ = _import_analytics()
+    meta = load_meta(run_dir)
+    passengers = pd.DataFrame(load_table(run_dir, "passengers"))
+    ticks = pd.DataFrame(load_table(run_dir, "ticks"))
+    return meta, passengers, ticks
+
+
+def run_label(run_dir: str, meta: Dict[str, Any]) -> str:
+    return f"{meta.get('traffic', '?')} ({meta.get('controller', '?')}, {os.path.basename(os.path.normpath(run_dir))})"
+
+
+def wait_times(passengers, completed_code: int):
+    """已完成乘客的候梯时间 (上车 - 到达) 与到达时间 (下车 - 到达)"""
+    done = passengers[passengers["status"] == completed_code]
+    return done.assign(
+        floor_wait=done["pickup_tick"] - done["arrive_tick"],
+        arrival_wait=done["dropoff_tick"] - done["arrive_tick"],
+    )
+
+
+def utilization(ticks, capacity: int, stopped_code: int):
+    """每部电梯: 运行中的 tick 占比、平均满载率、停靠次数 (由运行变为停止的次数)"""
+    rows = []
+    for elevator, group in ticks.sort_values("tick").groupby("elevator"):
+        moving = group["run_status"] != stopped_code
+        stops = int((moving.shift(fill_value=False) & ~moving).sum())
+        rows.append({
+            "elevator": int(elevator),
+            "busy_ratio": float(moving.mean()) if len(group) else 0.0,
+            "load_ratio": float(group["load"].mean() / capacity) if len(group) and capacity else 0.0,
+            "stops": stops,
+        })
+    return rows
+
+
+def _save(fig, axes, sns, plt, path: str) -> None:
+    """两个子图共用一个图例, 放在图外右侧以免遮挡数据"""
+    axes[0].get_legend().remove()
+    sns.move_legend(axes[1], "upper left", bbox_to_anchor=(1.02, 1), title="run")
+    fig.tight_layout()
+    fig.savefig(path, dpi=120, bbox_inches="tight")
+    plt.close(fig)
+
+
+def generate_report(run_dirs: List[str], output_dir: str) -> List[str]:
+    """为若干次运行生成对比报告, 返回写出的文件列表"""
+    pd, plt, sns = _import_analytics()
+    os.makedirs(output_dir, exist_ok=True)
+
+    waits, usage, summary = [], [], []
+    for run_dir in run_dirs:
+        meta, passengers, ticks = load_run(run_dir)
+        label = run_label(run_dir, meta)
+        codes = meta["codes"]
+        waits.append(wait_times(passengers, codes["passenger_status"]["completed"]).assign(run=label))
+        capacity = meta["building"].get("elevator_capacity") or 0
+        for row in utilization(ticks, capacity, codes["run_status"]["stopped"]):
+            usage.append({"run": label, **row})
+        summary.append({"run": label, "finished": meta.get("finished"), **(meta.get("metrics") or {})})
+
+    written = []
+    wait_df = pd.concat(waits, ignore_index=True) if waits else pd.DataFrame()
+    if not wait_df.empty:
+        fig, axes = plt.subplots(1, 2, figsize=(12, 4.5))
+        for ax, column, title in ((axes[0], "floor_wait", "Floor wait (ticks)"),
+                                  (axes[1], "arrival_wait", "Arrival wait (ticks)")):
+            sns.histplot(data=wait_df, x=column, hue="run", element="step", stat="density", common_norm=False, ax=ax)
+            ax.set_title(title)
+        path = os.path.join(output_dir, "wait_time_distribution.png")
+        _save(fig, axes, sns, plt, path)
+        written.append(path)
+
+    usage_df = pd.DataFrame(usage)
+    if not usage_df.empty:
+        fig, axes = plt.subplots(1, 2, figsize=(12, 4.5))
+        sns.barplot(data=usage_df, x="elevator", y="busy_ratio", hue="run", ax=axes[0])
+        axes[0].set_title("Share of ticks moving")
+        sns.barplot(data=usage_df, x="elevator", y="load_ratio", hue="run", ax=axes[1])
+        axes[1].set_title("Mean load / capacity")
+        path = os.path.join(output_dir, "car_utilization.png")
+        _save(fig, axes, sns, plt, path)
+        written.append(path)
+        path = os.path.join(output_dir, "car_utilization.csv")
+        usage_df.to_csv(path, index=False)
+        written.append(path)
+
+    path = os.path.join(output_dir, "summary.csv")
+    pd.DataFrame(summary).to_csv(path, index=False)
+    written.append(path)
+    return written
@@ -0,0 +1,110 @@
+import argparse
+import json
+import sys
+
+from controller import CONTROLLERS
+from tuning.cache import ResultCache
+from tuning.runner import Evaluator
+
+COLUMNS = ["completed_passengers", "total_passengers", "average_arrival_wait_time", "average_floor_wait_time",
+           "p95_arrival_wait_time", "cost_total"]
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Elevator Saga controller benchmark (cached regression run)")
+    parser.add_argument(
+        "--controller", choices=sorted(CONTROLLERS), default="scan", help="Controller to benchmark (default: scan)"
+    )
+    parser.add_argument(
+        "--params", type=str, default="{}", help="Controller policy parameters as JSON (default: {})"
+    )
+    parser.add_argument(
+        "--traffic", type=str, default="", help="Comma separated traffic file names (default: all)"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=4, help="Parallel simulators (default: 4)"
+    )
+    parser.add_argument(
+        "--base_port", type=int, default=9000, help="Worker i uses ports base_port+2i and base_port+2i+1 (default: 9000)"
+    )
+    parser.add_argument(
+        "--cache", type=str, default="result_cache.sqlite3", help="Result cache file (default: result_cache.sqlite3)"
+    )
+    parser.add_argument(
+        "--cache_size", type=int, default=10000, help="Max cached results, least recently used are evicted (default: 10000)"
+    )
+    parser.add_argument(
+        "--no_cache", action="store_true", help="Always simulate, ignoring and not updating the cache"
+    )
+    parser.add_argument(
+        "--output", type=str, default="", help="Write the per-traffic metrics as JSON to this file"
+    )
+    parser.add_argument(
+        "--baseline", type=str, default="", help="JSON written by a previous --output run to compare against"
+    )
+    parser.add_argument(
+        "--max_regression", type=float, default=None,
+        help="Exit with status 1 if average_arrival_wait_time of any traffic file is worse than the baseline by more than this many percent"
+    )
+    return parser.parse_args()
+
+def print_table(results, baseline):
+    print(f"{'traffic':<20}" + "".join(f"{c:>28}" for c in COLUMNS))
+    for name, metrics in results.items():
+        if metrics is None:
+            print(f"{name:<20}  FAILED")
+            continue
+        cells = []
+        for column in COLUMNS:
+            value = metrics.get(column, float("nan"))
+            cell = f"{value:.2f}"
+            if baseline.get(name) and column in baseline[name]:
+                cell += f" ({value - baseline[name][column]:+.2f})"
+            cells.append(f"{cell:>28}")
+        print(f"{name:<20}" + "".join(cells))
+
+def regressions(results, baseline, max_regression):
+    """average_arrival_wait_time 比基线差超过 max_regression% 的流量文件"""
+    worse = []
+    for name, metrics in results.items():
+        base = baseline.get(name)
+        if metrics is None or not base:
+            continue
+        before, after = base["average_arrival_wait_time"], metrics["average_arrival_wait_time"]
+        if before > 0 and (after - before) / before * 100 > max_regression:
+            worse.append(name)
+    return worse
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    cache = None if args.no_cache else ResultCache(args.cache, max_entries=args.cache_size)
+    traffic = [name.strip() for name in args.traffic.split(",") if name.strip()]
+    evaluator = Evaluator(args.controller, traffic, workers=args.workers, base_port=args.base_port, cache=cache)
+    try:
+        results = evaluator.run([json.loads(args.params)])[0]
+    finally:
+        evaluator.close()
+        if cache is not None:
+            cache.close()
+    print(f"\n{args.controller} {args.params}: 模拟 {evaluator.simulated} 个流量文件，"
+          f"缓存命中 {cache.hits if cache is not None else 0} 个 (控制器指纹 {evaluator.fingerprint})")
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_table(results, baseline)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    exit_code = 0
+    if any(metrics is None for metrics in results.values()):
+        exit_code = 1
+    if baseline and args.max_regression is not None:
+        worse = regressions(results, baseline, args.max_regression)
+        if worse:
+            print(f"回归: {worse} 的 average_arrival_wait_time 比基线差超过 {args.max_regression}%")
+            exit_code = 1
+    sys.exit(exit_code)
@@ -0,0 +1,135 @@
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from flask import Flask, Response, request
+
+from scene.state_convert import convert_simulator_state
+from scene.wait_histogram import WaitTimeHistogram
+
+
+class StateGateway(object):
+    """
+    HTTP 轮询模式的状态网关。
+
+    后台线程以固定间隔轮询模拟器的 /api/state, 只在 tick 变化时转换并缓存场景 (编码一次),
+    任意数量的前端都从这里读取, 模拟器的负载与观看人数无关。
+    响应带 ETag ("缓存版本-tick"), 客户端携带 If-None-Match 时:
+      - 未变化则返回 304;
+      - 同时带 ?wait=秒数 时挂起直到出现新 tick 或超时 (长轮询, 相当于推送)。
+    响应体为 {tick, finished, scene, metrics}: tick 到达 max_tick 时本轮结束 (finished),
+    此时才附带模拟器的评测指标 (与控制器 on_event_execute_end 的最后一帧一致, max_tick - 1 时的平均值尚未最终确定)。
+    模拟器只在控制器切换流量文件前停留在 max_tick, 轮询错过这一帧时以上一帧结束本轮, metrics 为 null。
+    """
+
+    MAX_WAIT = 30.0
+
+    def __init__(self, server_port=8000, poll_interval=0.05):
+        self.server_url = "http://127.0.0.1:" + str(server_port)
+        self.poll_interval = poll_interval
+
+        self.histogram = WaitTimeHistogram()
+        self.traffic_info = None
+        self.version = 0  # 缓存每更新一次加一
+        self.tick = None
+        self.max_tick = None
+        self.finished = False
+        self.scene = None  # 最近一帧转换后的场景
+
+        # 缓存的响应体与 ETag, 由 condition 保护
+        self.body = None
+        self.etag = None
+        self.condition = threading.Condition()
+
+        self.app = Flask(__name__)
+        self.app.add_url_rule("/api/scene", view_func=self.get_scene)
+        self.app.after_request(self._add_cors_headers)
+
+    def _get_json(self, endpoint: str) -> dict:
+        try:
+            with urllib.request.urlopen(self.server_url + endpoint, timeout=10) as response:
+                return json.loads(response.read().decode("utf-8"))
+        except (urllib.error.URLError, OSError) as e:
+            raise RuntimeError(f"GET {endpoint} failed: {e}")
+
+    def _traffic_known(self) -> bool:
+        # 模拟器切换流量文件后、控制器加载前 max_tick 为 0
+        return bool(self.traffic_info and self.traffic_info.get("max_tick"))
+
+    def _poll_once(self):
+        state = self._get_json("/api/state")
+        tick = state["tick"]
+        if tick == self.tick and self._traffic_known():
+            return
+        # tick 回退说明模拟器开始了新一轮, 流量信息随之刷新
+        if self.tick is None or tick < self.tick or not self._traffic_known():
+            self.traffic_info = self._get_json("/api/traffic/info")
+            if self.max_tick and not self.finished and (tick < self.tick or not self._traffic_known()):
+                # 模拟器只在控制器切换流量文件前停留在 max_tick, 轮询错过了这一帧:
+                # 以上一帧结束本轮, 没有最终的评测指标 (更早的指标尚未最终确定, 不发送)
+                print(f"[StateGateway] 错过了本轮的最后一个 tick (最后看到 tick {self.tick}), 本轮没有评测指标")
+                self.finished = True
+                self._publish(self.tick, True, self.scene, None)
+
+        if self.finished and not self._traffic_known():
+            return  # 两轮之间保留上一轮的最终帧 (含评测指标), 直到新一轮的流量加载完成
+        max_tick = self.traffic_info.get("max_tick") if self.traffic_info else None
+        if tick == self.tick and max_tick == self.max_tick:
+            return  # 流量信息仍未就绪, 内容没有变化
+        self.max_tick = max_tick
+
+        finished = self._traffic_known() and tick >= max_tick
+        self.finished = finished
+        self.scene = convert_simulator_state(state, self.traffic_info, self.histogram)
+        self._publish(tick, finished, self.scene, state.get("metrics") if finished else None)
+
+    def _publish(self, tick, finished, scene, metrics):
+        body = json.dumps({"tick": tick, "finished": finished, "scene": scene, "metrics": metrics})
+        with self.condition:
+            self.version += 1
+            self.tick = tick
+            self.body = body
+            self.etag = f'"{self.version}-{tick}"'
+            self.condition.notify_all()
+
+    def _poll_loop(self):
+        while True:
+            try:
+                self._poll_once()
+            except Exception as e:
+                print(f"[StateGateway] 轮询模拟器失败: {e}")
+                time.sleep(1.0)
+                continue
+            time.sleep(self.poll_interval)
+
+    def get_scene(self):
+        client_etag = request.headers.get("If-None-Match")
+        try:
+            wait = min(float(request.args.get("wait", 0)), self.MAX_WAIT)
+        except ValueError:
+            wait = 0.0
+
+        with self.condition:
+            if client_etag is not None and wait > 0:
+                self.condition.wait_for(lambda: self.etag != client_etag, timeout=wait)
+            body, etag = self.body, self.etag
+
+        if body is None:
+            return Response(json.dumps({"error": "simulator state not available yet"}), status=503, mimetype="application/json")
+        if client_etag == etag:
+            return Response(status=304, headers={"ETag": etag})
+        return Response(body, mimetype="application/json", headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+    def _add_cors_headers(self, response: Response) -> Response:
+        response.headers["Access-Control-Allow-Origin"] = "*"
+        response.headers["Access-Control-Allow-Headers"] = "If-None-Match"
+        response.headers["Access-Control-Expose-Headers"] = "ETag"
+        response.headers["Access-Control-Max-Age"] = "600"
+        return response
+
+    def serve(self, host="127.0.0.1", port=8002):
+        """启动轮询线程并阻塞运行 HTTP 服务"""
+        threading.Thread(target=self._poll_loop, daemon=True).start()
+        self.app.run(host=host, port=port, threaded=True)
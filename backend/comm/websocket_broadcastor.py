@@ -6,14 +6,78 @@ import json
 
 from websockets.asyncio.server import serve
 
+# 可订阅的主题, 以及各消息类型所属的主题; 不在表中的消息 (等待确认、本轮结束等控制消息) 总是发送给所有客户端
+TOPICS = ("scene", "metrics", "logs", "perf")
+MESSAGE_TOPICS = {
+    "server_scene_update": "scene",
+    "server_metrics_update": "metrics",
+    "server_log": "logs",
+    "server_error": "logs",
+    "server_perf_update": "perf",
+}
+
+
+class ClientSubscription(object):
+    """
+    客户端订阅: 主题集合, 以及关注的电梯/楼层 (None 表示全部)。
+    新连接默认订阅全部主题和全部电梯/楼层, 客户端发送
+    {"type": "client_subscribe", "data": {"topics": [...], "elevators": [...], "floors": [...]}} 修改订阅,
+    data 中省略的字段恢复为默认值。
+    """
+
+    __slots__ = ("topics", "elevators", "floors")
+
+    def __init__(self, topics=None, elevators=None, floors=None):
+        self.topics = frozenset(TOPICS if topics is None else topics)
+        self.elevators = None if elevators is None else frozenset(elevators)
+        self.floors = None if floors is None else frozenset(floors)
+
+    @classmethod
+    def from_dict(cls, data):
+        """校验并解析 client_subscribe 的 data, 非法时抛出 ValueError"""
+        if not isinstance(data, dict):
+            raise ValueError("subscription must be an object")
+        topics = data.get("topics")
+        if topics is not None:
+            if not isinstance(topics, list) or any(t not in TOPICS for t in topics):
+                raise ValueError(f"topics must be a list drawn from {list(TOPICS)}")
+        ids = {}
+        for name in ("elevators", "floors"):
+            value = data.get(name)
+            if value is not None and (not isinstance(value, list)
+                                      or any(not isinstance(i, int) or isinstance(i, bool) for i in value)):
+                raise ValueError(f"{name} must be a list of integers or null")
+            ids[name] = value
+        return cls(topics, ids["elevators"], ids["floors"])
+
+    @property
+    def view(self):
+        """场景过滤条件, 相同的客户端共用一次序列化"""
+        return self.elevators, self.floors
+
+    def to_dict(self):
+        return {
+            "topics": sorted(self.topics),
+            "elevators": None if self.elevators is None else sorted(self.elevators),
+            "floors": None if self.floors is None else sorted(self.floors),
+        }
+
+
 class WebSocketBroadcastor(object):
-    def __init__(self, port=8001):
+    def __init__(self, port=8001, max_fps=20):
         self.ws_client_connections = set()
         self.ws_server = None
         self.ws_loop = None
         self.message_handlers = {}  # 消息处理器
+        self.subscriptions = {}  # {websocket: ClientSubscription}
+        
+        # 帧通道: 每个客户端只保留最新一帧 (latest-wins)，由各自的发送协程按 max_fps 限速发送
+        self.min_frame_interval = 1.0 / max_fps if max_fps > 0 else 0.0
+        self.latest_frames = {}  # {websocket: 待发送的最新帧}
+        self.frame_events = {}  # {websocket: asyncio.Event}
         
         self.port = port
+        self.register_message_handler("client_subscribe", self.on_client_subscribe)
         
         # 启动WebSocket服务器在后台线程
         self._start_ws_server(port)
@@ -35,6 +99,34 @@ class WebSocketBroadcastor(object):
         """注册消息处理器"""
         self.message_handlers[message_type] = handler
     
+    async def on_client_subscribe(self, websocket, data):
+        """修改客户端订阅, 回复生效后的订阅"""
+        try:
+            subscription = ClientSubscription.from_dict(data.get('data', {}))
+        except ValueError as e:
+            return {'type': 'server_error', 'message': f'Invalid subscription: {e}'}
+        self.subscriptions[websocket] = subscription
+        print(f"Client subscription updated: {subscription.to_dict()}")
+        return {'type': 'server_subscribed', 'data': subscription.to_dict()}
+    
+    def subscribers(self, message_type):
+        """订阅了该消息类型所属主题的客户端"""
+        topic = MESSAGE_TOPICS.get(message_type)
+        # 复制一份, 订阅可能在 WebSocket 线程中被修改
+        subscriptions = list(self.subscriptions.items())
+        if topic is None:
+            return [ws for ws, _ in subscriptions]
+        return [ws for ws, subscription in subscriptions if topic in subscription.topics]
+    
+    def subscribers_by_view(self, message_type):
+        """同 subscribers, 按场景过滤条件分组: {(elevators, floors): [websocket, ...]}"""
+        groups = {}
+        topic = MESSAGE_TOPICS.get(message_type)
+        for ws, subscription in list(self.subscriptions.items()):
+            if topic is None or topic in subscription.topics:
+                groups.setdefault(subscription.view, []).append(ws)
+        return groups
+    
     async def process_client_message(self, websocket, message):
         """处理客户端消息"""
         try:
@@ -67,10 +159,40 @@ class WebSocketBroadcastor(object):
                 'message': str(e)
             }))
     
+    async def _frame_sender(self, websocket):
+        """单个客户端的帧发送协程: 只发送最新帧，并限制发送频率，慢客户端自动降帧"""
+        event = self.frame_events[websocket]
+        while True:
+            await event.wait()
+            event.clear()
+            frame = self.latest_frames.pop(websocket, None)
+            if frame is None:
+                continue
+            started = time.monotonic()
+            try:
+                await websocket.send(frame)
+            except websockets.exceptions.ConnectionClosed:
+                return
+            elapsed = time.monotonic() - started
+            if elapsed < self.min_frame_interval:
+                await asyncio.sleep(self.min_frame_interval - elapsed)
+    
+    def _enqueue_frame(self, frame, clients):
+        """在WebSocket事件循环中执行: 覆盖指定客户端的待发送帧"""
+        for ws in clients:
+            event = self.frame_events.get(ws)
+            if event is not None:
+                self.latest_frames[ws] = frame
+                event.set()
+    
     async def ws_handler(self, websocket):
         if websocket not in self.ws_client_connections:
             print(f"New WebSocket connection established. Total: {len(self.ws_client_connections) + 1}")
             self.ws_client_connections.add(websocket)
+        self.subscriptions[websocket] = ClientSubscription()
+        
+        self.frame_events[websocket] = asyncio.Event()
+        sender_task = asyncio.create_task(self._frame_sender(websocket))
             
         try:
             async for message in websocket:
@@ -82,6 +204,10 @@ class WebSocketBroadcastor(object):
             print(f"WebSocket error: {e}")
         finally:
             print("Cleaning up WebSocket connection")
+            sender_task.cancel()
+            self.frame_events.pop(websocket, None)
+            self.latest_frames.pop(websocket, None)
+            self.subscriptions.pop(websocket, None)
             self.ws_client_connections.discard(websocket)
             print(f"Remaining connections: {len(self.ws_client_connections)}")
     
@@ -90,11 +216,11 @@ class WebSocketBroadcastor(object):
             print("WebSocket server started on ws://localhost:8001")
             await server.serve_forever()
     
-    async def _async_broadcast(self, message):
-        """异步广播消息到所有连接的客户端"""
+    async def _async_broadcast(self, message, clients=None):
+        """异步广播消息到指定 (默认为所有连接的) 客户端"""
         if self.ws_client_connections:
             # 复制连接集合以避免在迭代时修改
-            connections = self.ws_client_connections.copy()
+            connections = self.ws_client_connections.copy() if clients is None else clients
             disconnected = set()
             
             for ws in connections:
@@ -111,23 +237,45 @@ class WebSocketBroadcastor(object):
             for ws in disconnected:
                 self.ws_client_connections.discard(ws)
     
-    def _broadcast(self, message):
+    def _broadcast(self, message, clients=None):
         """同步方法，用于从主线程广播消息"""
         if self.ws_client_connections and self.ws_loop:
             # 在WebSocket事件循环中执行广播
             asyncio.run_coroutine_threadsafe(
-                self._async_broadcast(message), 
+                self._async_broadcast(message, clients), 
                 self.ws_loop
             )
     
     def broadcast_to_all(self, message_type, data):
-        """广播特定类型的消息给所有客户端"""
+        """广播特定类型的消息给订阅了其主题的客户端, 无订阅者时不序列化"""
+        if not self.ws_client_connections:
+            return
+        clients = self.subscribers(message_type)
+        if not clients:
+            return
         message = json.dumps({
             'type': message_type,
             'data': data,
             'timestamp': time.time()
         })
-        self._broadcast(message)
+        self._broadcast(message, clients)
+    
+    def broadcast_frame(self, message_type, data, clients=None):
+        """以帧的方式广播 (latest-wins): 客户端来不及接收的旧帧会被新帧覆盖"""
+        if not self.ws_client_connections or not self.ws_loop:
+            return
+        self.broadcast_frame_json(message_type, json.dumps(data), clients)
+    
+    def broadcast_frame_json(self, message_type, data_json: str, clients=None):
+        """同 broadcast_frame, data 已是编码好的 JSON 文本, 直接拼接进消息; clients 默认为该主题的订阅者"""
+        if not self.ws_client_connections or not self.ws_loop:
+            return
+        if clients is None:
+            clients = self.subscribers(message_type)
+        if not clients:
+            return
+        message = f'{{"type": {json.dumps(message_type)}, "data": {data_json}, "timestamp": {time.time()}}}'
+        self.ws_loop.call_soon_threadsafe(self._enqueue_frame, message, clients)
     
     def send_to_client(self, websocket, message_type, data):
         """发送消息给特定客户端"""
@@ -164,9 +312,10 @@ class WebSocketBroadcastor(object):
 
 class SceneBroadcastor(WebSocketBroadcastor):
     
-    def __init__(self, port=8001):
-        super().__init__(port)
+    def __init__(self, port=8001, max_fps=20):
+        super().__init__(port, max_fps)
         self.scene_data = {}
+        self.last_scene_time = 0.0
         
     def wait_for_client_confirmation(self):
         ready = False
@@ -190,8 +339,38 @@ class SceneBroadcastor(WebSocketBroadcastor):
         print(f"[Error] {error_message}")
         self.broadcast_to_all("server_error", error_message)
     
-    def server_scene_update(self, scene_json):
-        self.broadcast_to_all("server_scene_update", scene_json)
+    def server_scene_update(self, scene, force=False):
+        """
+        推送场景帧。scene 可以是字典或已编码的 JSON 文本，也可以是 scene(elevators, floors) 形式、返回二者之一的可调用对象:
+        - 无订阅 scene 主题的客户端时直接返回，可调用对象不会被执行 (无GUI时零序列化开销)
+        - 距上一帧不足 min_frame_interval 时丢弃本帧 (后续帧会覆盖它)，force=True 时总是发送
+        - 可调用对象按客户端关注的电梯/楼层分组调用, 每组只序列化一次且只包含该组关注的部分
+        """
+        if not self.exists_client():
+            return
+        groups = self.subscribers_by_view("server_scene_update")
+        if not groups:
+            return
+        now = time.monotonic()
+        if not force and now - self.last_scene_time < self.min_frame_interval:
+            return
+        self.last_scene_time = now
+        if not callable(scene):
+            groups = {(None, None): [ws for clients in groups.values() for ws in clients]}
+        for (elevators, floors), clients in groups.items():
+            scene_data = scene(elevators, floors) if callable(scene) else scene
+            if isinstance(scene_data, str):
+                self.broadcast_frame_json("server_scene_update", scene_data, clients)
+            else:
+                self.broadcast_frame("server_scene_update", scene_data, clients)
     
     def server_metrics_update(self, metrics_json):
-        self.broadcast_to_all("server_metrics_update", metrics_json)
\ No newline at end of file
+        self.broadcast_to_all("server_metrics_update", metrics_json)
+    
+    def server_perf_update(self, perf_json):
+        """调度决策耗时统计 (预算、超时与兜底次数)"""
+        self.broadcast_to_all("server_perf_update", perf_json)
+    
+    def server_run_finished(self, tick: int):
+        """显式通知客户端本轮模拟已结束"""
+        self.broadcast_to_all("server_run_finished", {"tick": tick})
\ No newline at end of file
@@ -1,3 +1,13 @@
 from .bus_controller import SimpleElevatorBusController
 from .improved_bus_controller import ImprovedElevatorBusController
-from .scan_bus_controller import ScanningSweepController
\ No newline at end of file
+from .scan_bus_controller import ScanningSweepController
+from .cost_aware_controller import CostAwareSweepController
+from .destination_dispatch_controller import DestinationDispatchController
+from .run_cost import CostWeights
+
+# start.py / tune.py 通过名称选择控制器
+CONTROLLERS = {
+    "scan": ScanningSweepController,
+    "cost_aware": CostAwareSweepController,
+    "destination": DestinationDispatchController,
+}
\ No newline at end of file
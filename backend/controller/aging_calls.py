@@ -0,0 +1,79 @@
+"""
+厅外呼叫老化队列 (Aging Call Queue)
+
+扫描算法总是先服务近处的工作, 边缘楼层的呼叫可能在电梯一次次提前转向时长期得不到服务,
+从而拉高 p95 候梯时间。本队列用最小堆按乘客到达 tick 保存候梯乘客, 堆顶即等待最久者,
+O(1) 判断 "是否有呼叫超过等待上限", 只在存在超时呼叫时才逐个取出。
+乘客上车后不立即从堆中删除 (惰性删除), 取出时跳过已上车的乘客。
+"""
+import heapq
+from typing import Callable, Dict, List, Optional, Tuple
+
+CallKey = Tuple[int, str]  # (floor, "up" / "down")
+
+
+class AgingCallQueue(object):
+
+    def __init__(self):
+        self._heap: List[Tuple[int, int, int, str]] = []  # (到达 tick, passenger_id, floor, direction)
+        self._waiting: Dict[int, int] = {}  # {passenger_id: 到达 tick}, 只含仍在候梯的乘客
+
+    def reset(self) -> None:
+        self._heap = []
+        self._waiting = {}
+
+    def add(self, passenger_id: int, floor: int, direction: str, arrive_tick: int) -> None:
+        self._waiting[passenger_id] = arrive_tick
+        heapq.heappush(self._heap, (arrive_tick, passenger_id, floor, direction))
+
+    def remove(self, passenger_id: int) -> None:
+        """乘客上车, 堆中的条目在取出时丢弃"""
+        self._waiting.pop(passenger_id, None)
+
+    def state_dict(self) -> List[list]:
+        """仍在候梯的乘客 [[到达 tick, passenger_id, floor, direction], ...]"""
+        return [list(entry) for entry in self._heap if self._is_valid(entry)]
+
+    def load_state(self, state: List[list]) -> None:
+        self._heap = [tuple(entry) for entry in state]
+        heapq.heapify(self._heap)
+        self._waiting = {passenger_id: arrive_tick for arrive_tick, passenger_id, _, _ in self._heap}
+
+    def _is_valid(self, entry: Tuple[int, int, int, str]) -> bool:
+        return self._waiting.get(entry[1]) == entry[0]
+
+    def overdue(self, tick: int, max_wait: int) -> List[Tuple[CallKey, int]]:
+        """
+        等待超过 max_wait 的呼叫及其等待时间 [((floor, direction), 等待 tick 数), ...], 从等待最久到最短。
+        同一呼叫只返回一次 (按其等待最久的乘客计)。
+        """
+        deadline = tick - max_wait
+        heap = self._heap
+        # 先清理堆顶已上车的乘客, 堆顶未超时即可直接返回
+        while heap and not self._is_valid(heap[0]):
+            heapq.heappop(heap)
+        if not heap or heap[0][0] > deadline:
+            return []
+
+        entries = []
+        while heap and heap[0][0] <= deadline:
+            entry = heapq.heappop(heap)
+            if self._is_valid(entry):
+                entries.append(entry)
+        calls: Dict[CallKey, int] = {}
+        for entry in entries:
+            heapq.heappush(heap, entry)
+            key = (entry[2], entry[3])
+            if key not in calls:
+                calls[key] = tick - entry[0]
+        return list(calls.items())
+
+    def most_urgent(self, tick: int, max_wait: int,
+                    score: Callable[[CallKey, int], Optional[float]]) -> Tuple[Optional[CallKey], float]:
+        """超时呼叫中 score(呼叫, 等待时间) 最高者, 没有可用的呼叫 (score 均为 None) 时返回 (None, 0)"""
+        best, best_score = None, 0.0
+        for key, waited in self.overdue(tick, max_wait):
+            value = score(key, waited)
+            if value is not None and (best is None or value > best_score):
+                best, best_score = key, value
+        return best, best_score
@@ -0,0 +1,200 @@
+"""
+控制器检查点 (Checkpoint) 与断点恢复
+
+后端进程崩溃后, 控制器的单轮状态 (目的地跟踪、呼叫归属、老化队列、运行代价 ...)、
+场景管理器的乘客记录和跨轮学习的呼叫统计都会丢失。控制器每 every_ticks 个 tick
+在 tick 末尾生成一份检查点, 由后台线程写盘, tick 路径上只做内存拷贝:
+- state.json               控制器状态与运行信息 (流量文件下标、楼宇规模、tick), 每次整体原子替换;
+                           大小只与在途乘客数有关
+- passengers_<run>.jsonl   场景乘客记录日志, 每次只追加上次检查点之后有变化的记录 (增量),
+                           state.json 记录日志的有效行数, 崩溃时写了一半的行会被忽略
+- run_cost.json             运行代价的采样部分 (停靠/启动/距离/能耗), 每个 tick 都写 (很小, 不 fsync,
+                           进程崩溃时已写出的内容不会丢失)
+写盘跟不上时只保留最新的控制器状态和采样, 日志行合并后一起写出。
+
+恢复 (start.py --resume) 时控制器不重置模拟器, 而是接回正在运行的模拟器:
+检查点与模拟器的当前轮次一致时恢复状态, 检查点之后丢失的乘客呼叫/上车/下车事件
+按模拟器的乘客表补记 (只更新跟踪器、目的地桶、老化队列、场景等记账状态, 不重新决策),
+运行代价从最新的采样继续; 不一致时只恢复跨轮统计, 照常重新开始。
+检查点之后做出的调度决策状态 (如呼叫认领) 由控制器的 after_resume 按电梯当前目标重建;
+崩溃时模拟器已推进、尚未处理的那个 tick 的事件无法取回, 其决策由空闲处理代替,
+因此恢复后的调度可能与不中断运行不同 (resume_check.py 检查两者是否一致)。
+"""
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+STATE_FILE = "state.json"
+RUN_COST_FILE = "run_cost.json"
+VERSION = 2
+
+
+class CheckpointWriter(object):
+    """后台写检查点, 由控制器基类在 on_init (新一轮) 和 tick 末尾调用"""
+
+    def __init__(self, directory: str, every_ticks: int = 50):
+        self.directory = directory
+        self.every_ticks = every_ticks
+        self.saved = 0  # 已写出的检查点数
+        self._run_id: Optional[str] = None
+        self._lock = threading.Condition()
+        self._pending: Optional[Dict[str, Any]] = None  # 待写出的 {"state", "journal", "rows"}
+        self._pending_run_cost: Optional[Dict[str, Any]] = None  # 待写出的 {"journal", "sample"}
+        self._busy = False
+        self._journal_rows = 0
+        os.makedirs(directory, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="checkpoint-writer", daemon=True)
+        self._thread.start()
+
+    def start_run(self) -> None:
+        """新一轮模拟: 之后的检查点写入新的乘客日志"""
+        with self._lock:
+            self._run_id = time.strftime("%Y%m%d-%H%M%S") + f"-{int(time.time() * 1000) % 1000:03d}"
+            self._pending = None
+            self._pending_run_cost = None
+
+    def resume_run(self, checkpoint: Dict[str, Any]) -> None:
+        """从检查点恢复后继续写同一轮的乘客日志 (截掉崩溃时写了一半的行)"""
+        with self._lock:
+            self._run_id = checkpoint["journal"][len("passengers_"):-len(".jsonl")]
+            self._pending = None
+            self._pending_run_cost = None
+            self._journal_rows = checkpoint["journal_rows"]
+            journal_path = os.path.join(self.directory, checkpoint["journal"])
+            if os.path.exists(journal_path):
+                with open(journal_path, "rb+") as f:
+                    for _ in range(self._journal_rows):
+                        f.readline()
+                    f.truncate(f.tell())
+
+    def save(self, state: Dict[str, Any], passenger_rows: List[list]) -> None:
+        """提交一个检查点 (state 须为不再修改的新对象), 立即返回"""
+        with self._lock:
+            if self._run_id is None:
+                return
+            journal = f"passengers_{self._run_id}.jsonl"
+            if self._pending is not None and self._pending["journal"] == journal:
+                # 上一个检查点还未写出: 合并日志行, 控制器状态以最新的为准
+                self._pending["rows"].extend(passenger_rows)
+                self._pending["state"] = state
+            else:
+                self._pending = {"state": state, "journal": journal, "rows": list(passenger_rows)}
+            self._lock.notify()
+
+    def save_run_cost(self, sample: Dict[str, Any]) -> None:
+        """提交运行代价的采样 (RunCostMeter.sample_state_dict, 每个 tick 调用), 只保留最新的一份"""
+        with self._lock:
+            if self._run_id is None:
+                return
+            self._pending_run_cost = {"journal": f"passengers_{self._run_id}.jsonl", "sample": sample}
+            self._lock.notify()
+
+    def flush(self, timeout: float = 10.0) -> None:
+        """等待已提交的检查点写出 (控制器停止时调用)"""
+        deadline = time.time() + timeout
+        with self._lock:
+            while (self._pending is not None or self._pending_run_cost is not None or self._busy) and time.time() < deadline:
+                self._lock.wait(0.1)
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                while self._pending is None and self._pending_run_cost is None:
+                    self._lock.wait()
+                job, self._pending = self._pending, None
+                run_cost, self._pending_run_cost = self._pending_run_cost, None
+                self._busy = True
+            try:
+                if job is not None:
+                    self._write(job)
+                if run_cost is not None:
+                    self._write_run_cost(run_cost)
+            except OSError as e:
+                print(f"写检查点失败: {e}")
+            with self._lock:
+                self._busy = False
+                self._lock.notify_all()
+
+    def _write(self, job: Dict[str, Any]) -> None:
+        journal_path = os.path.join(self.directory, job["journal"])
+        if not os.path.exists(journal_path):
+            self._journal_rows = 0
+        if job["rows"]:
+            with open(journal_path, "a", encoding="utf-8") as f:
+                f.write("".join(json.dumps(row, separators=(",", ":")) + "\n" for row in job["rows"]))
+                f.flush()
+                os.fsync(f.fileno())
+            self._journal_rows += len(job["rows"])
+        state = dict(job["state"], version=VERSION, journal=job["journal"], journal_rows=self._journal_rows)
+        tmp_path = os.path.join(self.directory, STATE_FILE + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, os.path.join(self.directory, STATE_FILE))
+        self.saved += 1
+        # 新一轮的第一个检查点写出后, 旧轮次的日志不再被引用
+        for name in os.listdir(self.directory):
+            if name.startswith("passengers_") and name != job["journal"]:
+                os.remove(os.path.join(self.directory, name))
+
+    def _write_run_cost(self, run_cost: Dict[str, Any]) -> None:
+        tmp_path = os.path.join(self.directory, RUN_COST_FILE + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(run_cost, f, separators=(",", ":"))
+        os.replace(tmp_path, os.path.join(self.directory, RUN_COST_FILE))
+
+
+def load_checkpoint(directory: str) -> Optional[Dict[str, Any]]:
+    """
+    读取检查点, 附带 "passengers" (日志中有效的乘客记录行) 和 "run_cost_sample"
+    (同一轮最新的运行代价采样, 没有时为 None); 没有或无法读取时返回 None
+    """
+    path = os.path.join(directory, STATE_FILE)
+    if not os.path.isfile(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        if state.get("version") != VERSION:
+            print(f"检查点版本不符: {state.get('version')} != {VERSION}")
+            return None
+        rows = []
+        journal_path = os.path.join(directory, state["journal"])
+        if state["journal_rows"]:
+            with open(journal_path, "r", encoding="utf-8") as f:
+                for _, line in zip(range(state["journal_rows"]), f):
+                    rows.append(json.loads(line))
+    except (OSError, ValueError, KeyError) as e:
+        print(f"读取检查点失败: {e}")
+        return None
+    state["passengers"] = rows
+    state["run_cost_sample"] = None
+    try:
+        with open(os.path.join(directory, RUN_COST_FILE), "r", encoding="utf-8") as f:
+            run_cost = json.load(f)
+        if run_cost.get("journal") == state["journal"]:
+            state["run_cost_sample"] = run_cost["sample"]
+    except (OSError, ValueError, KeyError):
+        pass  # 没有采样时从检查点中的运行代价继续 (停靠/启动/距离为近似值)
+    return state
+
+
+def checkpoint_mismatch(checkpoint: Dict[str, Any], controller_name: str, state, traffic_info) -> Optional[str]:
+    """
+    检查点能否接回模拟器的当前状态 (state: SimulationState), 能则返回 None, 否则返回原因
+    """
+    run = checkpoint["run"]
+    if run["controller"] != controller_name:
+        return f"控制器不同 ({run['controller']} != {controller_name})"
+    if not traffic_info or traffic_info.get("current_index") != run["traffic_index"]:
+        return f"流量文件不同 ({run['traffic_index']} != {traffic_info and traffic_info.get('current_index')})"
+    if len(state.elevators) != run["elevators"] or len(state.floors) != run["floors"]:
+        return "楼宇规模不同"
+    if not 0 < run["tick"] <= state.tick:
+        return f"模拟器 tick {state.tick} 早于检查点 tick {run['tick']} (模拟器可能已重置)"
+    if state.tick >= int(traffic_info.get("max_tick", 0)):
+        return "模拟器已到达本轮最后一个 tick"
+    return None
@@ -0,0 +1,67 @@
+"""
+电梯命令缓冲 (Command Buffer)
+
+一个 tick 内, 停靠/空闲/即将到达/乘客呼叫等多个回调可能先后给同一部电梯下达命令,
+每条命令都是一次对模拟器的请求。基类把 api_client.go_to_floor 替换为缓冲区的 add:
+- tick 内发出的命令先缓存, 同一部电梯的同类命令 (immediate / 非 immediate) 只保留最后一条
+  (模拟器中二者分别设置 target_floor 和 next_target_floor, 互不覆盖)
+- 在 on_event_execute_end (以及 on_init 之后) 统一发送, 减少请求次数并消除相互矛盾的命令
+命令不会修改缓存的模拟器状态, 因此延迟到 tick 结束发送对控制器是透明的。
+"""
+from typing import Callable, Dict, Tuple
+
+# (电梯 id, 是否 immediate) -> 目标楼层
+PendingCommands = Dict[Tuple[int, bool], int]
+
+
+class CommandBuffer(object):
+
+    def __init__(self, send: Callable[[int, int, bool], bool]):
+        self.send = send  # 真正发送命令的函数 (原 api_client.go_to_floor)
+        self.pending: PendingCommands = {}
+        self.issued = 0  # 本轮控制器发出的命令数
+        self.sent = 0  # 本轮合并后实际发送的命令数
+
+    def reset(self) -> None:
+        self.pending = {}
+        self.issued = 0
+        self.sent = 0
+
+    def add(self, elevator_id: int, floor: int, immediate: bool = False) -> bool:
+        """与 APIClient.go_to_floor 签名一致, 缓存命令并覆盖该电梯之前的同类命令"""
+        key = (elevator_id, immediate)
+        # 先删除再插入, 发送顺序与命令最后一次下达的顺序一致
+        self.pending.pop(key, None)
+        self.pending[key] = floor
+        self.issued += 1
+        return True
+
+    def snapshot(self) -> Tuple[PendingCommands, int]:
+        return dict(self.pending), self.issued
+
+    def restore(self, snapshot: Tuple[PendingCommands, int]) -> int:
+        """丢弃 snapshot 之后下达的命令, 返回丢弃的条数"""
+        pending, issued = snapshot
+        discarded = self.issued - issued
+        self.pending = dict(pending)
+        self.issued = issued
+        return discarded
+
+    def flush(self) -> int:
+        """发送缓存的命令, 返回发送的条数"""
+        if not self.pending:
+            return 0
+        pending, self.pending = self.pending, {}
+        for (elevator_id, immediate), floor in pending.items():
+            self.send(elevator_id, floor, immediate)
+        self.sent += len(pending)
+        return len(pending)
+
+    def to_dict(self) -> Dict[str, int]:
+        return {"issued": self.issued, "sent": self.sent}
+
+    def load_state(self, state: Dict[str, int]) -> None:
+        """从检查点恢复统计 (检查点在 flush 之后生成, 没有待发送的命令)"""
+        self.pending = {}
+        self.issued = state["issued"]
+        self.sent = state["sent"]
@@ -1,32 +1,109 @@
 #!/usr/bin/env python3
-from typing import List
+from pprint import pprint
+from typing import Any, Dict, List, Tuple
+import importlib.metadata
 import time
 
 from elevator_saga.client.base_controller import ElevatorController
 from elevator_saga.client.proxy_models import ProxyElevator, ProxyFloor, ProxyPassenger
-from elevator_saga.core.models import SimulationEvent, Direction
+from elevator_saga.core.models import EventType, SimulationEvent, Direction, PassengerStatus
 
 from comm.websocket_broadcastor import SceneBroadcastor
 from scene.scene_manager import SceneManager
 
+from .checkpoint import checkpoint_mismatch
+from .command_buffer import CommandBuffer
+from .decision_guard import DecisionGuard
+from .destination_tracker import DestinationTracker
+from .run_cost import CostWeights, RunCostMeter
+
+# _continue_simulation 复制自该版本 elevator-py 的 ElevatorController._run_event_driven_simulation 主循环
+LIBRARY_LOOP_VERSION = "0.0.11"
+
 class BaseControllerWithComm(ElevatorController):
     def __init__(self, scene_broadcastor: SceneBroadcastor, server_port=8000, with_delay=False):
         super().__init__("http://127.0.0.1:"+str(server_port), True)
         self.scene_broadcastor = scene_broadcastor
         self.with_delay = with_delay
+        
+        # 跨轮次保留的对象: 场景管理器、已学习的交通统计 {(floor, direction): 呼叫次数}
+        # (统计只对同一栋楼有意义, 楼宇规模变化时清空; 子类用 call_median_floor 选择停靠楼层)
+        self.scene_manager = SceneManager()
+        self.call_statistics: Dict[Tuple[int, str], int] = {}
+        self._statistics_building: Tuple[int, int] = (0, 0)
+        
+        # 客户端乘客目的地跟踪 (所有子类共用, 在上/下车事件中维护)
+        self.destination_tracker = DestinationTracker()
+        
+        # 单轮运行代价 (等待/乘坐/停靠/启动/距离/能耗), 每轮结束时随指标上报
+        self.cost_weights = CostWeights()
+        self.run_cost = RunCostMeter()
+        # 最近一轮结束时的评测指标 (含运行代价), 供调参等离线工具读取
+        self.last_run_metrics: Dict[str, float] = {}
+        
+        # 停靠/即将到达决策的耗时预算, 超时改用兜底策略 (budget_ms 为 None 时关闭)
+        self.decision_guard = DecisionGuard()
+        
+        # tick 内的电梯命令先缓存并按电梯合并, 在 on_event_execute_end 统一发送
+        # (实例属性遮蔽 APIClient.go_to_floor, ProxyElevator.go_to_floor 因此也经过缓冲区)
+        self.command_buffer = CommandBuffer(self.api_client.go_to_floor)
+        self.api_client.go_to_floor = self.command_buffer.add
+        
+        # 可选的列式运行导出 (analysis.export.RunExporter, 由 start.py --export_dir 设置), 为 None 时不导出
+        self.run_exporter = None
+        
+        # 可选的检查点 (controller.checkpoint.CheckpointWriter, 由 start.py --checkpoint_dir 设置);
+        # resume_checkpoint 为待恢复的检查点 (start.py --resume), 下一次 start() 时尝试接回模拟器
+        self.checkpointer = None
+        self.resume_checkpoint = None
+        self.resumed_tick = None  # 最近一次成功恢复的检查点 tick, 未恢复时为 None
+        self._traffic_info = None
+
+    def reset(self) -> None:
+        """
+        热重启: 为下一轮模拟重置控制器。
+        保留与模拟器的连接 (api_client)、电梯/楼层代理对象、场景管理器和跨轮统计，
+        只清理本轮的运行状态。子类应在此清理自己的单轮状态并调用 super().reset()。
+        """
+        self.current_tick = 0
+        self.current_traffic_max_tick = 0
+        self.scene_manager.reset()
+        self.destination_tracker.reset()
+        self.run_cost.reset()
+        self.decision_guard.reset()
+        self.command_buffer.reset()
+        if self.run_exporter is not None:
+            self.run_exporter.close()
+
+    def _reset_and_reinit(self) -> None:
+        """模拟器内部切换流量文件时同样走热重启路径"""
+        self.reset()
+        super()._reset_and_reinit()
+
+    def _internal_init(self, elevators: List[ProxyElevator], floors: List[ProxyFloor]) -> None:
+        """on_init 中下达的初始命令在第一个 tick 之前发出"""
+        super()._internal_init(elevators, floors)
+        self.command_buffer.flush()
 
     def on_init(self, elevators: List[ProxyElevator], floors: List[ProxyFloor]) -> None:
-        self._all_passengers: List[ProxyPassenger] = []
         self._all_floors: List[ProxyFloor] = []
         
         self._max_floor = floors[-1].floor
         self._all_floors = floors
         self._all_elevators = elevators
+        self.destination_tracker.reset(e.id for e in elevators)
+        if self._statistics_building != (len(floors), len(elevators)):
+            self._statistics_building = (len(floors), len(elevators))
+            self.call_statistics.clear()
 
-        # prepare scene manager
-        self.scene_manager = SceneManager()
+        # prepare scene manager (跨轮复用)
         self.scene_manager.set_building_info(len(floors), len(elevators), elevators[0].max_capacity)
-        self.scene_manager.set_elevator_floor_passenger_container(self._all_elevators, self._all_floors, self._all_passengers)
+        self._traffic_info = self.api_client.get_traffic_info()
+        if self.run_exporter is not None:
+            self.run_exporter.start_run(type(self).__name__, self.scene_manager.building, self._traffic_info)
+        if self.checkpointer is not None:
+            self.scene_manager.track_changes()
+            self.checkpointer.start_run()
         
         # self.scene_broadcastor.server_scene_update(self.scene_manager.scene_json_str)
             
@@ -43,8 +120,20 @@ class BaseControllerWithComm(ElevatorController):
         print()
 
     def on_passenger_call(self, passenger:ProxyPassenger, floor: ProxyFloor, direction: str) -> None:
-        self._all_passengers.append(passenger)
-        pass
+        self._record_passenger_call(passenger, floor.floor, direction)
+
+    def call_median_floor(self) -> int:
+        """按已学习的呼叫次数加权的楼层中位数 (到各呼叫楼层的总距离最小), 尚无统计时返回 -1"""
+        per_floor: Dict[int, int] = {}
+        for (floor, _), n in self.call_statistics.items():
+            per_floor[floor] = per_floor.get(floor, 0) + n
+        half = sum(per_floor.values()) / 2
+        seen = 0
+        for floor in sorted(per_floor):
+            seen += per_floor[floor]
+            if seen >= half:
+                return floor
+        return -1
 
     def on_elevator_idle(self, elevator: ProxyElevator) -> None:
         pass
@@ -54,10 +143,33 @@ class BaseControllerWithComm(ElevatorController):
         pass
 
     def on_passenger_board(self, elevator: ProxyElevator, passenger: ProxyPassenger) -> None:
-        pass
+        self._record_passenger_board(elevator.id, passenger)
 
     def on_passenger_alight(self, elevator: ProxyElevator, passenger: ProxyPassenger, floor: ProxyFloor) -> None:
-        pass
+        self._record_passenger_alight(elevator.id, passenger)
+
+    # -------------------
+    # 乘客事件记账
+    # -------------------
+    # 乘客回调分为记账 (_record_*: 维护统计、场景、跟踪器等单轮状态) 和调度决策两部分。
+    # 断点恢复补发丢失的事件时只调用记账方法, 不会按过时的状态下达命令或认领呼叫。
+    # 子类的单轮状态在覆盖的 _record_* 中维护 (先调用 super()), 决策仍写在 on_passenger_* 中。
+    def _record_passenger_call(self, passenger: ProxyPassenger, floor_num: int, direction: str) -> None:
+        key = (floor_num, direction)
+        self.call_statistics[key] = self.call_statistics.get(key, 0) + 1
+        self.scene_manager.on_passenger_call(self.current_tick, passenger)
+
+    def _record_passenger_board(self, elevator_id: int, passenger: ProxyPassenger) -> None:
+        self.destination_tracker.board(elevator_id, passenger.id, passenger.destination)
+        self.run_cost.on_board(self.current_tick, passenger.id, passenger.arrive_tick)
+        self.scene_manager.on_passenger_board(self.current_tick, elevator_id, passenger)
+
+    def _record_passenger_alight(self, elevator_id: int, passenger: ProxyPassenger) -> None:
+        self.destination_tracker.alight(elevator_id, passenger.id)
+        self.run_cost.on_alight(self.current_tick, passenger.id)
+        self.scene_manager.on_passenger_alight(self.current_tick, passenger)
+        if self.run_exporter is not None:
+            self.run_exporter.record_passenger(self.scene_manager.passengers.get(passenger.id))
 
     def on_elevator_passing_floor(self, elevator: ProxyElevator, floor: ProxyFloor, direction: str) -> None:
         pass
@@ -65,18 +177,136 @@ class BaseControllerWithComm(ElevatorController):
     def on_elevator_approaching(self, elevator: ProxyElevator, floor: ProxyFloor, direction: str) -> None:
         pass
     
+    # -------------------
+    # 决策耗时守护
+    # -------------------
+    GUARDED_EVENTS = (EventType.STOPPED_AT_FLOOR, EventType.ELEVATOR_APPROACHING)
+
+    def _handle_single_event(self, event: SimulationEvent) -> None:
+        if self.decision_guard.enabled and event.type in self.GUARDED_EVENTS:
+            self._handle_guarded_event(event)
+        else:
+            super()._handle_single_event(event)
+
+    def _handle_guarded_event(self, event: SimulationEvent) -> None:
+        """执行决策并计时, 在预算内才保留其缓存的电梯命令和其他副作用, 否则撤销并改用兜底策略"""
+        kind = event.type.value
+        guard = self.decision_guard
+        if not guard.allow(kind):
+            self._fallback_decision(event)
+            return
+
+        snapshot = self.decision_snapshot()
+        start = time.perf_counter()
+        super()._handle_single_event(event)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        if guard.finish(kind, elapsed_ms):
+            discarded = self.restore_decision_snapshot(snapshot)
+            message = f"决策超时: {kind} E{event.data.get('elevator')} 用时 {elapsed_ms:.1f}ms > {guard.budget_ms}ms, 丢弃 {discarded} 条命令并使用兜底策略"
+            if guard.is_tripped(kind):
+                message += f", 熔断 {guard.cooldown} 次决策"
+            print(message)
+            self.scene_broadcastor.server_log(message)
+            self._fallback_decision(event)
+
+    def decision_snapshot(self) -> Any:
+        """决策前的快照, 超时时用于撤销决策的副作用。子类有其他决策状态 (如呼叫认领) 时覆盖这两个方法"""
+        return self.command_buffer.snapshot()
+
+    def restore_decision_snapshot(self, snapshot: Any) -> int:
+        """撤销 snapshot 之后的决策, 返回丢弃的电梯命令条数"""
+        return self.command_buffer.restore(snapshot)
+
+    def perf_dict(self) -> Dict[str, object]:
+        """server_perf_update 的内容: 决策耗时统计与命令合并统计"""
+        return {**self.decision_guard.to_dict(), "commands": self.command_buffer.to_dict()}
+
+    def _fallback_decision(self, event: SimulationEvent) -> None:
+        """兜底策略: 即将到达时照常停靠; 停靠后按扫描规则前往下一站"""
+        if event.type != EventType.STOPPED_AT_FLOOR:
+            return
+        elevator = ProxyElevator(event.data["elevator"], self.api_client)
+        target = self.fallback_target(elevator)
+        if target != -1:
+            self.go_to_fallback_target(elevator, target)
+
+    def go_to_fallback_target(self, elevator: ProxyElevator, target: int) -> None:
+        """下达兜底命令, 子类可在此同步自己的调度状态"""
+        elevator.go_to_floor(target)
+
+    def fallback_target(self, elevator: ProxyElevator) -> int:
+        """
+        廉价的扫描规则: 沿上一 tick 的方向前往最近的 (乘客目的地 / 有人等待的楼层),
+        该方向没有时反向, 全楼都没有时返回 -1。子类可覆盖。
+        """
+        current_floor = elevator.current_floor
+        tracker = self.destination_tracker
+        above = tracker.next_stop_above(elevator.id, current_floor)
+        below = tracker.next_stop_below(elevator.id, current_floor)
+        for floor in self._all_floors[current_floor + 1:]:
+            if above != -1 and floor.floor >= above:
+                break
+            if floor.has_waiting_passengers:
+                above = floor.floor
+                break
+        for floor in reversed(self._all_floors[:current_floor]):
+            if below != -1 and floor.floor <= below:
+                break
+            if floor.has_waiting_passengers:
+                below = floor.floor
+                break
+        if elevator.last_tick_direction == Direction.DOWN:
+            return below if below != -1 else above
+        return above if above != -1 else below
+
+    def _reconcile_destinations(self) -> None:
+        """每个 tick 结束时与模拟器状态对账, 发现跟踪器漂移时修正并记录"""
+        state = self.api_client.get_state()
+        passengers = state.passengers
+
+        def destination_of(passenger_id: int):
+            info = passengers.get(passenger_id)
+            return info.destination if info is not None else None
+
+        for e in state.elevators:
+            missing, stale = self.destination_tracker.reconcile(e.id, e.passengers, destination_of)
+            if missing or stale:
+                message = f"E{e.id} 目的地跟踪漂移: 补录 {missing}, 移除 {stale}"
+                print(message)
+                self.scene_broadcastor.server_log(message)
+
     def on_event_execute_end(
         self, tick: int, events: List[SimulationEvent], elevators: List[ProxyElevator], floors: List[ProxyFloor]
     ) -> None:
-        self.scene_broadcastor.server_scene_update(self.scene_manager.scene_dict)
+        # 本 tick 各回调下达的电梯命令合并后统一发送
+        self.command_buffer.flush()
+        self.scene_manager.update_current_tick(tick)
+        self.scene_manager.wait_histogram.advance(tick)
+        self._reconcile_destinations()
+        self.run_cost.sample(self.api_client.get_state())
+        if self.run_exporter is not None:
+            self.run_exporter.record_tick(tick, self.api_client.get_state())
+        if self.decision_guard.changed:
+            self.decision_guard.changed = False
+            self.scene_broadcastor.server_perf_update(self.perf_dict())
+        # 场景只在有客户端且到达发送间隔时才构建；最后一帧强制发送
+        is_last_tick = tick >= self.current_traffic_max_tick
+        self.scene_broadcastor.server_scene_update(
+            lambda elevators, floors: self.scene_manager.scene_json(self.api_client.get_state(), elevators, floors),
+            force=is_last_tick,
+        )
         # self.scene_broadcastor.wait_for_client_confirmation()
-        if self.with_delay:
+        if self.with_delay and self.scene_broadcastor.exists_client():
             time.sleep(0.1) # 给前端留时间
         
-        if tick == self.current_traffic_max_tick-1:
+        if is_last_tick:
             final_state = self.api_client.get_state()
             metrics = final_state.metrics
-            self.scene_broadcastor.server_metrics_update({
+            run_cost = self.run_cost.to_dict(self.cost_weights)
+            print(f"本轮运行代价: {run_cost}")
+            print(f"本轮电梯命令: 下达 {self.command_buffer.issued} 条, 合并后发送 {self.command_buffer.sent} 条")
+            self.last_run_metrics = {
                 "completed_passengers": metrics.completed_passengers,
                 "total_passengers": metrics.total_passengers,
                 "average_floor_wait_time": metrics.average_floor_wait_time,
@@ -84,5 +314,201 @@ class BaseControllerWithComm(ElevatorController):
                 "p95_floor_wait_time":  metrics.p95_floor_wait_time,
                 "p95_arrival_wait_time":  metrics.p95_arrival_wait_time,
                 "completion_rate": metrics.completion_rate,
-            })
-        pass
\ No newline at end of file
+                **run_cost,
+            }
+            self.scene_broadcastor.server_metrics_update(self.last_run_metrics)
+            if self.run_exporter is not None:
+                unfinished = [p for p in self.scene_manager.passengers.values() if p.status != PassengerStatus.COMPLETED]
+                self.run_exporter.finish_run(unfinished, self.last_run_metrics)
+            self.scene_broadcastor.server_perf_update(self.perf_dict())
+            self.scene_broadcastor.server_run_finished(tick)
+        elif self.checkpointer is not None:
+            if tick % self.checkpointer.every_ticks == 0:
+                self._save_checkpoint(tick)
+            self.checkpointer.save_run_cost(self.run_cost.sample_state_dict())
+
+    def on_stop(self) -> None:
+        if self.checkpointer is not None:
+            self.checkpointer.flush()
+
+    # -------------------
+    # 检查点与断点恢复
+    # -------------------
+    def checkpoint_state(self) -> Dict[str, Any]:
+        """
+        本轮控制器状态 (可 JSON 序列化的新对象)。子类应在此加入自己的单轮状态:
+        state = super().checkpoint_state(); state["xxx"] = ...; return state
+        场景乘客记录不在其中, 由检查点日志增量保存。
+        """
+        return {
+            "destinations": self.destination_tracker.state_dict(),
+            "run_cost": self.run_cost.state_dict(),
+            "decision_guard": self.decision_guard.state_dict(),
+            "commands": self.command_buffer.to_dict(),
+        }
+
+    def restore_checkpoint(self, state: Dict[str, Any]) -> None:
+        """恢复 checkpoint_state 保存的状态, 子类应先调用 super().restore_checkpoint(state)"""
+        self.destination_tracker.load_state(state["destinations"])
+        self.run_cost.load_state(state["run_cost"])
+        self.decision_guard.load_state(state["decision_guard"])
+        self.command_buffer.load_state(state["commands"])
+
+    def _save_checkpoint(self, tick: int) -> None:
+        building = self.scene_manager.building
+        traffic_info = self._traffic_info or {}
+        self.checkpointer.save({
+            "run": {
+                "controller": type(self).__name__,
+                "traffic_index": traffic_info.get("current_index"),
+                "floors": building["floors"],
+                "elevators": building["elevators"],
+                "tick": tick,
+                "client_id": self.api_client.client_id,
+                "saved_at": time.time(),
+            },
+            "call_statistics": [[floor, direction, n] for (floor, direction), n in self.call_statistics.items()],
+            "controller": self.checkpoint_state(),
+        }, self.scene_manager.take_changed_rows())
+
+    def on_resume(self, elevators: List[ProxyElevator], floors: List[ProxyFloor]) -> None:
+        """
+        从检查点恢复时代替 on_init 调用: 只重建代理对象与楼宇信息, 不下达初始命令。
+        子类在此重建自己对代理对象的索引。
+        """
+        self._max_floor = floors[-1].floor
+        self._all_floors = floors
+        self._all_elevators = elevators
+        self.scene_manager.set_building_info(len(floors), len(elevators), elevators[0].max_capacity)
+
+    def after_resume(self) -> None:
+        """
+        恢复完成 (补记事件) 后、继续模拟前调用: 空闲的电梯不会再收到 idle 事件, 让它们重新寻找工作。
+        子类在此修正检查点之后丢失的决策状态, 之后调用 super().after_resume()。
+        """
+        for elevator in self.elevators:
+            if elevator.is_idle:
+                self.on_elevator_idle(elevator)
+
+    def _run_event_driven_simulation(self) -> None:
+        checkpoint, self.resume_checkpoint = self.resume_checkpoint, None
+        if checkpoint is not None and self._resume(checkpoint):
+            self._continue_simulation()
+            return
+        super()._run_event_driven_simulation()
+
+    def _resume(self, checkpoint: Dict[str, Any]) -> bool:
+        """接回正在运行的模拟器并恢复检查点, 检查点与模拟器当前轮次不一致时只恢复跨轮统计并返回 False"""
+        for floor, direction, n in checkpoint["call_statistics"]:
+            self.call_statistics[(floor, direction)] = n
+        state = self.api_client.get_state()
+        traffic_info = self.api_client.get_traffic_info()
+        problem = checkpoint_mismatch(checkpoint, type(self).__name__, state, traffic_info)
+        if problem is not None:
+            message = f"检查点无法恢复: {problem}, 已恢复跨轮统计, 重新开始模拟"
+            print(message)
+            self.scene_broadcastor.server_log(message)
+            return False
+        # 模拟器只接受一个算法客户端, 崩溃进程的注册在模拟器重置前一直有效, 沿用它的客户端 id
+        if self.api_client.client_id is None:
+            self.api_client.client_id = checkpoint["run"].get("client_id")
+
+        self._update_wrappers(state, init=True)
+        self._update_traffic_info()
+        self._traffic_info = traffic_info
+        self.on_resume(self.elevators, self.floors)
+        self.scene_manager.load_passenger_rows(checkpoint["passengers"])
+        self.restore_checkpoint(checkpoint["controller"])
+        sample = checkpoint.get("run_cost_sample")
+        if sample is not None and sample["tick"] >= checkpoint["run"]["tick"]:
+            self.run_cost.load_sample_state(sample)
+        self.scene_manager.track_changes()
+        replayed = self._replay_missed_events(checkpoint["run"]["tick"], state)
+        # 补采模拟器当前 tick; 最新采样早于上一个 tick 时, 中间的 tick 漏采
+        unsampled = state.tick - 1 - self.run_cost.sampled_tick
+        if unsampled > 0:
+            self.run_cost.unsampled_ticks += unsampled
+        self.run_cost.sample(state)
+        self.current_tick = state.tick
+        self.scene_manager.update_current_tick(state.tick)
+        self.scene_manager.rebuild_histogram(state.tick)
+        if self.run_exporter is not None:
+            self.run_exporter.start_run(type(self).__name__, self.scene_manager.building, traffic_info)
+        if self.checkpointer is not None:
+            self.checkpointer.resume_run(checkpoint)
+        # 模拟器当前 tick 的事件 (崩溃时尚未处理) 只在 step 的响应中, 无法从 /api/state 取回:
+        # 其中停靠/即将到站的决策由 after_resume 的空闲处理代替, 这是恢复后的运行仍可能与不中断运行不同的原因
+        self.after_resume()
+        self.command_buffer.flush()
+        self.api_client.mark_tick_processed()
+
+        self.resumed_tick = checkpoint["run"]["tick"]
+        message = (f"已从检查点恢复: tick {checkpoint['run']['tick']} -> 模拟器 tick {state.tick}, "
+                   f"{len(self.scene_manager.passengers)} 位乘客, 补记 {replayed} 个事件")
+        if unsampled > 0:
+            message += f", 运行代价漏采 {unsampled} 个 tick (停靠/启动/距离为近似值)"
+        print(message)
+        self.scene_broadcastor.server_log(message)
+        return True
+
+    def _replay_missed_events(self, checkpoint_tick: int, state) -> int:
+        """
+        检查点之后到模拟器当前 tick 之间的乘客呼叫/上车/下车事件已随崩溃丢失,
+        按模拟器的乘客表重建并按 tick 顺序补记 (current_tick 为事件发生的 tick), 返回补记的事件数。
+        只调用记账方法 (_record_*): 这些事件的调度决策早已由崩溃前的进程做出, 电梯命令已在模拟器中生效
+        """
+        CALL, BOARD, ALIGHT = 0, 1, 2  # 同一 tick 内的先后顺序
+        events = []
+        for p in state.passengers.values():
+            if p.arrive_tick > checkpoint_tick:
+                events.append((p.arrive_tick, CALL, p))
+            if p.pickup_tick > checkpoint_tick and p.elevator_id is not None:
+                events.append((p.pickup_tick, BOARD, p))
+            if p.arrived and p.dropoff_tick > checkpoint_tick and p.elevator_id is not None:
+                events.append((p.dropoff_tick, ALIGHT, p))
+        events.sort(key=lambda item: (item[0], item[1]))
+        for tick, kind, p in events:
+            self.current_tick = tick
+            passenger = ProxyPassenger(p.id, self.api_client)
+            if kind == CALL:
+                self._record_passenger_call(passenger, p.origin, p.travel_direction.value)
+            elif kind == BOARD:
+                self._record_passenger_board(p.elevator_id, passenger)
+            else:
+                self._record_passenger_alight(p.elevator_id, passenger)
+        return len(events)
+
+    def _continue_simulation(self) -> None:
+        """
+        从恢复时的 tick 继续模拟。库的 _run_event_driven_simulation 在模拟器 tick > 0 时会先重置模拟器,
+        无法直接复用, 这里是它主循环 (elevator-py LIBRARY_LOOP_VERSION) 的唯一一份副本, 升级库时需要同步
+        """
+        try:
+            installed = importlib.metadata.version("elevator-py")
+        except importlib.metadata.PackageNotFoundError:
+            installed = "unknown"
+        if installed != LIBRARY_LOOP_VERSION:
+            message = (f"警告: 恢复后的主循环复制自 elevator-py {LIBRARY_LOOP_VERSION}, "
+                       f"已安装 {installed}, 请核对 _continue_simulation")
+            print(message)
+            self.scene_broadcastor.server_log(message)
+        while self.is_running:
+            if self.current_tick >= self.current_traffic_max_tick:
+                break
+            step_response = self.api_client.step(1)
+            self.current_tick = step_response.tick
+            events = step_response.events
+            state = self.api_client.get_state()
+            self._update_wrappers(state)
+            self.on_event_execute_start(self.current_tick, events, self.elevators, self.floors)
+            for event in events:
+                self._handle_single_event(event)
+            state = self.api_client.get_state()
+            self._update_wrappers(state)
+            self.on_event_execute_end(self.current_tick, events, self.elevators, self.floors)
+            self.api_client.mark_tick_processed()
+            if self.current_tick >= self.current_traffic_max_tick:
+                pprint(state.metrics.to_dict())
+                if not self.api_client.next_traffic_round():
+                    break
+                self._reset_and_reinit()
\ No newline at end of file
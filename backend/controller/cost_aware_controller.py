@@ -0,0 +1,134 @@
+"""
+代价感知扫描调度算法 (Cost-Aware Sweep Controller)
+
+基于 ScanningSweepController, 用可配置的多目标代价 (CostWeights) 代替固定的扫描规则:
+1.  选择目标: 比较 "上方最近的工作" 与 "下方最近的工作" 两个候选, 选择估计代价更低者:
+      等待代价 = 行驶距离 x 其他楼层的候梯人数 (这段时间他们继续等待)
+      乘坐代价 = 电梯内目的地在反方向的乘客需要多绕的路程 (往返)
+      机械代价 = 行驶距离 x (距离权重 + 能耗权重)
+    代价相同时保持原扫描意图方向。
+2.  停靠取舍 (on_elevator_approaching): 无人下车的楼层, 若一次停靠 + 重新启动的代价
+    高于接载这些乘客所节省的候梯时间, 则跳过并把呼叫移交给其他电梯。
+3.  空闲停靠: 只有当停靠到中层节省的响应时间抵得上一次启动和行驶的代价时才前往中层。
+
+默认权重 (wait=1, ride=1, 其余为 0) 下行为与扫描算法接近; 调高 stop/start/distance/energy
+权重即可用吞吐量换取更少的停靠、启动和行驶 (机械磨损)。每轮的各项代价由基类统计并随指标上报。
+"""
+from typing import List, Optional
+
+from comm.websocket_broadcastor import SceneBroadcastor
+
+from .run_cost import CostWeights
+from .scan_bus_controller import ScanningSweepController
+from elevator_saga.client.proxy_models import ProxyElevator, ProxyFloor
+from elevator_saga.core.models import Direction
+
+
+class CostAwareSweepController(ScanningSweepController):
+    """
+    代价感知扫描调度算法
+    - 多目标代价选择目标楼层 (等待 / 乘坐 / 距离 / 能耗)
+    - 停靠与启动代价参与跳站决策
+    - 按代价决定是否空闲停靠
+    """
+
+    # 等待代价已计入全楼候梯人数, 呼叫老化默认关闭 (开启后在自带流量文件上吞吐量略降)
+    TUNABLE_PARAMS = {
+        **ScanningSweepController.TUNABLE_PARAMS,
+        "max_wait_ticks": [None, 40, 60, 90, 120],
+    }
+
+    # 一次停靠 (减速 + 开关门 + 加速) 让电梯内乘客多花的 tick 数
+    STOP_DWELL_TICKS = 3
+
+    def __init__(self, scene_broadcastor: SceneBroadcastor, server_port=8000, with_delay=False,
+                 cost_weights: Optional[CostWeights] = None, max_wait_ticks=None, **kwargs):
+        super().__init__(scene_broadcastor=scene_broadcastor, server_port=server_port, with_delay=with_delay,
+                         max_wait_ticks=max_wait_ticks, **kwargs)
+        self.cost_weights = cost_weights if cost_weights is not None else CostWeights()
+
+    def on_init(self, elevators: List[ProxyElevator], floors: List[ProxyFloor]) -> None:
+        super().on_init(elevators, floors)
+        print(f"💡 代价感知模式，权重: {self.cost_weights.to_dict()}")
+
+    # -------------------
+    # 代价估计
+    # -------------------
+    def _waiting_count(self, floor_num: int) -> int:
+        floor = self.floors[floor_num]
+        return len(floor.up_queue) + len(floor.down_queue)
+
+    def _ride_detour(self, elevator: ProxyElevator, target: int) -> int:
+        """前往 target 让电梯内乘客多乘坐的 tick 数: 目的地在反方向的乘客需往返一次"""
+        current_floor = elevator.current_floor
+        detour = 0
+        for destination in self.destination_tracker.stops(elevator.id):
+            if (destination - current_floor) * (target - current_floor) < 0:
+                detour += 2 * abs(target - current_floor) * self.destination_tracker.alighting_count(elevator.id, destination)
+        return detour
+
+    def _target_cost(self, elevator: ProxyElevator, target: int, total_waiting: int) -> float:
+        weights = self.cost_weights
+        travel = abs(elevator.current_floor_float - target)
+        wait_cost = weights.wait * travel * (total_waiting - self._waiting_count(target))
+        ride_cost = weights.ride * self._ride_detour(elevator, target)
+        mechanical_cost = (weights.distance + weights.energy) * travel
+        return wait_cost + ride_cost + mechanical_cost
+
+    # -------------------
+    # 决策
+    # -------------------
+    def _choose_target(self, elevator: ProxyElevator) -> int:
+        """在上方/下方最近的工作中选择代价更低者，全楼都没有工作时返回 -1"""
+        current_floor = elevator.current_floor
+        work_above = self._find_work_above(elevator.id, current_floor)
+        work_below = self._find_work_below(elevator.id, current_floor)
+        if not work_above and not work_below:
+            return -1
+        if not work_below:
+            return work_above[0]
+        if not work_above:
+            return work_below[0]
+
+        total_waiting = sum(self._waiting_count(i) for i in range(self.max_floor + 1))
+        up, down = work_above[0], work_below[0]
+        cost_up = self._target_cost(elevator, up, total_waiting)
+        cost_down = self._target_cost(elevator, down, total_waiting)
+        if cost_up == cost_down:
+            # 代价相同时保持扫描意图
+            target = down if elevator.last_tick_direction == Direction.DOWN else up
+        else:
+            target = up if cost_up < cost_down else down
+        print(f"  (代价) 上 F{up}: {cost_up:.1f} / 下 F{down}: {cost_down:.1f}，前往 F{target}。")
+        return target
+
+    def _should_bypass(self, elevator: ProxyElevator, floor: ProxyFloor, direction: str) -> bool:
+        """在载荷感知跳过的基础上，停靠代价高于接载收益时同样跳过 (bypass_enabled=False 时两者都不跳过)"""
+        if not self.bypass_enabled:
+            return False
+        if super()._should_bypass(elevator, floor, direction):
+            return True
+        if self._alighting_count(elevator, floor.floor) > 0:
+            return False
+        queue = floor.up_queue if direction == Direction.UP.value else floor.down_queue
+        if not queue:
+            return False
+        weights = self.cost_weights
+        boarding = min(len(queue), self._predicted_free_capacity(elevator, floor.floor))
+        load = self.destination_tracker.load(elevator.id)
+        stop_cost = weights.stop + weights.start + weights.ride * load * self.STOP_DWELL_TICKS
+        # 跳过后这些乘客大约要多等一次往返
+        skip_cost = weights.wait * boarding * 2 * self.max_floor
+        return stop_cost > skip_cost
+
+    def _park(self, elevator: ProxyElevator) -> None:
+        """停靠预计节省下一位乘客约一半的行驶距离，抵不上一次启动和行驶的代价时原地等待"""
+        parking_floor = self._parking_floor()
+        if parking_floor == -1:
+            return
+        weights = self.cost_weights
+        distance = abs(elevator.current_floor - parking_floor)
+        saving = weights.wait * distance / 2
+        cost = weights.start + (weights.distance + weights.energy) * distance
+        if saving >= cost:
+            super()._park(elevator)
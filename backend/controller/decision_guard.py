@@ -0,0 +1,109 @@
+"""
+调度决策耗时守护 (Decision Latency Guard)
+
+on_elevator_stopped / on_elevator_approaching 中的调度决策同步执行, 一次慢决策会拖慢整个 tick。
+基类在执行这些决策时先缓存其发出的电梯命令并计时:
+- 在预算 (budget_ms) 内完成: 按顺序发出缓存的命令
+- 超出预算: 丢弃这些命令, 改用廉价的兜底策略 (扫描规则) 为本次决策下达命令
+- 同一类决策连续 trip_after 次超时: 熔断, 接下来 cooldown 次该类决策直接使用兜底策略,
+  之后再尝试原策略 (CPython 无法安全地中断正在执行的回调, 熔断用来限制持续超时对 tick 的拖延)
+超时/兜底次数通过 WebSocket 的 server_perf_update 上报。
+"""
+from typing import Dict, Optional
+
+
+class DecisionStats(object):
+    __slots__ = ("decisions", "overruns", "fallbacks", "bypassed", "total_ms", "max_ms", "consecutive_overruns", "cooldown_left")
+
+    def __init__(self):
+        self.decisions = 0  # 执行原策略的次数
+        self.overruns = 0  # 其中超出预算的次数
+        self.fallbacks = 0  # 使用兜底策略的次数 (超时 + 熔断)
+        self.bypassed = 0  # 熔断期间直接使用兜底策略的次数
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.consecutive_overruns = 0
+        self.cooldown_left = 0
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "decisions": self.decisions,
+            "overruns": self.overruns,
+            "fallbacks": self.fallbacks,
+            "bypassed": self.bypassed,
+            "avg_ms": round(self.total_ms / self.decisions, 3) if self.decisions else 0.0,
+            "max_ms": round(self.max_ms, 3),
+        }
+
+
+class DecisionGuard(object):
+
+    def __init__(self, budget_ms: Optional[float] = 100.0, trip_after: int = 3, cooldown: int = 50):
+        self.budget_ms = budget_ms  # None 表示不启用守护
+        self.trip_after = trip_after
+        self.cooldown = cooldown
+        self.stats: Dict[str, DecisionStats] = {}
+        self.changed = False  # 自上次上报以来统计是否有变化
+
+    def reset(self) -> None:
+        self.stats = {}
+        self.changed = True
+
+    @property
+    def enabled(self) -> bool:
+        return self.budget_ms is not None
+
+    def _stats(self, kind: str) -> DecisionStats:
+        stats = self.stats.get(kind)
+        if stats is None:
+            stats = self.stats[kind] = DecisionStats()
+        return stats
+
+    def allow(self, kind: str) -> bool:
+        """本次决策能否执行原策略; 熔断期间返回 False (调用方应直接使用兜底策略)"""
+        stats = self._stats(kind)
+        if stats.cooldown_left > 0:
+            stats.cooldown_left -= 1
+            stats.bypassed += 1
+            stats.fallbacks += 1
+            self.changed = True
+            return False
+        return True
+
+    def finish(self, kind: str, elapsed_ms: float) -> bool:
+        """记录一次原策略决策的耗时, 超出预算时返回 True (调用方应丢弃其命令并使用兜底策略)"""
+        stats = self._stats(kind)
+        stats.decisions += 1
+        stats.total_ms += elapsed_ms
+        stats.max_ms = max(stats.max_ms, elapsed_ms)
+        if elapsed_ms <= self.budget_ms:
+            stats.consecutive_overruns = 0
+            return False
+        stats.overruns += 1
+        stats.fallbacks += 1
+        stats.consecutive_overruns += 1
+        if stats.consecutive_overruns >= self.trip_after:
+            stats.consecutive_overruns = 0
+            stats.cooldown_left = self.cooldown
+        self.changed = True
+        return True
+
+    def is_tripped(self, kind: str) -> bool:
+        return self._stats(kind).cooldown_left > 0
+
+    def state_dict(self) -> Dict[str, Dict[str, float]]:
+        return {kind: {name: getattr(stats, name) for name in DecisionStats.__slots__} for kind, stats in self.stats.items()}
+
+    def load_state(self, state: Dict[str, Dict[str, float]]) -> None:
+        self.stats = {}
+        for kind, values in state.items():
+            stats = self._stats(kind)
+            for name, value in values.items():
+                setattr(stats, name, value)
+        self.changed = True
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "budget_ms": self.budget_ms,
+            "decisions": {kind: stats.to_dict() for kind, stats in self.stats.items()},
+        }
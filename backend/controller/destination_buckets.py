@@ -0,0 +1,96 @@
+"""
+候梯乘客目的地分桶 (Destination Buckets)
+
+on_passenger_call 已经给出乘客的目的地。每个厅外呼叫 (楼层, 方向) 维护一个目的地桶
+{目的地楼层: 候梯人数}, 乘客上车后移出。模拟器按队列顺序 (先到先上) 让乘客上车,
+因此结合楼层的 up_queue / down_queue 即可预测一部电梯停靠时会接上哪些乘客、新增哪些停靠楼层。
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+
+CallKey = Tuple[int, str]  # (floor, "up" / "down")
+
+
+class WaitingPassenger(object):
+    __slots__ = ("call", "destination", "arrive_tick")
+
+    def __init__(self, call: CallKey, destination: int, arrive_tick: int):
+        self.call = call
+        self.destination = destination
+        self.arrive_tick = arrive_tick
+
+
+class DestinationBuckets(object):
+
+    def __init__(self):
+        self._passengers: Dict[int, WaitingPassenger] = {}  # {passenger_id: 候梯信息}
+        self._buckets: Dict[CallKey, Dict[int, int]] = {}  # {(floor, direction): {目的地: 人数}}
+
+    def reset(self) -> None:
+        self._passengers = {}
+        self._buckets = {}
+
+    # -------------------
+    # 事件更新
+    # -------------------
+    def add(self, passenger_id: int, floor: int, direction: str, destination: int, arrive_tick: int) -> None:
+        self.remove(passenger_id)
+        call = (floor, direction)
+        self._passengers[passenger_id] = WaitingPassenger(call, destination, arrive_tick)
+        bucket = self._buckets.setdefault(call, {})
+        bucket[destination] = bucket.get(destination, 0) + 1
+
+    def remove(self, passenger_id: int) -> bool:
+        """乘客上车 (或离开), 未记录的乘客返回 False"""
+        waiting = self._passengers.pop(passenger_id, None)
+        if waiting is None:
+            return False
+        bucket = self._buckets[waiting.call]
+        bucket[waiting.destination] -= 1
+        if bucket[waiting.destination] == 0:
+            del bucket[waiting.destination]
+            if not bucket:
+                del self._buckets[waiting.call]
+        return True
+
+    def state_dict(self) -> List[list]:
+        """[[passenger_id, floor, direction, 目的地, 到达 tick], ...]"""
+        return [[pid, w.call[0], w.call[1], w.destination, w.arrive_tick] for pid, w in self._passengers.items()]
+
+    def load_state(self, state: List[list]) -> None:
+        self.reset()
+        for passenger_id, floor, direction, destination, arrive_tick in state:
+            self.add(passenger_id, floor, direction, destination, arrive_tick)
+
+    # -------------------
+    # 查询
+    # -------------------
+    def bucket(self, floor: int, direction: str) -> Dict[int, int]:
+        """呼叫 (floor, direction) 的目的地桶 (只读)"""
+        return self._buckets.get((floor, direction), {})
+
+    def calls(self) -> Iterable[CallKey]:
+        """有乘客候梯的呼叫 (floor, direction)"""
+        return self._buckets.keys()
+
+    def destination(self, passenger_id: int) -> Optional[int]:
+        waiting = self._passengers.get(passenger_id)
+        return waiting.destination if waiting is not None else None
+
+    def boarding_destinations(self, queue: Iterable[int], capacity: int) -> List[int]:
+        """按队列顺序, 剩余容量为 capacity 的电梯停靠时会接上的乘客的目的地"""
+        destinations = []
+        for passenger_id in queue:
+            if len(destinations) >= capacity:
+                break
+            waiting = self._passengers.get(passenger_id)
+            if waiting is not None:
+                destinations.append(waiting.destination)
+        return destinations
+
+    def oldest_arrival(self, queue: Iterable[int]) -> Optional[int]:
+        """队首 (等待最久) 乘客的到达 tick"""
+        for passenger_id in queue:
+            waiting = self._passengers.get(passenger_id)
+            if waiting is not None:
+                return waiting.arrive_tick
+        return None
@@ -0,0 +1,194 @@
+"""
+目的地分组调度算法 (Destination Dispatch Controller)
+
+基于 ScanningSweepController。on_passenger_call 已给出乘客目的地, 以往的控制器只使用呼叫楼层和方向。
+本算法为每个厅外呼叫维护目的地桶 (DestinationBuckets), 按 "停靠后会接上哪些乘客" 为呼叫选择电梯:
+1.  分组代价: 电梯服务呼叫的代价 = 扫描算法的行驶代价
+      + stop_weight x 这批乘客带来的新停靠楼层数 (目的地已在电梯停靠列表中的不计)
+      + 停靠列表在行进方向上被延长的楼层数
+    目的地相近的乘客因此被分到同一部电梯, 每趟的停靠次数更少 (上行高峰时尤为明显)。
+2.  无人认领的呼叫只由分组代价最低 (差距在 reassign_margin 以内) 的电梯认领;
+    队首乘客等待超过 call_timeout_ticks 时任何电梯都可接, 避免呼叫长期无人服务。
+3.  新呼叫出现时唤醒对该呼叫分组代价最低的空闲电梯。
+各电梯对一个呼叫的代价在同一 tick 内只计算一次 (乘客事件改变相关的目的地桶或停靠列表时作废),
+扫描时只检查目的地桶中有呼叫的楼层。
+
+模拟器按队列顺序让乘客上车, 无法指定某位乘客乘坐哪部电梯, 因此分组体现在 "哪部电梯停靠哪一层"。
+"""
+import heapq
+from typing import Dict, List, Tuple
+
+from comm.websocket_broadcastor import SceneBroadcastor
+
+from .destination_buckets import CallKey, DestinationBuckets
+from .scan_bus_controller import ScanningSweepController
+from elevator_saga.client.proxy_models import ProxyElevator, ProxyFloor, ProxyPassenger
+from elevator_saga.core.models import Direction
+
+
+class DestinationDispatchController(ScanningSweepController):
+    """
+    目的地分组调度算法
+    - 每个呼叫的目的地桶
+    - 按新增停靠数为呼叫分配电梯
+    - 等待过久的呼叫任何电梯都可接
+    """
+
+    TUNABLE_PARAMS = {
+        **ScanningSweepController.TUNABLE_PARAMS,
+        "stop_weight": [3.0, 1.0, 6.0],
+    }
+
+    def __init__(self, scene_broadcastor: SceneBroadcastor, server_port=8000, with_delay=False, stop_weight=3.0, **kwargs):
+        super().__init__(scene_broadcastor=scene_broadcastor, server_port=server_port, with_delay=with_delay, **kwargs)
+        # 一个新增停靠楼层折合的行驶楼层数
+        self.stop_weight = stop_weight
+        self.buckets = DestinationBuckets()
+        # 本 tick 的呼叫代价缓存: {(floor, direction): {电梯: (代价, 停靠时是否还有空位)}},
+        # 以及各呼叫中有空位的电梯里代价最低的两部 {(floor, direction): [(代价, 电梯)]} (新算出的代价随时并入)
+        self._cost_tables: Dict[CallKey, Dict[int, Tuple[float, bool]]] = {}
+        self._cheapest: Dict[CallKey, List[Tuple[float, int]]] = {}
+        self._cost_tick = -1
+
+    def reset(self) -> None:
+        super().reset()
+        self.buckets.reset()
+        self._cost_tables = {}
+        self._cheapest = {}
+
+    def on_init(self, elevators: List[ProxyElevator], floors: List[ProxyFloor]) -> None:
+        super().on_init(elevators, floors)
+        self.buckets.reset()
+        print(f"🧭 目的地分组模式，每个新增停靠折合 {self.stop_weight} 层")
+
+    def checkpoint_state(self) -> dict:
+        state = super().checkpoint_state()
+        state["buckets"] = self.buckets.state_dict()
+        return state
+
+    def restore_checkpoint(self, state: dict) -> None:
+        super().restore_checkpoint(state)
+        self.buckets.load_state(state["buckets"])
+
+    # -------------------
+    # 目的地桶维护
+    # -------------------
+    def _record_passenger_call(self, passenger: ProxyPassenger, floor_num: int, direction: str) -> None:
+        self.buckets.add(passenger.id, floor_num, direction, passenger.destination, passenger.arrive_tick)
+        self._forget_call((floor_num, direction))
+        super()._record_passenger_call(passenger, floor_num, direction)
+
+    def _record_passenger_board(self, elevator_id: int, passenger: ProxyPassenger) -> None:
+        direction = Direction.UP.value if passenger.destination > passenger.origin else Direction.DOWN.value
+        self.buckets.remove(passenger.id)
+        self._forget_call((passenger.origin, direction))
+        self._forget_car(elevator_id)
+        super()._record_passenger_board(elevator_id, passenger)
+
+    def _record_passenger_alight(self, elevator_id: int, passenger: ProxyPassenger) -> None:
+        self._forget_car(elevator_id)
+        super()._record_passenger_alight(elevator_id, passenger)
+
+    def on_passenger_call(self, passenger: ProxyPassenger, floor: ProxyFloor, direction: str) -> None:
+        super().on_passenger_call(passenger, floor, direction)
+        # 父类只唤醒第一部空闲电梯; 这里再唤醒对该呼叫分组代价最低的空闲电梯
+        # (其他空闲电梯不是代价最低者, 不会认领该呼叫; 重复下达的命令由基类的命令缓冲合并)
+        idle = [(self._call_cost(e, floor.floor, direction), e.id) for e in self.elevators if e.is_idle]
+        if idle:
+            self._find_new_target(self.elevator_by_id[min(idle)[1]])
+
+    # -------------------
+    # 分组代价
+    # -------------------
+    def _grouping_cost(self, elevator: ProxyElevator, floor_num: int, direction: str) -> float:
+        """电梯在 floor_num 接上这批乘客后新增的停靠楼层数 x stop_weight + 停靠列表被延长的楼层数"""
+        floor = self.floors[floor_num]
+        queue = floor.up_queue if direction == Direction.UP.value else floor.down_queue
+        capacity = self._predicted_free_capacity(elevator, floor_num)
+        destinations = self.buckets.boarding_destinations(queue, capacity)
+        if not destinations:
+            return 0.0
+        stops = self.destination_tracker.stops(elevator.id)
+        known = set(stops)
+        added = len(set(destinations) - known) + (0 if floor_num in known else 1)
+        if direction == Direction.UP.value:
+            extension = max(destinations) - max(stops[-1] if stops else floor_num, floor_num)
+        else:
+            extension = min(stops[0] if stops else floor_num, floor_num) - min(destinations)
+        return self.stop_weight * added + max(0, extension)
+
+    def _call_cost(self, elevator: ProxyElevator, floor_num: int, direction: str) -> float:
+        return self._cached_cost(elevator, floor_num, direction)[0]
+
+    # -------------------
+    # 代价缓存: 同一 tick 内电梯状态不变, 呼叫代价只随目的地桶 (呼叫/上车) 和停靠列表 (上车/下车) 变化
+    # -------------------
+    def _cached_cost(self, elevator: ProxyElevator, floor_num: int, direction: str) -> Tuple[float, bool]:
+        """(行驶代价 + 分组代价, 停靠时是否还有空位), 每个 (呼叫, 电梯) 每 tick 只计算一次"""
+        self._check_cost_tick()
+        key = (floor_num, direction)
+        table = self._cost_tables.setdefault(key, {})
+        entry = table.get(elevator.id)
+        if entry is None:
+            cost = super()._call_cost(elevator, floor_num, direction) + self._grouping_cost(elevator, floor_num, direction)
+            entry = table[elevator.id] = (cost, self._predicted_free_capacity(elevator, floor_num) > 0)
+            cheapest = self._cheapest.get(key)
+            if cheapest is not None and entry[1]:
+                self._cheapest[key] = heapq.nsmallest(2, cheapest + [(cost, elevator.id)])
+        return entry
+
+    def _cheapest_cars(self, floor_num: int, direction: str) -> List[Tuple[float, int]]:
+        """有空位的电梯中代价最低的两部 [(代价, 电梯)]"""
+        self._check_cost_tick()
+        key = (floor_num, direction)
+        table = self._cost_tables.setdefault(key, {})
+        if len(table) < len(self.elevator_by_id):
+            for elevator_id, elevator in self.elevator_by_id.items():
+                if elevator_id not in table:
+                    self._cached_cost(elevator, floor_num, direction)
+        cheapest = self._cheapest.get(key)
+        if cheapest is None:
+            cheapest = self._cheapest[key] = heapq.nsmallest(
+                2, [(cost, elevator_id) for elevator_id, (cost, has_room) in table.items() if has_room])
+        return cheapest
+
+    def _check_cost_tick(self) -> None:
+        # 新的 tick 电梯位置已变化, 缓存全部作废
+        if self._cost_tick != self.current_tick:
+            self._cost_tick = self.current_tick
+            self._cost_tables = {}
+            self._cheapest = {}
+
+    def _forget_call(self, key: CallKey) -> None:
+        self._cost_tables.pop(key, None)
+        self._cheapest.pop(key, None)
+
+    def _forget_car(self, elevator_id: int) -> None:
+        """该电梯的停靠列表变化: 作废它的代价; 它在某呼叫的最低两部之中时该呼叫重新排序"""
+        for key, table in self._cost_tables.items():
+            if table.pop(elevator_id, None) is not None:
+                cheapest = self._cheapest.get(key)
+                if cheapest is not None and any(other_id == elevator_id for _, other_id in cheapest):
+                    del self._cheapest[key]
+
+    def _call_available(self, elevator_id: int, floor_num: int, direction: str) -> bool:
+        """在呼叫归属规则之上: 无人认领的呼叫只对分组代价最低的电梯可用"""
+        if not super()._call_available(elevator_id, floor_num, direction):
+            return False
+        if self.hall_calls.owner(floor_num, direction) is not None:
+            return True
+        floor = self.floors[floor_num]
+        queue = floor.up_queue if direction == Direction.UP.value else floor.down_queue
+        oldest = self.buckets.oldest_arrival(queue)
+        if oldest is not None and self.current_tick - oldest >= self.hall_calls.timeout_ticks:
+            return True
+        my_cost = self._call_cost(self.elevator_by_id[elevator_id], floor_num, direction)
+        for cost, other_id in self._cheapest_cars(floor_num, direction):
+            if other_id != elevator_id:
+                # 有空位的其他电梯中代价最低者
+                return cost + self.reassign_margin >= my_cost
+        return True
+
+    def _waiting_floors(self, low: int, high: int) -> List[int]:
+        floors = sorted({floor for floor, _ in self.buckets.calls() if low <= floor < high})
+        return [i for i in floors if self.floors[i].has_waiting_passengers]
@@ -0,0 +1,145 @@
+"""
+客户端乘客目的地跟踪器 (所有控制器共用)
+
+模拟器未能正确更新 elevator.pressed_floors, 因此控制器在上/下车事件中自行记录乘客目的地。
+每部电梯维护:
+- {乘客: 目的地}            用于下车时定位
+- {楼层: 将在此层下车的人数}  O(1) 回答 "此层有人下车吗"
+- 有序停靠楼层列表           二分查找, O(log F) 回答 "上方/下方下一站"
+并可与模拟器状态对账, 发现并修正漂移。
+"""
+from bisect import bisect_left, bisect_right, insort
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+
+class DestinationTracker(object):
+
+    def __init__(self):
+        self._destinations: Dict[int, Dict[int, int]] = {}  # {elevator_id: {passenger_id: floor}}
+        self._counts: Dict[int, Dict[int, int]] = {}  # {elevator_id: {floor: 人数}}
+        self._stops: Dict[int, List[int]] = {}  # {elevator_id: 有序且不重复的停靠楼层}
+
+    def reset(self, elevator_ids: Iterable[int] = ()) -> None:
+        self._destinations = {}
+        self._counts = {}
+        self._stops = {}
+        for elevator_id in elevator_ids:
+            self._ensure(elevator_id)
+
+    def _ensure(self, elevator_id: int) -> None:
+        if elevator_id not in self._destinations:
+            self._destinations[elevator_id] = {}
+            self._counts[elevator_id] = {}
+            self._stops[elevator_id] = []
+
+    # -------------------
+    # 事件更新
+    # -------------------
+    def board(self, elevator_id: int, passenger_id: int, floor: int) -> None:
+        self._ensure(elevator_id)
+        destinations = self._destinations[elevator_id]
+        if passenger_id in destinations:
+            if destinations[passenger_id] == floor:
+                return
+            self.alight(elevator_id, passenger_id)
+        destinations[passenger_id] = floor
+        counts = self._counts[elevator_id]
+        if counts.get(floor, 0) == 0:
+            insort(self._stops[elevator_id], floor)
+        counts[floor] = counts.get(floor, 0) + 1
+
+    def alight(self, elevator_id: int, passenger_id: int) -> bool:
+        """移除乘客, 未跟踪过的乘客返回 False"""
+        destinations = self._destinations.get(elevator_id)
+        if destinations is None or passenger_id not in destinations:
+            return False
+        floor = destinations.pop(passenger_id)
+        counts = self._counts[elevator_id]
+        counts[floor] -= 1
+        if counts[floor] == 0:
+            del counts[floor]
+            stops = self._stops[elevator_id]
+            del stops[bisect_left(stops, floor)]
+        return True
+
+    # -------------------
+    # 查询
+    # -------------------
+    def load(self, elevator_id: int) -> int:
+        """电梯内 (已跟踪) 的乘客数"""
+        return len(self._destinations.get(elevator_id, ()))
+
+    def alighting_count(self, elevator_id: int, floor: int) -> int:
+        """将在 floor 下车的乘客数"""
+        return self._counts.get(elevator_id, {}).get(floor, 0)
+
+    def has_alighting(self, elevator_id: int, floor: int) -> bool:
+        return self.alighting_count(elevator_id, floor) > 0
+
+    def stops(self, elevator_id: int) -> List[int]:
+        """有序停靠楼层 (只读, 不要修改返回的列表)"""
+        return self._stops.get(elevator_id, [])
+
+    def next_stop_above(self, elevator_id: int, floor: int) -> int:
+        """严格高于 floor 的最近停靠楼层, 没有则返回 -1"""
+        stops = self.stops(elevator_id)
+        i = bisect_right(stops, floor)
+        return stops[i] if i < len(stops) else -1
+
+    def next_stop_below(self, elevator_id: int, floor: int) -> int:
+        """严格低于 floor 的最近停靠楼层, 没有则返回 -1"""
+        stops = self.stops(elevator_id)
+        i = bisect_left(stops, floor)
+        return stops[i - 1] if i > 0 else -1
+
+    def stops_above(self, elevator_id: int, floor: int) -> List[int]:
+        """严格高于 floor 的停靠楼层, 从近到远"""
+        stops = self.stops(elevator_id)
+        return stops[bisect_right(stops, floor):]
+
+    def stops_below(self, elevator_id: int, floor: int) -> List[int]:
+        """严格低于 floor 的停靠楼层, 从近到远"""
+        stops = self.stops(elevator_id)
+        return stops[:bisect_left(stops, floor)][::-1]
+
+    # -------------------
+    # 检查点
+    # -------------------
+    def state_dict(self) -> Dict[str, list]:
+        """{"elevators": [电梯], "passengers": [[电梯, 乘客, 目的地], ...]}"""
+        return {
+            "elevators": list(self._destinations),
+            "passengers": [[eid, pid, floor] for eid, destinations in self._destinations.items()
+                           for pid, floor in destinations.items()],
+        }
+
+    def load_state(self, state: Dict[str, list]) -> None:
+        self.reset(state["elevators"])
+        for elevator_id, passenger_id, floor in state["passengers"]:
+            self.board(elevator_id, passenger_id, floor)
+
+    # -------------------
+    # 对账
+    # -------------------
+    def reconcile(self, elevator_id: int, passenger_ids: Iterable[int], destination_of: Callable[[int], Optional[int]]) -> Tuple[List[int], List[int]]:
+        """
+        与模拟器状态对账:
+        passenger_ids 为模拟器中电梯内的乘客, destination_of(passenger_id) 返回乘客目的地 (未知时为 None)。
+        漏记的乘客补录, 已不在电梯内的乘客移除。
+        返回 (补录的乘客, 移除的乘客), 均为空表示没有漂移。
+        """
+        self._ensure(elevator_id)
+        inside = set(passenger_ids)
+        tracked = self._destinations[elevator_id]
+        stale = [pid for pid in tracked if pid not in inside]
+        for pid in stale:
+            self.alight(elevator_id, pid)
+        missing = []
+        for pid in inside:
+            if pid in tracked:
+                continue
+            floor = destination_of(pid)
+            if floor is not None:
+                self.board(elevator_id, pid, floor)
+                missing.append(pid)
+        return missing, stale
@@ -0,0 +1,96 @@
+"""
+厅外呼叫归属登记 (群控层)
+
+每个厅外呼叫 (楼层, 方向) 最多归属一部电梯。其他电梯在扫描时跳过已被认领的呼叫,
+避免多部电梯同时奔向同一呼叫而扎堆。归属在以下情况失效, 呼叫可被其他电梯接手:
+- 认领超过 timeout_ticks 仍未服务 (超时)
+- 调用方判断出现了更合适的电梯 (prefer 回调)
+"""
+from typing import Callable, Dict, List, Optional, Tuple
+
+CallKey = Tuple[int, str]  # (floor, "up" / "down")
+
+
+class HallCall(object):
+    __slots__ = ("owner", "assigned_tick")
+
+    def __init__(self, owner: int, assigned_tick: int):
+        self.owner = owner
+        self.assigned_tick = assigned_tick
+
+
+class HallCallRegistry(object):
+
+    def __init__(self, timeout_ticks: int = 60):
+        self.timeout_ticks = timeout_ticks
+        self._calls: Dict[CallKey, HallCall] = {}
+        self.reassign_count = 0  # 本轮改派次数 (超时或更优电梯接手)
+
+    def reset(self) -> None:
+        self._calls = {}
+        self.reassign_count = 0
+
+    def owner(self, floor: int, direction: str) -> Optional[int]:
+        call = self._calls.get((floor, direction))
+        return call.owner if call is not None else None
+
+    def is_expired(self, floor: int, direction: str, tick: int) -> bool:
+        call = self._calls.get((floor, direction))
+        return call is not None and tick - call.assigned_tick >= self.timeout_ticks
+
+    def is_available(self, floor: int, direction: str, elevator_id: int, tick: int,
+                     prefer: Optional[Callable[[int], bool]] = None) -> bool:
+        """
+        呼叫对 elevator_id 是否可用: 无人认领 / 自己认领 / 已超时 / prefer(当前归属电梯) 为 True
+        """
+        call = self._calls.get((floor, direction))
+        if call is None or call.owner == elevator_id:
+            return True
+        if tick - call.assigned_tick >= self.timeout_ticks:
+            return True
+        return prefer is not None and prefer(call.owner)
+
+    def assign(self, floor: int, direction: str, elevator_id: int, tick: int) -> Optional[int]:
+        """认领呼叫, 返回被替换的原归属电梯 (没有则为 None)"""
+        key = (floor, direction)
+        call = self._calls.get(key)
+        if call is not None and call.owner == elevator_id:
+            return None
+        previous = call.owner if call is not None else None
+        if previous is not None:
+            self.reassign_count += 1
+        self._calls[key] = HallCall(elevator_id, tick)
+        return previous
+
+    def release(self, floor: int, direction: str, elevator_id: Optional[int] = None) -> None:
+        """释放呼叫; 指定 elevator_id 时只在其为归属电梯时释放"""
+        key = (floor, direction)
+        call = self._calls.get(key)
+        if call is not None and (elevator_id is None or call.owner == elevator_id):
+            del self._calls[key]
+
+    def release_all(self, elevator_id: int) -> None:
+        for key in self.owned_calls(elevator_id):
+            del self._calls[key]
+
+    def snapshot(self) -> Tuple[Dict[CallKey, HallCall], int]:
+        # HallCall 认领后不再修改 (改派时替换), 浅拷贝即可
+        return dict(self._calls), self.reassign_count
+
+    def restore(self, snapshot: Tuple[Dict[CallKey, HallCall], int]) -> None:
+        """撤销 snapshot 之后的认领/释放"""
+        calls, self.reassign_count = snapshot
+        self._calls = dict(calls)
+
+    def state_dict(self) -> Dict[str, object]:
+        return {
+            "calls": [[floor, direction, call.owner, call.assigned_tick] for (floor, direction), call in self._calls.items()],
+            "reassign_count": self.reassign_count,
+        }
+
+    def load_state(self, state: Dict[str, object]) -> None:
+        self._calls = {(floor, direction): HallCall(owner, tick) for floor, direction, owner, tick in state["calls"]}
+        self.reassign_count = state["reassign_count"]
+
+    def owned_calls(self, elevator_id: int) -> List[CallKey]:
+        return [key for key, call in self._calls.items() if call.owner == elevator_id]
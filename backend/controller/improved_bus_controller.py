@@ -2,7 +2,7 @@
 """
 改进的公交车式电梯调度算法
 """
-from typing import List, Dict
+from typing import List
 
 from comm.websocket_broadcastor import SceneBroadcastor
 
@@ -22,10 +22,10 @@ class ImprovedElevatorBusController(BaseControllerWithComm):
         super().__init__(scene_broadcastor=scene_broadcastor, server_port=server_port, with_delay=with_delay)
         self.all_passengers: List[ProxyPassenger] = []
         self.max_floor = 0
-        
-        # 结构: {elevator_id: {passenger_id: destination_floor}}
-        # -------------------
-        self.passenger_destinations_tracker: Dict[int, Dict[int, int]] = {}
+
+    def reset(self) -> None:
+        super().reset()
+        self.all_passengers = []
 
     def on_init(self, elevators: List[ProxyElevator], floors: List[ProxyFloor]) -> None:
         super().on_init(elevators, floors)
@@ -37,9 +37,6 @@ class ImprovedElevatorBusController(BaseControllerWithComm):
             # 均匀分布电梯
             target_floor = (i * (len(floors) - 1)) // len(elevators)
             elevator.go_to_floor(target_floor, immediate=True)
-            
-            # -------------------
-            self.passenger_destinations_tracker[elevator.id] = {}
 
     def on_event_execute_start(
         self, tick: int, events: List[SimulationEvent], elevators: List[ProxyElevator], floors: List[ProxyFloor]
@@ -48,7 +45,7 @@ class ImprovedElevatorBusController(BaseControllerWithComm):
         print(f"Tick {tick}: 即将处理 {len(events)} 个事件")
         for i in elevators:
             # 打印我们自己跟踪的目的地列表
-            destinations = list(self.passenger_destinations_tracker[i.id].values())
+            destinations = self.destination_tracker.stops(i.id)
             print(
                 f"\tE{i.id}[{i.target_floor_direction.value},"
                 f"{i.current_floor_float:.1f}/{i.target_floor}] "
@@ -94,16 +91,12 @@ class ImprovedElevatorBusController(BaseControllerWithComm):
             elevator.go_to_floor(elevator.current_floor - 1)
 
     def on_passenger_board(self, elevator: ProxyElevator, passenger: ProxyPassenger) -> None:
+        super().on_passenger_board(elevator, passenger)
         print(f" 乘客{passenger.id} E{elevator.id}⬆️ F{elevator.current_floor} -> F{passenger.destination}")
-        
-
-        self.passenger_destinations_tracker[elevator.id][passenger.id] = passenger.destination
 
     def on_passenger_alight(self, elevator: ProxyElevator, passenger: ProxyPassenger, floor: ProxyFloor) -> None:
+        super().on_passenger_alight(elevator, passenger, floor)
         print(f" 乘客{passenger.id} E{elevator.id}⬇️ F{floor.floor}")
-        
-        if passenger.id in self.passenger_destinations_tracker[elevator.id]:
-            del self.passenger_destinations_tracker[elevator.id][passenger.id]
 
     def on_elevator_passing_floor(self, elevator: ProxyElevator, floor: ProxyFloor, direction: str) -> None:
         print(f"🔄 电梯 E{elevator.id} 经过 F{floor.floor} (方向: {direction})")
@@ -116,11 +109,8 @@ class ImprovedElevatorBusController(BaseControllerWithComm):
             print(f"  E{elevator.id} 未满载，正常停靠。")
             return
         
-        # 获取这部电梯所有乘客的目的地
-        current_elevator_destinations = self.passenger_destinations_tracker[elevator.id].values()
-
         # 检查2: 满载状态下，是否有人要在此层下车？
-        if floor.floor in current_elevator_destinations:
+        if self.destination_tracker.has_alighting(elevator.id, floor.floor):
             # 满载，但有乘客要下车，必须停靠
             print(f"  E{elevator.id} 已满载，但有乘客在 F{floor.floor} 下车，正常停靠。")
             return
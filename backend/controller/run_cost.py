@@ -0,0 +1,157 @@
+"""
+单轮运行代价统计 (多目标: 等待 / 乘坐 / 停靠次数 / 启动次数 / 行驶距离与能耗)
+
+每个 tick 结束时从模拟器状态采样电梯的 run_status 与位置:
+- 停靠: run_status 由运行态变为 stopped
+- 启动: run_status 由 stopped 变为 start_up (一次加速 = 一次启动, 机械磨损的主要来源)
+- 距离: 相邻两 tick 的 current_floor_float 之差
+- 能耗: 模拟器累计的 ElevatorState.energy_consumed
+等待/乘坐时间由上/下车事件累加。
+从检查点恢复时, 采样的部分 (sample_state_dict) 每个 tick 单独保存, 恢复后在模拟器的当前 tick 补采一次;
+仍有 tick 未被采样时 (记录在 unsampled_ticks) 停靠/启动/距离为近似值。
+"""
+from typing import Dict
+
+from elevator_saga.core.models import ElevatorStatus
+
+
+class CostWeights(object):
+    """各项代价的权重, 加权和即为该轮的总代价"""
+
+    __slots__ = ("wait", "ride", "stop", "start", "distance", "energy")
+
+    def __init__(self, wait=1.0, ride=1.0, stop=0.0, start=0.0, distance=0.0, energy=0.0):
+        self.wait = wait  # 每乘客每 tick 的候梯代价
+        self.ride = ride  # 每乘客每 tick 的乘梯代价
+        self.stop = stop  # 每次停靠的代价
+        self.start = start  # 每次启动 (加速) 的代价
+        self.distance = distance  # 每层行驶距离的代价
+        self.energy = energy  # 每单位模拟器能耗的代价
+
+    def to_dict(self) -> Dict[str, float]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def parse(cls, text: str) -> "CostWeights":
+        """解析 "wait=1,stop=5" 形式的权重, 未给出的项取默认值"""
+        weights = cls()
+        for item in filter(None, text.split(",")):
+            name, _, value = item.partition("=")
+            name = name.strip()
+            if name not in cls.__slots__:
+                raise ValueError(f"Unknown cost weight: {name}")
+            setattr(weights, name, float(value))
+        return weights
+
+
+class RunCostMeter(object):
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.stops = 0
+        self.starts = 0
+        self.distance = 0.0
+        self.energy = 0.0
+        self.wait_ticks = 0
+        self.ride_ticks = 0
+        self.sampled_tick = -1  # 最近一次采样的 tick
+        self.unsampled_ticks = 0  # 断点恢复时漏采的 tick 数, 不为 0 时停靠/启动/距离为近似值
+        self._last_status: Dict[int, ElevatorStatus] = {}  # {elevator_id: 上一 tick 的 run_status}
+        self._last_pos: Dict[int, float] = {}  # {elevator_id: 上一 tick 的位置}
+        self._board_tick: Dict[int, int] = {}  # {passenger_id: 上车 tick}
+
+    # -------------------
+    # 采样与事件
+    # -------------------
+    def sample(self, state) -> None:
+        """每个 tick 结束时调用, state: SimulationState"""
+        energy = 0.0
+        for e in state.elevators:
+            status = e.run_status
+            last = self._last_status.get(e.id, ElevatorStatus.STOPPED)
+            if status != last:
+                if status == ElevatorStatus.STOPPED:
+                    self.stops += 1
+                elif last == ElevatorStatus.STOPPED:
+                    self.starts += 1
+            self._last_status[e.id] = status
+
+            pos = e.current_floor_float
+            last_pos = self._last_pos.get(e.id)
+            if last_pos is not None:
+                self.distance += abs(pos - last_pos)
+            self._last_pos[e.id] = pos
+            energy += e.energy_consumed
+        self.energy = energy
+        self.sampled_tick = state.tick
+
+    def on_board(self, tick: int, passenger_id: int, arrive_tick: int) -> None:
+        self.wait_ticks += tick - arrive_tick
+        self._board_tick[passenger_id] = tick
+
+    def on_alight(self, tick: int, passenger_id: int) -> None:
+        board_tick = self._board_tick.pop(passenger_id, None)
+        if board_tick is not None:
+            self.ride_ticks += tick - board_tick
+
+    # -------------------
+    # 检查点
+    # -------------------
+    def state_dict(self) -> Dict[str, object]:
+        return {
+            **self.sample_state_dict(),
+            "wait_ticks": self.wait_ticks,
+            "ride_ticks": self.ride_ticks,
+            "unsampled_ticks": self.unsampled_ticks,
+            "board_tick": [[pid, tick] for pid, tick in self._board_tick.items()],
+        }
+
+    def load_state(self, state: Dict[str, object]) -> None:
+        self.reset()
+        self.load_sample_state(state)
+        self.wait_ticks = state["wait_ticks"]
+        self.ride_ticks = state["ride_ticks"]
+        self.unsampled_ticks = state.get("unsampled_ticks", 0)
+        self._board_tick = {pid: tick for pid, tick in state["board_tick"]}
+
+    def sample_state_dict(self) -> Dict[str, object]:
+        """采样得到的部分 (每个 tick 都会变化, 很小), 检查点在每个 tick 单独保存"""
+        return {
+            "tick": self.sampled_tick,
+            "stops": self.stops,
+            "starts": self.starts,
+            "distance": self.distance,
+            "energy": self.energy,
+            "last_status": [[eid, status.value] for eid, status in self._last_status.items()],
+            "last_pos": [[eid, pos] for eid, pos in self._last_pos.items()],
+        }
+
+    def load_sample_state(self, state: Dict[str, object]) -> None:
+        for name in ("stops", "starts", "distance", "energy"):
+            setattr(self, name, state[name])
+        self.sampled_tick = state.get("tick", -1)
+        self._last_status = {eid: ElevatorStatus(status) for eid, status in state["last_status"]}
+        self._last_pos = {eid: pos for eid, pos in state["last_pos"]}
+
+    # -------------------
+    # 汇总
+    # -------------------
+    def total(self, weights: CostWeights) -> float:
+        return (weights.wait * self.wait_ticks + weights.ride * self.ride_ticks
+                + weights.stop * self.stops + weights.start * self.starts
+                + weights.distance * self.distance + weights.energy * self.energy)
+
+    def to_dict(self, weights: CostWeights) -> Dict[str, float]:
+        """扁平字典, 可直接并入 server_metrics_update 的指标表"""
+        return {
+            "cost_wait_ticks": self.wait_ticks,
+            "cost_ride_ticks": self.ride_ticks,
+            "cost_stops": self.stops,
+            "cost_starts": self.starts,
+            "cost_distance": round(self.distance, 2),
+            "cost_energy": round(self.energy, 2),
+            "cost_total": round(self.total(weights), 2),
+            "cost_unsampled_ticks": self.unsampled_ticks,
+        }
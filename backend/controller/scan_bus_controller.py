@@ -11,14 +11,21 @@
     电梯会“立即转向”，并前往相反方向上“最远的”一个工作楼层，开始新的扫描。
 
 保留特性:
-1. 满载跳过 (on_elevator_approaching): 电梯满载时，如果无人下车，会强制跳过。
-2. 乘客跟踪 (on_passenger_board/alight): 客户端手动跟踪乘客，修复了模拟器bug。
+1. 载荷感知跳过 (on_elevator_approaching): 预测下客后的剩余容量，若无人下车且剩余容量
+   无法有效接载该层等待乘客，则强制跳过，并把该层呼叫移交给其他电梯。
+2. 乘客跟踪: 使用基类的 DestinationTracker 在客户端跟踪乘客目的地，修复了模拟器bug。
+3. 群控呼叫归属: 每个厅外呼叫 (楼层, 方向) 由一部电梯认领，其他电梯扫描时跳过，
+   超时未服务、归属电梯已满载或出现明显更近的电梯时改派，避免多部电梯扎堆。
+4. 呼叫老化: 候梯超过 max_wait_ticks 的呼叫按 (等待时间 - 行驶代价) 排序，空载电梯优先前往，
+   避免边缘楼层在电梯反复提前转向时长期得不到服务 (降低 p95 候梯时间)。
 """
-from typing import List, Dict, Set
+from typing import List
 
 from comm.websocket_broadcastor import SceneBroadcastor
 
+from .aging_calls import AgingCallQueue
 from .controller_with_comm import BaseControllerWithComm
+from .hall_call_registry import HallCallRegistry
 from elevator_saga.client.proxy_models import ProxyElevator, ProxyFloor, ProxyPassenger
 from elevator_saga.core.models import Direction, SimulationEvent
 
@@ -28,31 +35,101 @@ class ScanningSweepController(BaseControllerWithComm):
     高效扫描调度算法 (Look-Ahead)
     - 智能转向 (不再盲目到顶)
     - 自动跳过空站
-    - 满载时跳过 (Forced skip)
+    - 载荷感知跳过 (Load-aware skip)
     - 客户端修复乘客跟踪
+    - 群控呼叫归属 (防扎堆)
+    - 呼叫老化 (防饿死)
     """
 
-    def __init__(self, scene_broadcastor: SceneBroadcastor, server_port=8000, with_delay=False):
+    # 可调策略参数及其候选值 (供 tune.py 网格/随机搜索使用), 第一个值为默认值
+    TUNABLE_PARAMS = {
+        "bypass_enabled": [True, False],
+        "bypass_min_boarding": [2, 1, 3, 4],
+        "parking_floor_ratio": [0.5, None, 0.0, 0.25, 0.75],
+        "learned_parking": [False, True],
+        "spread_offset": [0.0, 0.5],
+        "call_timeout_ticks": [60, 20, 120],
+        "reassign_margin": [2.0, 0.0, 4.0],
+        "max_wait_ticks": [60, None, 40, 90, 120],
+    }
+
+    def __init__(self, scene_broadcastor: SceneBroadcastor, server_port=8000, with_delay=False, bypass_min_boarding=2,
+                 call_timeout_ticks=60, reassign_margin=2.0, bypass_enabled=True, parking_floor_ratio=0.5, spread_offset=0.0,
+                 max_wait_ticks=60, learned_parking=False):
         super().__init__(scene_broadcastor=scene_broadcastor, server_port=server_port, with_delay=with_delay)
         self.all_passengers: List[ProxyPassenger] = []
         self.max_floor = 0
         
-        # 客户端乘客跟踪器 (修复模拟器bug)
-        self.passenger_destinations_tracker: Dict[int, Dict[int, int]] = {}
+        # 载荷感知跳过: 下客后剩余容量少于 min(同向等待人数, bypass_min_boarding) 时跳过该层
+        self.bypass_enabled = bypass_enabled
+        self.bypass_min_boarding = bypass_min_boarding
+        
+        # 空闲停靠楼层 = int(max_floor * parking_floor_ratio), 为 None 时空闲电梯原地等待
+        self.parking_floor_ratio = parking_floor_ratio
+        # 启用时改为停靠在已学习的呼叫统计的加权中位楼层 (尚无统计时仍按 parking_floor_ratio)
+        self.learned_parking = learned_parking
+        # 初始分布: 第 i 部电梯前往 int((i + spread_offset) * (楼层数 - 1) / 电梯数)
+        self.spread_offset = spread_offset
+        
+        # 群控: 呼叫归属登记。认领超过 call_timeout_ticks 未服务即可被改派；
+        # 其他电梯的代价比归属电梯低 reassign_margin 以上时也可接手
+        self.hall_calls = HallCallRegistry(timeout_ticks=call_timeout_ticks)
+        self.reassign_margin = reassign_margin
+        self.elevator_by_id = {}
+        
+        # 呼叫老化: 候梯超过 max_wait_ticks 的呼叫由空载电梯优先服务, 为 None 时关闭
+        self.max_wait_ticks = max_wait_ticks
+        self.aging_calls = AgingCallQueue()
+
+    def reset(self) -> None:
+        super().reset()
+        self.all_passengers = []
+        self.hall_calls.reset()
+        self.aging_calls.reset()
 
     def on_init(self, elevators: List[ProxyElevator], floors: List[ProxyFloor]) -> None:
         super().on_init(elevators, floors)
         print("🚀 高效扫描调度算法已启动 (智能转向)")
         self.max_floor = floors[-1].floor
         self.floors = floors # 存储所有楼层代理对象，用于后续检查
+        self.elevator_by_id = {e.id: e for e in elevators}
+        self.hall_calls.reset()
         
         for i, elevator in enumerate(elevators):
             # 均匀分布电梯
-            target_floor = (i * (len(floors) - 1)) // len(elevators)
+            target_floor = int((i + self.spread_offset) * (len(floors) - 1) / len(elevators))
             elevator.go_to_floor(target_floor, immediate=True)
-            
-            # 初始化跟踪器
-            self.passenger_destinations_tracker[elevator.id] = {}
+
+    # -------------------
+    # 检查点
+    # -------------------
+    def on_resume(self, elevators: List[ProxyElevator], floors: List[ProxyFloor]) -> None:
+        super().on_resume(elevators, floors)
+        self.max_floor = floors[-1].floor
+        self.floors = floors
+        self.elevator_by_id = {e.id: e for e in elevators}
+
+    def after_resume(self) -> None:
+        # 检查点之后的认领/释放已随崩溃丢失: 按各电梯当前的去向重建 (扫描只认领目标楼层的呼叫)
+        for elevator in self.elevators:
+            for floor_num, direction in self.hall_calls.owned_calls(elevator.id):
+                if elevator.is_idle or elevator.target_floor != floor_num:
+                    self.hall_calls.release(floor_num, direction, elevator.id)
+            if not elevator.is_idle:
+                self._claim_calls(elevator, elevator.target_floor)
+        super().after_resume()
+
+    def checkpoint_state(self) -> dict:
+        state = super().checkpoint_state()
+        state["hall_calls"] = self.hall_calls.state_dict()
+        state["aging_calls"] = self.aging_calls.state_dict()
+        return state
+
+    def restore_checkpoint(self, state: dict) -> None:
+        super().restore_checkpoint(state)
+        self.hall_calls.load_state(state["hall_calls"])
+        self.aging_calls.load_state(state["aging_calls"])
+        self.all_passengers = [ProxyPassenger(pid, self.api_client) for pid in self.scene_manager.passengers]
 
     def on_event_execute_start(
         self, tick: int, events: List[SimulationEvent], elevators: List[ProxyElevator], floors: List[ProxyFloor]
@@ -60,20 +137,27 @@ class ScanningSweepController(BaseControllerWithComm):
         # 打印状态
         print(f"Tick {tick}: 即将处理 {len(events)} 个事件")
         for i in elevators:
-            destinations = list(self.passenger_destinations_tracker[i.id].values())
             print(
                 f"\tE{i.id}[{i.target_floor_direction.value},"
                 f"{i.current_floor_float:.1f}/{i.target_floor}] "
-                f"Dest:{sorted(list(set(destinations)))} "
+                f"Dest:{self.destination_tracker.stops(i.id)} "
                 + "👦" * len(i.passengers),
                 end="",
             )
         print()
 
 
+    def _record_passenger_call(self, passenger: ProxyPassenger, floor_num: int, direction: str) -> None:
+        super()._record_passenger_call(passenger, floor_num, direction)
+        self.all_passengers.append(passenger)
+        self.aging_calls.add(passenger.id, floor_num, direction, passenger.arrive_tick)
+
+    def _record_passenger_board(self, elevator_id: int, passenger: ProxyPassenger) -> None:
+        super()._record_passenger_board(elevator_id, passenger)
+        self.aging_calls.remove(passenger.id)
+
     def on_passenger_call(self, passenger: ProxyPassenger, floor: ProxyFloor, direction: str) -> None:
         super().on_passenger_call(passenger, floor, direction)
-        self.all_passengers.append(passenger)
         print(f"乘客 {passenger.id} F{floor.floor} 请求 {passenger.origin} -> {passenger.destination} ({direction})")
         # 可以在此主动检查是否有空闲电梯
         for elev in self.elevators:
@@ -86,29 +170,98 @@ class ScanningSweepController(BaseControllerWithComm):
         # 寻找新工作，而不是盲目前往 F1
         self._find_new_target(elevator)
 
-    def _find_work_above(self, current_floor: int, destinations_inside: Set[int]) -> List[int]:
+    # -------------------
+    # 群控: 呼叫归属
+    # -------------------
+    def _travel_cost(self, elevator: ProxyElevator, floor_num: int, direction: str) -> float:
+        """电梯前往呼叫 (floor_num, direction) 的行驶代价: 顺路时为距离，否则加上折返的代价"""
+        pos = elevator.current_floor_float
+        distance = abs(pos - floor_num)
+        heading = elevator.target_floor_direction
+        if elevator.is_idle or heading == Direction.STOPPED:
+            return distance
+        if heading == Direction.UP and direction == Direction.UP.value and pos <= floor_num:
+            return distance
+        if heading == Direction.DOWN and direction == Direction.DOWN.value and pos >= floor_num:
+            return distance
+        return distance + 2 * self.max_floor
+
+    def _call_cost(self, elevator: ProxyElevator, floor_num: int, direction: str) -> float:
+        """电梯服务呼叫的估计代价, 用于比较归属电梯与其他电梯; 子类可加入其他代价项"""
+        return self._travel_cost(elevator, floor_num, direction)
+
+    def _call_available(self, elevator_id: int, floor_num: int, direction: str) -> bool:
+        """呼叫对该电梯是否可用 (未被认领 / 自己认领 / 超时 / 归属电梯已满载或明显更远)"""
+        def prefer(owner_id: int) -> bool:
+            owner = self.elevator_by_id.get(owner_id)
+            if owner is None or self._predicted_free_capacity(owner, floor_num) <= 0:
+                return True
+            if owner.target_floor != floor_num and self._travel_cost(owner, floor_num, direction) > self.max_floor:
+                return True  # 归属电梯已背向而行 (如被改道)，不再视为在途
+            owner_cost = self._call_cost(owner, floor_num, direction)
+            me = self.elevator_by_id[elevator_id]
+            return self._call_cost(me, floor_num, direction) + self.reassign_margin < owner_cost
+        return self.hall_calls.is_available(floor_num, direction, elevator_id, self.current_tick, prefer)
+
+    def _floor_has_call_for(self, elevator_id: int, floor_num: int) -> bool:
+        floor = self.floors[floor_num]
+        return ((bool(floor.up_queue) and self._call_available(elevator_id, floor_num, Direction.UP.value)) or
+                (bool(floor.down_queue) and self._call_available(elevator_id, floor_num, Direction.DOWN.value)))
+
+    def _claim_calls(self, elevator: ProxyElevator, target: int) -> None:
+        """电梯前往 target 时认领该层的呼叫: 优先与行进方向相同的呼叫，该方向无人等待时认领反向呼叫 (转向点)"""
+        floor = self.floors[target]
+        travel = Direction.UP.value if target > elevator.current_floor else Direction.DOWN.value
+        opposite = Direction.DOWN.value if travel == Direction.UP.value else Direction.UP.value
+        queues = {Direction.UP.value: floor.up_queue, Direction.DOWN.value: floor.down_queue}
+        for direction in (travel, opposite):
+            if queues[direction] and self._call_available(elevator.id, target, direction):
+                previous = self.hall_calls.assign(target, direction, elevator.id, self.current_tick)
+                if previous is not None:
+                    print(f"  F{target}({direction}) 的呼叫由 E{previous} 改派给 E{elevator.id}。")
+                return
+
+    def _go_to_work(self, elevator: ProxyElevator, target: int, immediate: bool = False) -> None:
+        elevator.go_to_floor(target, immediate=immediate)
+        self._claim_calls(elevator, target)
+
+    # -------------------
+    # 决策耗时守护
+    # -------------------
+    def decision_snapshot(self):
+        return super().decision_snapshot(), self.hall_calls.snapshot()
+
+    def restore_decision_snapshot(self, snapshot) -> int:
+        commands, hall_calls = snapshot
+        self.hall_calls.restore(hall_calls)
+        return super().restore_decision_snapshot(commands)
+
+    def go_to_fallback_target(self, elevator: ProxyElevator, target: int) -> None:
+        """兜底目标取代了该电梯之前的去向: 释放它认领的呼叫, 改为认领兜底目标层的呼叫"""
+        self.hall_calls.release_all(elevator.id)
+        self._go_to_work(elevator, target)
+
+    def _waiting_floors(self, low: int, high: int) -> List[int]:
+        """[low, high) 中有乘客候梯的楼层 (升序); 子类可用自己的呼叫索引代替逐层检查"""
+        return [i for i in range(low, high) if self.floors[i].has_waiting_passengers]
+
+    def _find_work_above(self, elevator_id: int, current_floor: int) -> List[int]:
         """扫描当前楼层之上的所有工作，返回排序好的楼层列表 (从近到远)"""
-        work_floors = set()
-        # 1. 扫描电梯内的乘客目的地
-        for f in destinations_inside:
-            if f > current_floor:
-                work_floors.add(f)
-        # 2. 扫描楼层上的等待乘客
-        for i in range(current_floor + 1, self.max_floor + 1):
-            if self.floors[i].has_waiting_passengers:
+        # 1. 电梯内乘客在上方的目的地 (跟踪器中已有序)
+        work_floors = set(self.destination_tracker.stops_above(elevator_id, current_floor))
+        # 2. 扫描楼层上的等待乘客 (跳过已被其他电梯认领的呼叫)
+        for i in self._waiting_floors(current_floor + 1, self.max_floor + 1):
+            if self._floor_has_call_for(elevator_id, i):
                 work_floors.add(i)
         return sorted(list(work_floors)) # [F3, F5]
 
-    def _find_work_below(self, current_floor: int, destinations_inside: Set[int]) -> List[int]:
+    def _find_work_below(self, elevator_id: int, current_floor: int) -> List[int]:
         """扫描当前楼层之下的所有工作，返回排序好的楼层列表 (从近到远)"""
-        work_floors = set()
-        # 1. 扫描电梯内的乘客目的地
-        for f in destinations_inside:
-            if f < current_floor:
-                work_floors.add(f)
-        # 2. 扫描楼层上的等待乘客
-        for i in range(0, current_floor):
-            if self.floors[i].has_waiting_passengers:
+        # 1. 电梯内乘客在下方的目的地 (跟踪器中已有序)
+        work_floors = set(self.destination_tracker.stops_below(elevator_id, current_floor))
+        # 2. 扫描楼层上的等待乘客 (跳过已被其他电梯认领的呼叫)
+        for i in self._waiting_floors(0, current_floor):
+            if self._floor_has_call_for(elevator_id, i):
                 work_floors.add(i)
         return sorted(list(work_floors), reverse=True) # [F2, F0]
 
@@ -122,14 +275,52 @@ class ScanningSweepController(BaseControllerWithComm):
             f"🛑 电梯 E{elevator.id} 停靠在 F{floor.floor}. "
             f"载客: {len(elevator.passengers)}/{elevator.max_capacity}"
         )
+        # 停靠即服务了本层的呼叫，释放认领 (没接完的乘客会重新成为无人认领的呼叫)
+        self.hall_calls.release(floor.floor, Direction.UP.value, elevator.id)
+        self.hall_calls.release(floor.floor, Direction.DOWN.value, elevator.id)
         
         self._find_new_target(elevator)
 
     def _find_new_target(self, elevator: ProxyElevator):
         """为电梯寻找下一个最佳目标的核心决策逻辑"""
+        target = self._urgent_target(elevator)
+        if target == -1:
+            target = self._choose_target(elevator)
+        if target != -1:
+            self._go_to_work(elevator, target)
+            return
+
+        # --- 情况 C: 全楼都没有工作 ---
+        # 保持静止，等待 on_elevator_idle 触发 (或让其自然触发)
+        # 我们也可以主动让它去中层停靠
+        self._park(elevator)
+
+    def _urgent_target(self, elevator: ProxyElevator) -> int:
+        """
+        呼叫老化: 空载电梯在候梯超过 max_wait_ticks 的呼叫中选择 (等待时间 - 行驶代价) 最高且可认领者，
+        没有时返回 -1 (按扫描规则决策)。载客电梯不绕路，以免拖长车内乘客的行程。
+        """
+        if self.max_wait_ticks is None or self.destination_tracker.load(elevator.id) > 0:
+            return -1
+
+        def score(call, waited):
+            floor_num, direction = call
+            if floor_num == elevator.current_floor or not self._call_available(elevator.id, floor_num, direction):
+                return None
+            return waited - self._travel_cost(elevator, floor_num, direction)
+
+        call, _ = self.aging_calls.most_urgent(self.current_tick, self.max_wait_ticks, score)
+        if call is None:
+            return -1
+        floor_num, direction = call
+        print(f"  (老化) F{floor_num}({direction}) 的呼叫已超过 {self.max_wait_ticks} tick，优先前往。")
+        self.hall_calls.assign(floor_num, direction, elevator.id, self.current_tick)
+        return floor_num
+
+    def _choose_target(self, elevator: ProxyElevator) -> int:
+        """按扫描规则选择下一个工作楼层，全楼都没有工作时返回 -1"""
         
         current_floor = elevator.current_floor
-        destinations_inside = set(self.passenger_destinations_tracker[elevator.id].values())
         
         # 确定电梯当前的“意图” (方向)
         direction_intent = elevator.last_tick_direction
@@ -139,127 +330,175 @@ class ScanningSweepController(BaseControllerWithComm):
              # 默认意图是上行
              direction_intent = Direction.UP
              # 但如果上方没工作而下方有，则意图改为下行
-             if (not self._find_work_above(current_floor, destinations_inside) and 
-                 self._find_work_below(current_floor, destinations_inside)):
+             if (not self._find_work_above(elevator.id, current_floor) and 
+                 self._find_work_below(elevator.id, current_floor)):
                  direction_intent = Direction.DOWN
 
         # --- 情况 A: 意图是上行 ---
         if direction_intent == Direction.UP:
-            work_above = self._find_work_above(current_floor, destinations_inside)
+            work_above = self._find_work_above(elevator.id, current_floor)
             if work_above:
                 # 找到了！前往上方最近的一个工作
-                target = work_above[0]
-                print(f"  (上行) 上方最近的工作在 F{target}，前往。")
-                elevator.go_to_floor(target)
-                return
+                print(f"  (上行) 上方最近的工作在 F{work_above[0]}，前往。")
+                return work_above[0]
             
             # 如果上方没有工作了，执行“智能转向”
             print("  (上行) 上方已无工作，立即转向下行。")
-            work_below = self._find_work_below(current_floor, destinations_inside)
+            work_below = self._find_work_below(elevator.id, current_floor)
             if work_below:
                 # 转向，并前往下方“最远”(最高)的一个工作
-                target = work_below[0] 
-                print(f"  (转向) 下方最远的工作在 F{target}，前往。")
-                elevator.go_to_floor(target)
-                return
+                print(f"  (转向) 下方最远的工作在 F{work_below[0]}，前往。")
+                return work_below[0]
 
         # --- 情况 B: 意图是下行 ---
         if direction_intent == Direction.DOWN:
-            work_below = self._find_work_below(current_floor, destinations_inside)
+            work_below = self._find_work_below(elevator.id, current_floor)
             if work_below:
                 # 找到了！前往下方最近的一个工作
-                target = work_below[0]
-                print(f"  (下行) 下方最近的工作在 F{target}，前往。")
-                elevator.go_to_floor(target)
-                return
+                print(f"  (下行) 下方最近的工作在 F{work_below[0]}，前往。")
+                return work_below[0]
 
             # 如果下方没有工作了，执行“智能转向”
             print("  (下行) 下方已无工作，立即转向上行。")
-            work_above = self._find_work_above(current_floor, destinations_inside)
+            work_above = self._find_work_above(elevator.id, current_floor)
             if work_above:
                 # 转向，并前往上方“最远”(最低)的一个工作
-                target = work_above[0]
-                print(f"  (转向) 上方最远的工作在 F{target}，前往。")
-                elevator.go_to_floor(target)
-                return
-
-        # --- 情况 C: 全楼都没有工作 ---
-        # print(f"  E{elevator.id} 在 F{floor.floor} 停靠，全楼已无工作。")
-        # 保持静止，等待 on_elevator_idle 触发 (或让其自然触发)
-        # 我们也可以主动让它去中层停靠
-        parking_floor = self.max_floor // 2
-        if current_floor != parking_floor:
-            print(f"  前往中层 F{parking_floor} 停靠。")
+                print(f"  (转向) 上方最远的工作在 F{work_above[0]}，前往。")
+                return work_above[0]
+
+        return -1
+
+    def _parking_floor(self) -> int:
+        """空闲停靠楼层, 未启用停靠时返回 -1"""
+        if self.parking_floor_ratio is None:
+            return -1
+        if self.learned_parking:
+            learned = self.call_median_floor()
+            if learned != -1:
+                return min(learned, self.max_floor)
+        return int(self.max_floor * self.parking_floor_ratio)
+
+    def _park(self, elevator: ProxyElevator) -> None:
+        """空闲停靠: 默认前往中层，以便最快响应来自任何方向的新呼叫"""
+        parking_floor = self._parking_floor()
+        if parking_floor != -1 and elevator.current_floor != parking_floor:
+            print(f"  前往 F{parking_floor} 停靠。")
             elevator.go_to_floor(parking_floor)
 
     # -------------------
     # 乘客跟踪 (修复Bug)
     # -------------------
     def on_passenger_board(self, elevator: ProxyElevator, passenger: ProxyPassenger) -> None:
+        super().on_passenger_board(elevator, passenger)
         print(f" 乘客{passenger.id} E{elevator.id}⬆️ F{elevator.current_floor} -> F{passenger.destination}")
-        # 手动记录乘客目的地
-        self.passenger_destinations_tracker[elevator.id][passenger.id] = passenger.destination
 
     def on_passenger_alight(self, elevator: ProxyElevator, passenger: ProxyPassenger, floor: ProxyFloor) -> None:
+        super().on_passenger_alight(elevator, passenger, floor)
         print(f" 乘客{passenger.id} E{elevator.id}⬇️ F{floor.floor}")
-        # 手动移除乘客
-        if passenger.id in self.passenger_destinations_tracker[elevator.id]:
-            del self.passenger_destinations_tracker[elevator.id][passenger.id]
 
     def on_elevator_passing_floor(self, elevator: ProxyElevator, floor: ProxyFloor, direction: str) -> None:
         print(f"🔄 电梯 E{elevator.id} 经过 F{floor.floor} (方向: {direction})")
 
     # -------------------
-    # 满载跳过 (保留的特性)
+    # 载荷感知跳过 (满载跳过的改进版)
     # -------------------
+    def _alighting_count(self, elevator: ProxyElevator, floor_num: int) -> int:
+        """电梯内将在 floor_num 下车的乘客数"""
+        return self.destination_tracker.alighting_count(elevator.id, floor_num)
+
+    def _predicted_free_capacity(self, elevator: ProxyElevator, floor_num: int) -> int:
+        """预测电梯在 floor_num 完成下客后的剩余容量"""
+        load = self.destination_tracker.load(elevator.id)
+        return elevator.max_capacity - load + self._alighting_count(elevator, floor_num)
+
+    def _should_bypass(self, elevator: ProxyElevator, floor: ProxyFloor, direction: str) -> bool:
+        """
+        判断是否应跳过即将到达的楼层:
+        1. 有乘客在此层下车 -> 必须停靠
+        2. 同向等待队列为空 -> 交给扫描逻辑 (可能是转向点)，正常停靠
+        3. 下客后剩余容量 < min(同向等待人数, bypass_min_boarding) -> 停靠价值不大，跳过
+        """
+        if not self.bypass_enabled or self._alighting_count(elevator, floor.floor) > 0:
+            return False
+        queue = floor.up_queue if direction == Direction.UP.value else floor.down_queue
+        if not queue:
+            return False
+        free_capacity = self._predicted_free_capacity(elevator, floor.floor)
+        return free_capacity < min(len(queue), self.bypass_min_boarding)
+
+    def _handoff_call(self, floor: ProxyFloor, direction: str, skipping: ProxyElevator) -> None:
+        """把被跳过楼层的呼叫交给另一部电梯 (优先空闲电梯，其次最近且有余量的电梯)"""
+        best, best_cost = None, None
+        for elev in self.elevators:
+            if elev.id == skipping.id:
+                continue
+            if self._predicted_free_capacity(elev, floor.floor) <= 0:
+                continue
+            cost = abs(elev.current_floor_float - floor.floor)
+            if not elev.is_idle:
+                # 正在运行的电梯只有在顺路时才计入，且代价更高
+                heading_up = elev.target_floor_direction == Direction.UP
+                if direction == Direction.UP.value and not (heading_up and elev.current_floor_float <= floor.floor):
+                    continue
+                if direction == Direction.DOWN.value and not (not heading_up and elev.current_floor_float >= floor.floor):
+                    continue
+                cost += self.destination_tracker.load(elev.id)
+            if best_cost is None or cost < best_cost:
+                best, best_cost = elev, cost
+
+        # 跳过的电梯放弃认领
+        self.hall_calls.release(floor.floor, direction, skipping.id)
+        if best is None:
+            print(f"  F{floor.floor} 的呼叫暂无其他电梯可接，留待扫描逻辑处理。")
+            return
+        if best.is_idle:
+            print(f"  F{floor.floor} 的呼叫移交给空闲电梯 E{best.id}。")
+            best.go_to_floor(floor.floor)
+        else:
+            print(f"  F{floor.floor} 的呼叫由顺路电梯 E{best.id} 接载。")
+        self.hall_calls.assign(floor.floor, direction, best.id, self.current_tick)
+
     def on_elevator_approaching(self, elevator: ProxyElevator, floor: ProxyFloor, direction: str) -> None:
         """
         当电梯 *即将到达* 楼层时调用（即，开始减速时）
-        我们在这里实现“满载跳过”逻辑
+        我们在这里实现“载荷感知跳过”逻辑
         """
         print(f"🎯 电梯 E{elevator.id} 即将到达 F{floor.floor} (方向: {direction})")
 
-        # 检查1: 电梯是否满载？
-        if not elevator.is_full:
-            print(f"  E{elevator.id} 未满载，正常停靠。")
-            return
-
-        # 检查2: 满载状态下，是否有人要在此层下车？
-        current_elevator_destinations = self.passenger_destinations_tracker[elevator.id].values()
-        if floor.floor in current_elevator_destinations:
-            print(f"  E{elevator.id} 已满载，但有乘客在 F{floor.floor} 下车，正常停靠。")
+        if not self._should_bypass(elevator, floor, direction):
+            print(f"  E{elevator.id} 正常停靠 F{floor.floor}。")
             return
 
-        # 结论: 电梯已满载，且此层无人下车。执行强制跳过。
+        # 结论: 此层无人下车，且剩余容量无法有效接载等待乘客。执行强制跳过。
         print(
-            f"  E{elevator.id} 已满载 (载客 {len(elevator.passengers)}/{elevator.max_capacity}) "
-            f"且 F{floor.floor} 无乘客下车。"
+            f"  E{elevator.id} 预测剩余容量 {self._predicted_free_capacity(elevator, floor.floor)} "
+            f"(载客 {len(elevator.passengers)}/{elevator.max_capacity})，且 F{floor.floor} 无乘客下车。"
         )
 
         # 执行跳过：立即设置新目标为“当前方向的下一个工作楼层”
-        destinations_inside = set(self.passenger_destinations_tracker[elevator.id].values())
         new_target = -1
         
         if direction == Direction.UP.value and floor.floor < self.max_floor:
             # 寻找越过此层后，上方的下一个工作
-            work_above = self._find_work_above(floor.floor, destinations_inside)
+            work_above = self._find_work_above(elevator.id, floor.floor)
             if work_above:
                 new_target = work_above[0]
 
         elif direction == Direction.DOWN.value and floor.floor > 0:
             # 寻找越过此层后，下方的下一个工作
-            work_below = self._find_work_below(floor.floor, destinations_inside)
+            work_below = self._find_work_below(elevator.id, floor.floor)
             if work_below:
                 new_target = work_below[0]
 
         if new_target != -1:
             print(f"  强制跳过 F{floor.floor}，立即前往下一个工作楼层 F{new_target}")
-            elevator.go_to_floor(new_target, immediate=True)
+            self._go_to_work(elevator, new_target, immediate=True)
+            self._handoff_call(floor, direction, elevator)
         else:
              # 越过此层后，当前方向已无工作
              print(f"  强制跳过 F{floor.floor}，但前方已无工作，将停靠并转向。")
              # 我们不能在这里转向，因为电梯还在移动中
-             # 允许电梯停在 F{floor.floor} (它不会开门，因为已满)
+             # 允许电梯停在 F{floor.floor} (能上几人上几人)
              # 然后 on_elevator_stopped 会被调用，并触发转向逻辑
              pass
 
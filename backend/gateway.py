@@ -0,0 +1,23 @@
+import argparse
+
+from comm.state_gateway import StateGateway
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Elevator Saga State Gateway (HTTP polling mode)")
+    parser.add_argument(
+        "--server_port", type=int, default=8000, help="Port for Elevator Saga server (default: 8000)"
+    )
+    parser.add_argument(
+        "--port", type=int, default=8002, help="Port for the gateway HTTP server (default: 8002)"
+    )
+    parser.add_argument(
+        "--poll_interval", type=float, default=0.05, help="Seconds between two polls of the simulator (default: 0.05)"
+    )
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    # 所有前端共享一个轮询者, 模拟器只被网关访问
+    gateway = StateGateway(server_port=args.server_port, poll_interval=args.poll_interval)
+    gateway.serve(port=args.port)
@@ -0,0 +1,124 @@
+import argparse
+import json
+import sys
+
+from controller import CONTROLLERS, CostAwareSweepController, CostWeights
+from synthetic.harness import CALLBACKS, run_scenario
+
+COLUMNS = ["mean_us", "p50_us", "p95_us", "max_us", "alloc_kb", "retained_b"]
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Elevator Saga controller callback microbenchmark (synthetic buildings, no simulator)")
+    parser.add_argument(
+        "--controller", choices=sorted(CONTROLLERS), default="scan", help="Controller to benchmark (default: scan)"
+    )
+    parser.add_argument(
+        "--params", type=str, default="{}", help="Controller policy parameters as JSON (default: {})"
+    )
+    parser.add_argument(
+        "--floors", type=str, default="10,50,100,200", help="Comma separated floor counts (default: 10,50,100,200)"
+    )
+    parser.add_argument(
+        "--cars", type=str, default="1,4,16,32", help="Comma separated car counts (default: 1,4,16,32)"
+    )
+    parser.add_argument(
+        "--rounds", type=int, default=200, help="Measured calls per callback and building (default: 200)"
+    )
+    parser.add_argument(
+        "--waiting_per_floor", type=float, default=0.5, help="Expected waiting passengers per floor (default: 0.5)"
+    )
+    parser.add_argument(
+        "--capacity", type=int, default=10, help="Car capacity (default: 10)"
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0, help="Random seed of the synthetic buildings (default: 0)"
+    )
+    parser.add_argument(
+        "--real_proxies", action="store_true",
+        help="Use the library ProxyElevator/ProxyFloor/ProxyPassenger (includes their state lookup cost)"
+    )
+    parser.add_argument(
+        "--no_alloc", action="store_true", help="Skip the tracemalloc allocation pass"
+    )
+    parser.add_argument(
+        "--output", type=str, default="", help="Write the results as JSON to this file"
+    )
+    parser.add_argument(
+        "--baseline", type=str, default="", help="JSON written by a previous --output run to compare against"
+    )
+    parser.add_argument(
+        "--max_regression", type=float, default=None,
+        help="Exit with status 1 if p50_us of any callback is worse than the baseline by more than this many percent"
+    )
+    return parser.parse_args()
+
+def scenario_name(floors, cars):
+    return f"{floors}F x {cars}E"
+
+def print_table(results, baseline):
+    print(f"{'building':<14}{'callback':<26}" + "".join(f"{c:>22}" for c in COLUMNS))
+    for name, callbacks in results.items():
+        for callback in CALLBACKS:
+            stats = callbacks.get(callback)
+            if not stats or not stats["calls"]:
+                continue
+            base = baseline.get(name, {}).get(callback) or {}
+            cells = []
+            for column in COLUMNS:
+                value = stats.get(column)
+                cell = "-" if value is None else f"{value:.2f}"
+                if value is not None and base.get(column):
+                    cell += f" ({(value - base[column]) / base[column] * 100:+.0f}%)"
+                cells.append(f"{cell:>22}")
+            print(f"{name:<14}{callback:<26}" + "".join(cells))
+
+def regressions(results, baseline, max_regression):
+    """p50_us 比基线差超过 max_regression% 的 (场景, 回调)"""
+    worse = []
+    for name, callbacks in results.items():
+        for callback, stats in callbacks.items():
+            base = baseline.get(name, {}).get(callback)
+            if not base or not base.get("p50_us") or stats.get("p50_us") is None:
+                continue
+            if (stats["p50_us"] - base["p50_us"]) / base["p50_us"] * 100 > max_regression:
+                worse.append(f"{name} {callback}")
+    return worse
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    params = json.loads(args.params)
+    if CONTROLLERS[args.controller] is CostAwareSweepController:
+        params.setdefault("cost_weights", CostWeights())
+    floors_list = [int(n) for n in args.floors.split(",") if n.strip()]
+    cars_list = [int(n) for n in args.cars.split(",") if n.strip()]
+
+    results = {}
+    for floors in floors_list:
+        for cars in cars_list:
+            name = scenario_name(floors, cars)
+            print(f"测量 {args.controller} @ {name} ...", flush=True)
+            results[name] = run_scenario(
+                CONTROLLERS[args.controller], params, floors, cars, rounds=args.rounds, seed=args.seed,
+                real_proxies=args.real_proxies, trace_alloc=not args.no_alloc,
+                capacity=args.capacity, waiting_per_floor=args.waiting_per_floor,
+            )
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    print()
+    print_table(results, baseline)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    exit_code = 0
+    if baseline and args.max_regression is not None:
+        worse = regressions(results, baseline, args.max_regression)
+        if worse:
+            print(f"回归: {worse} 的 p50_us 比基线差超过 {args.max_regression}%")
+            exit_code = 1
+    sys.exit(exit_code)
@@ -0,0 +1,43 @@
+import argparse
+import os
+import sys
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Elevator Saga run report (from start.py --export_dir output)")
+    parser.add_argument(
+        "runs", nargs="+", help="Run directories written by start.py --export_dir, or the export directory itself"
+    )
+    parser.add_argument(
+        "--output", type=str, default="report", help="Directory for the plots and CSV files (default: report)"
+    )
+    return parser.parse_args()
+
+def expand_runs(paths):
+    """导出目录本身 (含多个运行目录) 展开为其中的各次运行"""
+    runs = []
+    for path in paths:
+        if os.path.isfile(os.path.join(path, "meta.json")):
+            runs.append(path)
+        elif os.path.isdir(path):
+            runs.extend(sorted(os.path.join(path, d) for d in os.listdir(path)
+                               if os.path.isfile(os.path.join(path, d, "meta.json"))))
+    return runs
+
+if __name__ == "__main__":
+    args = parse_args()
+    runs = expand_runs(args.runs)
+    if not runs:
+        print(f"未找到运行目录: {args.runs}")
+        sys.exit(1)
+
+    # 分析库较重, 解析参数之后才导入
+    from analysis.plots import generate_report
+
+    try:
+        written = generate_report(runs, args.output)
+    except RuntimeError as e:
+        print(e)
+        sys.exit(1)
+    print(f"{len(runs)} 次运行的报告已写入 {args.output}:")
+    for path in written:
+        print(f"  {path}")
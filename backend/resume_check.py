@@ -0,0 +1,210 @@
+"""
+断点恢复回归检查: 在模拟器自带的流量文件上比较 "不中断运行" 与 "在 kill_tick 被 SIGKILL 后从检查点恢复" 的结果
+
+每个流量文件:
+1. 新模拟器上不中断地运行一轮, 得到参考指标
+2. 对每个 kill_tick (默认在整轮中均匀取 --kills 个): 新模拟器上带检查点运行, 处理到 kill_tick 时
+   (该 tick 已推进、事件尚未处理) 进程以 SIGKILL 自杀; 新进程从检查点恢复, 接回同一个模拟器跑完这一轮,
+   与参考指标比较
+决策耗时守护被关闭, 两次运行的决策与计时无关。
+
+kill_tick 当 tick 的事件随进程丢失 (见 checkpoint.py), 恢复后由空闲处理代替。结果分三类:
+- 一致:       模拟器指标与运行代价都与不中断运行相同
+- 丢失 tick:  有差异, 且 kill_tick 当 tick 有需要调度决策的事件 (呼叫/停靠/即将到站/空闲) 随进程丢失,
+              这是已知的限制, 单独计数, 不算失败 (--strict 时算失败)
+- 失败:       没有恢复、运行失败, 或 kill_tick 当 tick 没有丢失决策事件却仍有差异
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import signal
+import sys
+import tempfile
+
+from elevator_saga.core.models import EventType
+
+from controller import CONTROLLERS, CostAwareSweepController, CostWeights
+from controller.checkpoint import CheckpointWriter, load_checkpoint
+from synthetic.building import NullBroadcastor
+from tuning.runner import SimulatorProcess, list_traffic_files
+
+SIMULATOR_METRICS = ["completed_passengers", "total_passengers", "average_floor_wait_time", "average_arrival_wait_time",
+                     "p95_floor_wait_time", "p95_arrival_wait_time"]
+COST_METRICS = ["cost_wait_ticks", "cost_ride_ticks", "cost_stops", "cost_starts", "cost_distance", "cost_energy"]
+# 控制器据此做调度决策的事件; 上/下车与经过楼层只更新记账状态, 恢复时按模拟器的乘客表补记
+DECISION_EVENTS = {EventType.UP_BUTTON_PRESSED.value, EventType.DOWN_BUTTON_PRESSED.value,
+                   EventType.STOPPED_AT_FLOOR.value, EventType.ELEVATOR_APPROACHING.value, EventType.IDLE.value}
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Elevator Saga kill/resume regression check")
+    parser.add_argument(
+        "--controller", choices=sorted(CONTROLLERS), default="scan", help="Controller to check (default: scan)"
+    )
+    parser.add_argument(
+        "--params", type=str, default="{}", help="Controller policy parameters as JSON (default: {})"
+    )
+    parser.add_argument(
+        "--traffic", type=str, default="", help="Comma separated traffic file names (default: all)"
+    )
+    parser.add_argument(
+        "--kills", type=int, default=4, help="Number of kill ticks spread evenly across each run (default: 4)"
+    )
+    parser.add_argument(
+        "--kill_ticks", type=str, default="", help="Comma separated kill ticks, overrides --kills"
+    )
+    parser.add_argument(
+        "--checkpoint_every", type=int, default=20, help="Ticks between checkpoints (default: 20)"
+    )
+    parser.add_argument(
+        "--strict", action="store_true", help="Also fail when the difference is explained by events lost in the kill tick"
+    )
+    parser.add_argument(
+        "--server_port", type=int, default=9400, help="Port for the simulators started by the check (default: 9400)"
+    )
+    parser.add_argument(
+        "--output", type=str, default="", help="Write the per-traffic results as JSON to this file"
+    )
+    return parser.parse_args()
+
+def make_controller(name, params, port):
+    params = dict(params)
+    if CONTROLLERS[name] is CostAwareSweepController:
+        params.setdefault("cost_weights", CostWeights())
+    controller = CONTROLLERS[name](NullBroadcastor(), server_port=port, **params)
+    controller.decision_guard.budget_ms = None
+    return controller
+
+def _quiet():
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    os.dup2(devnull, 2)
+
+def _run(queue, name, params, port, checkpoint_dir, every, kill_tick):
+    """
+    子进程: 运行一轮并把 (指标, 恢复时检查点的 tick) 放入 queue;
+    kill_tick 不为 None 时在该 tick 先放入该 tick 的事件类型, 再自杀
+    """
+    _quiet()
+    controller = make_controller(name, params, port)
+    if checkpoint_dir:
+        controller.checkpointer = CheckpointWriter(checkpoint_dir, every_ticks=every)
+        if kill_tick is None:
+            controller.resume_checkpoint = load_checkpoint(checkpoint_dir)
+    if kill_tick is not None:
+        on_event_execute_start = controller.on_event_execute_start
+
+        def crash_at_kill_tick(tick, events, *args):
+            if tick >= kill_tick:
+                queue.put(sorted({event.type.value for event in events}))
+                queue.close()
+                queue.join_thread()  # SIGKILL 前确保已写出
+                os.kill(os.getpid(), signal.SIGKILL)
+            on_event_execute_start(tick, events, *args)
+        controller.on_event_execute_start = crash_at_kill_tick
+    controller.start()
+    queue.put((dict(controller.last_run_metrics), controller.resumed_tick))
+
+def run_child(*args):
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_run, args=(queue,) + args)
+    process.start()
+    process.join()
+    return queue.get() if not queue.empty() else None
+
+def reference_run(name, params, index, args):
+    with SimulatorProcess(args.server_port) as simulator:
+        simulator.select_traffic(index)
+        result = run_child(name, params, args.server_port, "", 0, None)
+    return result[0] if result else None
+
+def kill_and_resume(name, params, index, kill_tick, args):
+    """返回 (kill_tick 当 tick 丢失的事件类型, 恢复后的指标, 恢复时检查点的 tick)"""
+    checkpoint_dir = tempfile.mkdtemp(prefix="resume_check_")
+    try:
+        with SimulatorProcess(args.server_port) as simulator:
+            simulator.select_traffic(index)
+            lost_events = run_child(name, params, args.server_port, checkpoint_dir, args.checkpoint_every, kill_tick)
+            result = run_child(name, params, args.server_port, checkpoint_dir, args.checkpoint_every, None)
+    finally:
+        shutil.rmtree(checkpoint_dir, ignore_errors=True)
+    resumed, resumed_tick = result if result else (None, None)
+    if not isinstance(lost_events, list):
+        lost_events = None  # kill_tick 超出了这一轮, 没有被杀死
+    return lost_events, resumed, resumed_tick
+
+def kill_ticks_for(path, args):
+    """显式给出的 kill_tick, 或在第一个检查点之后到整轮结束之间均匀取 args.kills 个"""
+    if args.kill_ticks:
+        return [int(n) for n in args.kill_ticks.split(",") if n.strip()]
+    with open(path, "r", encoding="utf-8") as f:
+        duration = json.load(f)["building"]["duration"]
+    first = args.checkpoint_every + 1
+    span = duration - 1 - first
+    return sorted({first + span * (i + 1) // (args.kills + 1) for i in range(args.kills)})
+
+def differences(reference, resumed):
+    """{指标: (参考值, 恢复后的值)}, 只含不同的指标"""
+    return {key: (reference.get(key), resumed.get(key)) for key in SIMULATOR_METRICS + COST_METRICS
+            if reference.get(key) != resumed.get(key)}
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    params = json.loads(args.params)
+    traffic_files = list_traffic_files()
+    names = [n.strip() for n in args.traffic.split(",") if n.strip()] or [p.stem for p in traffic_files]
+    known = [p.stem for p in traffic_files]
+    unknown = [n for n in names if n not in known]
+    if unknown:
+        sys.exit(f"Unknown traffic files: {unknown}, available: {known}")
+
+    results = {}
+    counts = {"identical": 0, "lost_tick": 0, "failed": 0}
+    failed = []
+    for traffic in names:
+        index = known.index(traffic)
+        kill_ticks = kill_ticks_for(traffic_files[index], args)
+        print(f"检查 {args.controller} @ {traffic}: 在 tick {kill_ticks} 杀死后恢复 ...", flush=True)
+        reference = reference_run(args.controller, params, index, args)
+        results[traffic] = {"reference": reference, "kills": {}}
+        for kill_tick in kill_ticks:
+            lost_events, resumed, resumed_tick = kill_and_resume(args.controller, params, index, kill_tick, args)
+            row = {"lost_events": lost_events, "resumed_tick": resumed_tick, "resumed": resumed}
+            results[traffic]["kills"][kill_tick] = row
+            if reference is None or resumed is None:
+                outcome, note = "failed", "运行失败"
+            elif resumed_tick is None:
+                outcome, note = "failed", "没有从检查点恢复 (重新开始了模拟)"
+            else:
+                diff = differences(reference, resumed)
+                row["diff"] = diff
+                lost = sorted(set(lost_events or []) & DECISION_EVENTS)
+                note = f"检查点 tick {resumed_tick}"
+                if resumed.get("cost_unsampled_ticks"):
+                    note += f", 漏采 {resumed['cost_unsampled_ticks']} tick"
+                if not diff:
+                    outcome = "identical"
+                elif lost and not args.strict:
+                    outcome = "lost_tick"
+                    note += f", 丢失事件 {lost}"
+                else:
+                    outcome = "failed"
+                    note += f", 丢失事件 {lost}" if lost else ", 没有丢失决策事件"
+            row["outcome"] = outcome
+            counts[outcome] += 1
+            mark = {"identical": "✓ 一致", "lost_tick": "≈ 丢失 tick", "failed": "✗ 失败"}[outcome]
+            print(f"  tick {kill_tick:>4}: {mark} ({note})")
+            for key, (before, after) in row.get("diff", {}).items():
+                print(f"      {key:<28}{before!s:>12} -> {after!s:<12}")
+            if outcome == "failed":
+                failed.append(f"{traffic}@{kill_tick}")
+
+    print(f"一致 {counts['identical']}, 丢失 tick 导致的差异 {counts['lost_tick']}, 失败 {counts['failed']}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if failed:
+        print(f"失败: {failed}")
+    sys.exit(1 if failed else 0)
@@ -1,7 +1,25 @@
 import json
-from elevator_saga.core.models import PassengerStatus, Direction, ElevatorStatus
+from typing import AbstractSet, Dict, List, Optional, Set
+
+from elevator_saga.core.models import PassengerStatus
+
+from scene.scene_records import ElevatorRecord, FloorRecord, PassengerRecord
+from scene.wait_histogram import WaitTimeHistogram
+
+# 乘客状态 -> 直方图中的状态名
+PASSENGER_STATUS_NAME = {
+    PassengerStatus.WAITING: "waiting",
+    PassengerStatus.IN_ELEVATOR: "in_elevator",
+    PassengerStatus.COMPLETED: "arrived",
+}
 
 class SceneManager(object):
+    """
+    场景管理器: 电梯/楼层/乘客以 __slots__ 记录保存并原地更新,
+    乘客由事件驱动更新, 电梯和楼层在构建帧时从模拟器状态刷新,
+    scene_json 直接拼接 JSON 文本, 不再每帧构建嵌套字典。
+    """
+
     def __init__(self):
         self.building = {
             "floors": None,
@@ -11,60 +29,133 @@ class SceneManager(object):
         self.current = {
             "tick": None,
         }
-        self.passengers = []
-        self.elevators = []
-        self.floors = []
-    
+        self.elevators: List[ElevatorRecord] = []
+        self.floors: List[FloorRecord] = []
+        self.passengers: Dict[int, PassengerRecord] = {}
+        # 统计卡片的直方图, 由控制器在呼叫/上车/下车时增量更新
+        self.wait_histogram = WaitTimeHistogram()
+        # 上次检查点之后有变化的乘客, 为 None 时不记录 (未启用检查点)
+        self._changed: Optional[Set[int]] = None
+
+    def reset(self):
+        self.current["tick"] = None
+        self.passengers.clear()
+        self.wait_histogram.reset()
+        if self._changed is not None:
+            self._changed = set()
+
     def set_building_info(self, floors, elevators, elevator_capacity):
         self.building["floors"] = floors
         self.building["elevators"] = elevators
         self.building["elevator_capacity"] = elevator_capacity
-    
-    def set_elevator_floor_passenger_container(self, elevators, floors, passengers):
-        self.elevators = elevators
-        self.passengers = passengers
-        self.floors = floors
-    
+        # 楼宇规模不变时复用已有记录
+        if len(self.elevators) != elevators:
+            self.elevators = [ElevatorRecord(i) for i in range(elevators)]
+        if len(self.floors) != floors:
+            self.floors = [FloorRecord(i) for i in range(floors)]
+
     def update_current_tick(self, tick):
         self.current["tick"] = tick
 
-    @property
-    def scene_dict(self) -> dict:
-        scene_data = {
-            "building": self.building,
-            "current": self.current,
-            "elevators": {
-                e.id: {
-                    "id": e.id,
-                    "current_pos": e.current_floor_float,
-                    "target_floor": e.target_floor,
-                    "is_idle": e.is_idle,
-                    "run_status": "stopped" if e.run_status == ElevatorStatus.STOPPED else ("start_up" if e.run_status == ElevatorStatus.START_UP else ("start_down" if e.run_status == ElevatorStatus.START_DOWN else "constant_speed")),
-                    "target_floor_direction": "up" if e.target_floor_direction == Direction.UP else ("down" if e.target_floor_direction == Direction.DOWN else "stopped"),
-                    "passengers": e.passengers,
-                } for e in self.elevators
-            } if len(self.elevators) > 0 else dict(),
-            "floors": {
-                f.floor: {
-                    "id": f.floor,
-                    "up_queue": f.up_queue,
-                    "down_queue": f.down_queue,
-                } for f in self.floors
-            } if len(self.floors) > 0 else dict(),
-            "passengers": {
-                p.id: {
-                    "id": p.id,
-                    "origin": p.origin,
-                    "destination": p.destination,
-                    "arrive_tick": p.arrive_tick,
-                    "pickup_tick": p.pickup_tick,
-                    "dropoff_tick": p.dropoff_tick,
-                    "elevator_id": p.elevator_id,
-                    "status": "waiting" if p.status == PassengerStatus.WAITING else ("in_elevator" if p.status == PassengerStatus.IN_ELEVATOR else "arrived"),
-                    "wait_time": p.floor_wait_time,
-                    "system_time": p.arrival_wait_time,
-                    "travel_direction": "up" if p.travel_direction == Direction.UP else ("down" if p.travel_direction == Direction.DOWN else "stopped"),
-                } for p in self.passengers
-            } if len(self.passengers) > 0 else dict()
-        }
-        return scene_data
\ No newline at end of file
+    def on_passenger_call(self, tick: int, passenger):
+        self.passengers[passenger.id] = PassengerRecord(passenger.id, passenger.origin, passenger.destination, passenger.arrive_tick)
+        if self._changed is not None:
+            self._changed.add(passenger.id)
+        self.wait_histogram.on_call(tick, passenger.arrive_tick)
+
+    def on_passenger_board(self, tick: int, elevator_id: int, passenger):
+        record = self.passengers.get(passenger.id)
+        if record is not None:
+            record.status = PassengerStatus.IN_ELEVATOR
+            record.elevator_id = elevator_id
+            record.pickup_tick = tick
+            if self._changed is not None:
+                self._changed.add(passenger.id)
+        self.wait_histogram.on_board(tick, passenger.arrive_tick)
+
+    def on_passenger_alight(self, tick: int, passenger):
+        record = self.passengers.get(passenger.id)
+        if record is not None:
+            record.status = PassengerStatus.COMPLETED
+            record.dropoff_tick = tick
+            if self._changed is not None:
+                self._changed.add(passenger.id)
+        self.wait_histogram.on_alight(tick, passenger.arrive_tick)
+
+    # -------------------
+    # 检查点
+    # -------------------
+    def track_changes(self):
+        """开始记录有变化的乘客, 供增量检查点使用"""
+        if self._changed is None:
+            self._changed = set(self.passengers)
+
+    def take_changed_rows(self) -> List[list]:
+        """上次调用之后有变化的乘客记录 (检查点日志行)"""
+        if not self._changed:
+            return []
+        rows = [self.passengers[pid].to_row() for pid in self._changed if pid in self.passengers]
+        self._changed = set()
+        return rows
+
+    def load_passenger_rows(self, rows: List[list]):
+        """从检查点日志恢复乘客记录 (同一乘客以最后一行为准), 直方图随后由 rebuild_histogram 重建"""
+        self.passengers.clear()
+        for row in rows:
+            record = PassengerRecord.from_row(row)
+            self.passengers[record.id] = record
+
+    def rebuild_histogram(self, tick: int):
+        self.wait_histogram.load_snapshot(
+            tick, ((p.arrive_tick, PASSENGER_STATUS_NAME.get(p.status, "arrived"), p.dropoff_tick) for p in self.passengers.values())
+        )
+
+    def refresh(self, state):
+        """从模拟器状态 (SimulationState) 原地刷新电梯和楼层"""
+        for record, e in zip(self.elevators, state.elevators):
+            record.update(e)
+        for record, f in zip(self.floors, state.floors):
+            record.update(f)
+
+    def scene_json(self, state, elevators: Optional[AbstractSet[int]] = None,
+                   floors: Optional[AbstractSet[int]] = None) -> str:
+        """
+        刷新电梯/楼层后直接序列化为 JSON 文本, 与前端 SceneDict 格式一致。
+        elevators / floors 为客户端关注的电梯/楼层 (None 表示全部), 未关注的记录在序列化前即被跳过:
+        乘过梯的乘客随其电梯保留, 仍在候梯的乘客随其出发楼层保留。
+        """
+        self.refresh(state)
+        out = ['{"building":', json.dumps(self.building), ',"current":', json.dumps(self.current), ',"elevators":{']
+        first = True
+        for record in self.elevators:
+            if elevators is not None and record.id not in elevators:
+                continue
+            if not first:
+                out.append(",")
+            first = False
+            record.write_json(out)
+        out.append('},"floors":{')
+        first = True
+        for record in self.floors:
+            if floors is not None and record.id not in floors:
+                continue
+            if not first:
+                out.append(",")
+            first = False
+            record.write_json(out)
+        out.append('},"passengers":{')
+        first = True
+        for record in self.passengers.values():
+            if record.elevator_id is None:
+                if floors is not None and record.origin not in floors:
+                    continue
+            elif elevators is not None and record.elevator_id not in elevators:
+                continue
+            if not first:
+                out.append(",")
+            first = False
+            record.write_json(out)
+        out.append('},"statistics":')
+        out.append(json.dumps(self.wait_histogram.to_dict()))
+        out.append("}")
+        return "".join(out)
@@ -0,0 +1,127 @@
+from typing import List, Optional
+
+from elevator_saga.core.models import PassengerStatus, Direction, ElevatorStatus
+
+# 枚举 -> 前端字符串 的查表 (值已带引号, 序列化时直接拼接)
+RUN_STATUS_JSON = {
+    ElevatorStatus.STOPPED: '"stopped"',
+    ElevatorStatus.START_UP: '"start_up"',
+    ElevatorStatus.START_DOWN: '"start_down"',
+    ElevatorStatus.CONSTANT_SPEED: '"constant_speed"',
+}
+DIRECTION_JSON = {
+    Direction.UP: '"up"',
+    Direction.DOWN: '"down"',
+    Direction.STOPPED: '"stopped"',
+}
+PASSENGER_STATUS_JSON = {
+    PassengerStatus.WAITING: '"waiting"',
+    PassengerStatus.IN_ELEVATOR: '"in_elevator"',
+    PassengerStatus.COMPLETED: '"arrived"',
+    PassengerStatus.CANCELLED: '"arrived"',
+}
+
+
+def json_int_list(values: List[int]) -> str:
+    return "[" + ",".join(map(str, values)) + "]"
+
+
+def json_optional_int(value: Optional[int]) -> str:
+    return "null" if value is None else str(value)
+
+
+class ElevatorRecord(object):
+    """电梯场景记录, 每帧从模拟器状态原地刷新"""
+
+    __slots__ = ("id", "current_pos", "target_floor", "is_idle", "run_status", "target_floor_direction", "passengers")
+
+    def __init__(self, elevator_id: int):
+        self.id = elevator_id
+        self.current_pos = 0.0
+        self.target_floor = 0
+        self.is_idle = True
+        self.run_status = ElevatorStatus.STOPPED
+        self.target_floor_direction = Direction.STOPPED
+        self.passengers: List[int] = []
+
+    def update(self, e):
+        """e: ElevatorState"""
+        self.current_pos = e.current_floor_float
+        self.target_floor = e.target_floor
+        self.run_status = e.run_status
+        self.is_idle = e.run_status == ElevatorStatus.STOPPED
+        self.target_floor_direction = e.target_floor_direction
+        self.passengers = e.passengers  # 只保存引用, 不复制
+
+    def write_json(self, out: List[str]):
+        out.append(
+            f'"{self.id}":{{"id":{self.id},"current_pos":{self.current_pos},"target_floor":{self.target_floor},'
+            f'"is_idle":{"true" if self.is_idle else "false"},"run_status":{RUN_STATUS_JSON[self.run_status]},'
+            f'"target_floor_direction":{DIRECTION_JSON[self.target_floor_direction]},'
+            f'"passengers":{json_int_list(self.passengers)}}}'
+        )
+
+
+class FloorRecord(object):
+    """楼层场景记录, 每帧从模拟器状态原地刷新"""
+
+    __slots__ = ("id", "up_queue", "down_queue")
+
+    def __init__(self, floor: int):
+        self.id = floor
+        self.up_queue: List[int] = []
+        self.down_queue: List[int] = []
+
+    def update(self, f):
+        """f: FloorState"""
+        self.up_queue = f.up_queue
+        self.down_queue = f.down_queue
+
+    def write_json(self, out: List[str]):
+        out.append(
+            f'"{self.id}":{{"id":{self.id},"up_queue":{json_int_list(self.up_queue)},'
+            f'"down_queue":{json_int_list(self.down_queue)}}}'
+        )
+
+
+class PassengerRecord(object):
+    """乘客场景记录, 由呼叫/上车/下车事件原地更新"""
+
+    __slots__ = ("id", "origin", "destination", "arrive_tick", "pickup_tick", "dropoff_tick",
+                 "elevator_id", "status", "travel_direction")
+
+    def __init__(self, passenger_id: int, origin: int, destination: int, arrive_tick: int):
+        self.id = passenger_id
+        self.origin = origin
+        self.destination = destination
+        self.arrive_tick = arrive_tick
+        self.pickup_tick = 0
+        self.dropoff_tick = 0
+        self.elevator_id: Optional[int] = None
+        self.status = PassengerStatus.WAITING
+        self.travel_direction = Direction.UP if destination > origin else (Direction.DOWN if destination < origin else Direction.STOPPED)
+
+    def to_row(self) -> list:
+        """检查点日志中的一行"""
+        return [self.id, self.origin, self.destination, self.arrive_tick, self.pickup_tick, self.dropoff_tick,
+                self.elevator_id, self.status.value]
+
+    @classmethod
+    def from_row(cls, row: list) -> "PassengerRecord":
+        passenger_id, origin, destination, arrive_tick, pickup_tick, dropoff_tick, elevator_id, status = row
+        record = cls(passenger_id, origin, destination, arrive_tick)
+        record.pickup_tick = pickup_tick
+        record.dropoff_tick = dropoff_tick
+        record.elevator_id = elevator_id
+        record.status = PassengerStatus(status)
+        return record
+
+    def write_json(self, out: List[str]):
+        # wait_time / system_time 与 PassengerInfo.floor_wait_time / arrival_wait_time 定义一致
+        out.append(
+            f'"{self.id}":{{"id":{self.id},"origin":{self.origin},"destination":{self.destination},'
+            f'"arrive_tick":{self.arrive_tick},"pickup_tick":{self.pickup_tick},"dropoff_tick":{self.dropoff_tick},'
+            f'"elevator_id":{json_optional_int(self.elevator_id)},"status":{PASSENGER_STATUS_JSON[self.status]},'
+            f'"wait_time":{self.pickup_tick - self.arrive_tick},"system_time":{self.dropoff_tick - self.arrive_tick},'
+            f'"travel_direction":{DIRECTION_JSON[self.travel_direction]}}}'
+        )
@@ -0,0 +1,73 @@
+from scene.wait_histogram import WaitTimeHistogram
+
+
+def _passenger_status(p: dict) -> str:
+    if p.get("arrived"):
+        return "arrived"
+    return "in_elevator" if (p.get("pickup_tick") or 0) > 0 else "waiting"
+
+
+def convert_simulator_state(state: dict, traffic_info: dict, histogram: WaitTimeHistogram) -> dict:
+    """
+    把模拟器 /api/state (+ /api/traffic/info) 的响应转换为与 SceneManager.scene_dict 相同格式的场景
+    histogram 会按快照重建, 其桶计数放在 "statistics" 中
+    """
+    tick = state["tick"]
+    elevators = state["elevators"]
+
+    scene_elevators = {}
+    for e in elevators:
+        position = e["position"]
+        current_pos = round(position["current_floor"] + position["floor_up_position"] / 10, 1)  # 保留一位小数
+        target_floor = position["target_floor"]
+        scene_elevators[e["id"]] = {
+            "id": e["id"],
+            "current_pos": current_pos,
+            "target_floor": target_floor,
+            "is_idle": e["run_status"] == "stopped",
+            "run_status": e["run_status"],
+            "target_floor_direction": "up" if current_pos < target_floor else ("down" if current_pos > target_floor else "stopped"),
+            "passengers": e["passengers"],
+        }
+
+    scene_passengers = {}
+    for p in state["passengers"].values():
+        scene_passengers[p["id"]] = {
+            "id": p["id"],
+            "origin": p["origin"],
+            "destination": p["destination"],
+            "arrive_tick": p["arrive_tick"],
+            "pickup_tick": p["pickup_tick"],
+            "dropoff_tick": p["dropoff_tick"],
+            "elevator_id": p["elevator_id"],
+            "status": _passenger_status(p),
+            "wait_time": p["pickup_tick"] - p["arrive_tick"],
+            "system_time": p["dropoff_tick"] - p["arrive_tick"],
+            "travel_direction": "up" if p["destination"] > p["origin"] else ("down" if p["destination"] < p["origin"] else "stopped"),
+        }
+
+    histogram.load_snapshot(
+        tick, ((p["arrive_tick"], p["status"], p["dropoff_tick"]) for p in scene_passengers.values())
+    )
+
+    return {
+        "building": {
+            "floors": len(state["floors"]),
+            "elevators": len(elevators),
+            "elevator_capacity": elevators[0]["max_capacity"] if elevators else 8,
+        },
+        "current": {
+            "tick": tick,
+            "max_tick": (traffic_info.get("max_tick") or None) if traffic_info else None,
+        },
+        "elevators": scene_elevators,
+        "floors": {
+            f["floor"]: {
+                "id": f["floor"],
+                "up_queue": f["up_queue"],
+                "down_queue": f["down_queue"],
+            } for f in state["floors"]
+        },
+        "passengers": scene_passengers,
+        "statistics": histogram.to_dict(),
+    }
@@ -0,0 +1,94 @@
+from bisect import bisect_right
+from typing import Dict, List
+
+
+class WaitTimeHistogram(object):
+    """
+    乘客耗时直方图, 由呼叫/上车/下车事件增量维护。
+
+    耗时 = (下车 tick 或当前 tick) - 到达 tick, 与前端统计卡片的分桶规则一致:
+    edges = [10, 20, ..., 90] 对应 <10, <20, ..., <90, >90 共 len(edges)+1 个桶。
+    等待中和电梯内的乘客耗时随 tick 增长, 按到达 tick 记数,
+    tick 前进时只把恰好跨过某个边界的那一批乘客移到下一个桶,
+    因此每帧的开销只与桶数有关, 与乘客总数无关。
+    """
+
+    LIVE_STATUS = ("waiting", "in_elevator")
+
+    def __init__(self, edges: List[int] = None):
+        self.edges = list(edges) if edges is not None else list(range(10, 91, 10))
+        self.reset()
+
+    def reset(self):
+        self.tick = 0
+        bucket_num = len(self.edges) + 1
+        self.counts: Dict[str, List[int]] = {
+            "waiting": [0] * bucket_num,
+            "in_elevator": [0] * bucket_num,
+            "arrived": [0] * bucket_num,
+        }
+        # 未送达乘客 {status: {arrive_tick: 人数}}
+        self._arrive_counts: Dict[str, Dict[int, int]] = {status: {} for status in self.LIVE_STATUS}
+
+    def bucket_of(self, cost: int) -> int:
+        return bisect_right(self.edges, cost)
+
+    def advance(self, tick: int):
+        """前进到 tick, 把跨过边界的乘客移到下一个桶"""
+        if tick < self.tick:
+            self.reset()
+        for t in range(self.tick + 1, tick + 1):
+            for i, edge in enumerate(self.edges):
+                # 在 t 时刻耗时刚好等于 edge 的乘客
+                arrive_tick = t - edge
+                for status in self.LIVE_STATUS:
+                    n = self._arrive_counts[status].get(arrive_tick)
+                    if n:
+                        self.counts[status][i] -= n
+                        self.counts[status][i + 1] += n
+        self.tick = max(self.tick, tick)
+
+    def _add(self, status: str, arrive_tick: int, n: int):
+        # 未登记过的乘客 (如中途接入的控制器) 不做扣减
+        if n < 0 and not self._arrive_counts[status].get(arrive_tick):
+            return
+        arrive_counts = self._arrive_counts[status]
+        arrive_counts[arrive_tick] = arrive_counts.get(arrive_tick, 0) + n
+        if arrive_counts[arrive_tick] == 0:
+            del arrive_counts[arrive_tick]
+        self.counts[status][self.bucket_of(self.tick - arrive_tick)] += n
+
+    def on_call(self, tick: int, arrive_tick: int):
+        self.advance(tick)
+        self._add("waiting", arrive_tick, 1)
+
+    def on_board(self, tick: int, arrive_tick: int):
+        self.advance(tick)
+        self._add("waiting", arrive_tick, -1)
+        self._add("in_elevator", arrive_tick, 1)
+
+    def on_alight(self, tick: int, arrive_tick: int):
+        self.advance(tick)
+        self._add("in_elevator", arrive_tick, -1)
+        self.counts["arrived"][self.bucket_of(tick - arrive_tick)] += 1
+
+    def load_snapshot(self, tick: int, passengers):
+        """
+        从完整状态快照重建 (用于只能轮询状态、拿不到事件的场景, 如 HTTP 网关)
+        passengers: 可迭代的 (arrive_tick, status, dropoff_tick)
+        """
+        self.reset()
+        self.tick = tick
+        for arrive_tick, status, dropoff_tick in passengers:
+            if status == "arrived":
+                self.counts["arrived"][self.bucket_of(dropoff_tick - arrive_tick)] += 1
+            else:
+                self._add(status, arrive_tick, 1)
+
+    def to_dict(self) -> dict:
+        return {
+            "edges": self.edges,
+            "waiting": self.counts["waiting"],
+            "in_elevator": self.counts["in_elevator"],
+            "arrived": self.counts["arrived"],
+        }
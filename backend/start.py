@@ -1,7 +1,10 @@
 import argparse
+import json
 
-from controller import ImprovedElevatorBusController, ScanningSweepController
+from controller import CONTROLLERS, CostAwareSweepController, CostWeights
+from controller.checkpoint import CheckpointWriter, load_checkpoint
 from comm.websocket_broadcastor import SceneBroadcastor
+from analysis.export import RunExporter
 
 def parse_args():
     parser = argparse.ArgumentParser(description="Elevator Saga Backend Server")
@@ -11,6 +14,9 @@ def parse_args():
     parser.add_argument(
         "--ws_port", type=int, default=8001, help="Port for WebSocket server (default: 8001)"
     )
+    parser.add_argument(
+        "--ws_max_fps", type=int, default=20, help="Max scene frames per second sent to each WebSocket client (default: 20)"
+    )
     parser.add_argument(
         "--ws_wait_for_client", action="store_true", help="Wait for WebSocket client connection before starting the algorithm"
     )
@@ -20,20 +26,66 @@ def parse_args():
     parser.add_argument(
         "--with_delay", action="store_true", help="Run the simulation with GUI"
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--controller", choices=sorted(CONTROLLERS), default="scan", help="Scheduling controller (default: scan)"
+    )
+    parser.add_argument(
+        "--params", type=str, default="{}",
+        help="Controller policy parameters as JSON, e.g. '{\"parking_floor_ratio\": 0.25, \"bypass_min_boarding\": 3}' (see tune.py)"
+    )
+    parser.add_argument(
+        "--cost_weights", type=str, default="",
+        help="Cost weights for the cost_aware controller, e.g. 'wait=1,ride=1,stop=5,start=10,distance=0.5,energy=0'"
+    )
+    parser.add_argument(
+        "--decision_budget_ms", type=float, default=100.0,
+        help="Time budget per stop/approach decision, slower decisions fall back to a plain sweep; <= 0 disables the guard (default: 100)"
+    )
+    parser.add_argument(
+        "--export_dir", type=str, default="",
+        help="Export each run as chunked columnar NumPy files into this directory for report.py (default: disabled)"
+    )
+    parser.add_argument(
+        "--checkpoint_dir", type=str, default="",
+        help="Write controller checkpoints into this directory in the background (default: disabled)"
+    )
+    parser.add_argument(
+        "--checkpoint_every", type=int, default=50, help="Ticks between checkpoints (default: 50)"
+    )
+    parser.add_argument(
+        "--resume", action="store_true",
+        help="Resume from the checkpoint in --checkpoint_dir and reattach to the running simulator instead of resetting it"
+    )
+    args = parser.parse_args()
+    if args.resume and not args.checkpoint_dir:
+        parser.error("--resume requires --checkpoint_dir")
+    return args
 
 if __name__ == "__main__":
     args = parse_args()
     
-    ws_broadcastor = SceneBroadcastor(port=args.ws_port)
+    ws_broadcastor = SceneBroadcastor(port=args.ws_port, max_fps=args.ws_max_fps)
+    
+    # 控制器只创建一次，轮次之间通过 reset() 热重启，保留连接与已学习的统计
+    params = json.loads(args.params)
+    if CONTROLLERS[args.controller] is CostAwareSweepController:
+        params["cost_weights"] = CostWeights.parse(args.cost_weights)
+    algorithm = CONTROLLERS[args.controller](ws_broadcastor, server_port=args.server_port, with_delay=args.with_delay, **params)
+    algorithm.decision_guard.budget_ms = args.decision_budget_ms if args.decision_budget_ms > 0 else None
+    if args.export_dir:
+        algorithm.run_exporter = RunExporter(args.export_dir)
+    if args.checkpoint_dir:
+        if args.resume:
+            algorithm.resume_checkpoint = load_checkpoint(args.checkpoint_dir)
+            if algorithm.resume_checkpoint is None:
+                print(f"{args.checkpoint_dir} 中没有可用的检查点, 重新开始模拟")
+        algorithm.checkpointer = CheckpointWriter(args.checkpoint_dir, every_ticks=args.checkpoint_every)
     
     while True:
         
         if args.ws_wait_for_client:
             ws_broadcastor.wait_for_client_confirmation()
         
-        algorithm = ScanningSweepController(ws_broadcastor, server_port=args.server_port, with_delay=args.with_delay)
-        
         try:
             algorithm.start()
         except KeyboardInterrupt:
@@ -46,4 +98,6 @@ if __name__ == "__main__":
             raise e
 
         if args.once:
-            break
\ No newline at end of file
+            break
+        
+        algorithm.reset()
\ No newline at end of file
@@ -0,0 +1,208 @@
+"""
+合成楼宇 (Synthetic Building): 不依赖模拟器, 在内存中构造 SimulationState 驱动控制器回调
+
+- FakeAPIClient      代替 ElevatorAPIClient: get_state 返回内存中的状态, 命令只计数
+- FakeElevator / FakeFloor / FakePassenger
+                     ProxyElevator / ProxyFloor / ProxyPassenger 的轻量替身, 直接持有状态对象,
+                     属性访问不经过 "在整个状态中查找自己", 测得的是控制器自身的决策耗时
+- NullBroadcastor    代替 SceneBroadcastor, 不启动 WebSocket 服务
+- SyntheticBuilding  按随机种子生成楼宇: 电梯位置/运行状态/车内乘客、各层候梯乘客
+"""
+import contextlib
+import random
+from typing import Dict, List, Optional
+
+from elevator_saga.core.models import (
+    Direction, ElevatorState, ElevatorStatus, FloorState, PassengerInfo, Position, SimulationState,
+)
+
+
+class FakeAPIClient(object):
+    """控制器使用的 ElevatorAPIClient 接口子集"""
+
+    def __init__(self, state: SimulationState, max_tick: int = 100000):
+        self.state = state
+        self.max_tick = max_tick
+        self.client_id: Optional[str] = None
+        self.commands = 0
+
+    def get_state(self, force_reload: bool = False) -> SimulationState:
+        return self.state
+
+    def go_to_floor(self, elevator_id: int, floor: int, immediate: bool = False) -> bool:
+        self.commands += 1
+        return True
+
+    def get_traffic_info(self) -> Dict[str, int]:
+        return {"current_index": 0, "total_files": 1, "max_tick": self.max_tick}
+
+    def mark_tick_processed(self) -> None:
+        pass
+
+
+class FakeElevator(object):
+    __slots__ = ("_state", "_client")
+
+    def __init__(self, state: ElevatorState, client: FakeAPIClient):
+        self._state = state
+        self._client = client
+
+    def __getattr__(self, name):
+        return getattr(self._state, name)
+
+    def go_to_floor(self, floor: int, immediate: bool = False) -> bool:
+        # 经过 api_client.go_to_floor (控制器基类已替换为命令缓冲), 与 ProxyElevator 一致
+        return self._client.go_to_floor(self._state.id, floor, immediate)
+
+    def __repr__(self) -> str:
+        return f"FakeElevator(id={self._state.id})"
+
+
+class FakeFloor(object):
+    __slots__ = ("_state",)
+
+    def __init__(self, state: FloorState):
+        self._state = state
+
+    def __getattr__(self, name):
+        return getattr(self._state, name)
+
+    def __repr__(self) -> str:
+        return f"FakeFloor(floor={self._state.floor})"
+
+
+class FakePassenger(object):
+    __slots__ = ("_info",)
+
+    def __init__(self, info: PassengerInfo):
+        self._info = info
+
+    def __getattr__(self, name):
+        return getattr(self._info, name)
+
+    def __repr__(self) -> str:
+        return f"FakePassenger(id={self._info.id})"
+
+
+class NullBroadcastor(object):
+    """SceneBroadcastor 的空实现, 没有客户端, 场景帧不会被构建"""
+
+    def server_log(self, log_message: str):
+        pass
+
+    def server_error(self, error_message: str):
+        pass
+
+    def server_scene_update(self, scene, force=False):
+        pass
+
+    def server_metrics_update(self, metrics_json):
+        pass
+
+    def server_perf_update(self, perf_json):
+        pass
+
+    def server_run_finished(self, tick: int):
+        pass
+
+    def exists_client(self):
+        return False
+
+    def wait_for_client_confirmation(self):
+        pass
+
+
+class SyntheticBuilding(object):
+    """
+    floors 层、cars 部电梯的随机楼宇快照 (tick 固定为 tick):
+    - 约 moving_ratio 的电梯在运行 (至少一部), 其余停靠; 每部电梯载客 0 ~ capacity 人
+    - 每层以 waiting_per_floor 为期望生成候梯乘客, 方向与目的地随机
+    """
+
+    def __init__(self, floors: int, cars: int, capacity: int = 10, waiting_per_floor: float = 0.5,
+                 moving_ratio: float = 0.6, tick: int = 1000, seed: int = 0):
+        self.rng = random.Random(seed)
+        self.floor_num = floors
+        self.capacity = capacity
+        self.tick = tick
+        self.next_passenger_id = 1
+        self.state = SimulationState(tick=tick, elevators=[], floors=[FloorState(floor=i) for i in range(floors)])
+        self.client = FakeAPIClient(self.state)
+
+        moving = [self.rng.random() < moving_ratio for _ in range(cars)]
+        if cars and moving_ratio > 0 and not any(moving):
+            moving[0] = True
+        for elevator_id in range(cars):
+            self.state.elevators.append(self._random_elevator(elevator_id, moving[elevator_id]))
+        for floor in self.state.floors:
+            # 期望为 waiting_per_floor 的几何分布人数
+            while self.rng.random() < waiting_per_floor / (1 + waiting_per_floor):
+                self.add_waiting(floor.floor)
+
+        self.elevators = [FakeElevator(e, self.client) for e in self.state.elevators]
+        self.floors = [FakeFloor(f) for f in self.state.floors]
+
+    def _new_passenger(self, origin: int, destination: int) -> PassengerInfo:
+        info = PassengerInfo(id=self.next_passenger_id, origin=origin, destination=destination,
+                             arrive_tick=self.tick - self.rng.randint(0, 120))
+        self.next_passenger_id += 1
+        self.state.passengers[info.id] = info
+        return info
+
+    def _random_destination(self, origin: int) -> int:
+        destination = self.rng.randrange(self.floor_num - 1)
+        return destination + 1 if destination >= origin else destination
+
+    def _random_elevator(self, elevator_id: int, moving: bool) -> ElevatorState:
+        rng = self.rng
+        current = rng.randrange(self.floor_num)
+        state = ElevatorState(id=elevator_id, position=Position(current_floor=current, target_floor=current),
+                              max_capacity=self.capacity)
+        if self.floor_num > 1 and moving:
+            target = self._random_destination(current)
+            direction = Direction.UP if target > current else Direction.DOWN
+            state.position.target_floor = target
+            state.position.floor_up_position = rng.randint(1, 9) if direction == Direction.UP else -rng.randint(1, 9)
+            state.run_status = ElevatorStatus.CONSTANT_SPEED
+            state.last_tick_direction = direction
+        for _ in range(rng.randint(0, self.capacity) if self.floor_num > 1 else 0):
+            info = self._new_passenger(rng.randrange(self.floor_num), self._random_destination(current))
+            info.pickup_tick = self.tick - rng.randint(0, 60)
+            info.elevator_id = elevator_id
+            state.passengers.append(info.id)
+            state.passenger_destinations[info.id] = info.destination
+        return state
+
+    @contextlib.contextmanager
+    def stopped(self, elevator_id: int):
+        """电梯暂时停靠在当前楼层 (停靠/空闲回调期间), 之后恢复原来的运行状态"""
+        state = self.state.elevators[elevator_id]
+        position = state.position
+        saved = (state.run_status, position.target_floor, position.floor_up_position)
+        state.run_status = ElevatorStatus.STOPPED
+        position.target_floor = position.current_floor
+        position.floor_up_position = 0
+        try:
+            yield state
+        finally:
+            state.run_status, position.target_floor, position.floor_up_position = saved
+
+    def add_waiting(self, origin: int) -> Optional[PassengerInfo]:
+        """在 origin 层加入一位候梯乘客 (单层楼宇中没有可去的楼层时返回 None)"""
+        if self.floor_num < 2:
+            return None
+        info = self._new_passenger(origin, self._random_destination(origin))
+        floor = self.state.floors[origin]
+        (floor.up_queue if info.destination > origin else floor.down_queue).append(info.id)
+        return info
+
+    def remove_waiting(self, info: PassengerInfo) -> None:
+        self.state.floors[info.origin].remove_waiting_passenger(info.id)
+
+    def waiting_passengers(self) -> List[PassengerInfo]:
+        passengers = self.state.passengers
+        return [passengers[pid] for f in self.state.floors for pid in f.up_queue + f.down_queue]
+
+    def riding_passengers(self) -> List[PassengerInfo]:
+        passengers = self.state.passengers
+        return [passengers[pid] for e in self.state.elevators for pid in e.passengers]
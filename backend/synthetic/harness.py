@@ -0,0 +1,181 @@
+"""
+控制器回调微基准: 在合成楼宇上直接调用控制器回调, 统计每次调用的耗时和内存分配
+
+每个场景 (楼层数, 电梯数) 新建楼宇和控制器, 先把楼宇中已有的乘客通过呼叫/上车回调登记给控制器,
+然后依次测量:
+- on_passenger_call       新乘客到达随机楼层
+- on_passenger_board      该乘客登上随机电梯
+- on_passenger_alight     该乘客在目的地下车 (三者按乘客生命周期成组调用, 楼宇状态保持稳定)
+- on_elevator_stopped     随机电梯停靠在当前楼层 (回调期间该电梯处于停止状态)
+- on_elevator_approaching 随机运行中的电梯即将到达下一层
+- on_elevator_idle        随机电梯在当前楼层空闲
+回调中下达的命令在计时之外统一发送 (与基类在 tick 末尾发送一致)。
+耗时与内存分配分两遍测量 (tracemalloc 会显著拖慢执行), 两遍使用相同的随机种子。
+"""
+import contextlib
+import os
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+from unittest import mock
+
+from elevator_saga.client import base_controller
+from elevator_saga.client.proxy_models import ProxyElevator, ProxyFloor, ProxyPassenger
+
+from .building import FakePassenger, NullBroadcastor, SyntheticBuilding
+
+CALLBACKS = ["on_passenger_call", "on_passenger_board", "on_passenger_alight",
+             "on_elevator_stopped", "on_elevator_approaching", "on_elevator_idle"]
+
+
+def create_controller(controller_cls, building: SyntheticBuilding, params: Dict[str, Any]):
+    """创建控制器, 其 api_client 为楼宇的 FakeAPIClient (不连接模拟器)"""
+    with mock.patch.object(base_controller, "ElevatorAPIClient", lambda *args, **kwargs: building.client):
+        controller = controller_cls(NullBroadcastor(), **params)
+    controller.decision_guard.budget_ms = None
+    return controller
+
+
+class CallbackRecorder(object):
+    """记录每次回调的耗时 (ns) 或内存分配 (tracemalloc 峰值增量 / 净增量, 字节)"""
+
+    def __init__(self, trace_alloc: bool):
+        self.trace_alloc = trace_alloc
+        self.samples: Dict[str, List[int]] = {name: [] for name in CALLBACKS}
+        self.retained: Dict[str, List[int]] = {name: [] for name in CALLBACKS}
+        self.recording = False
+
+    def call(self, name: str, func: Callable, *args) -> None:
+        if not self.recording:
+            func(*args)
+            return
+        if self.trace_alloc:
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            func(*args)
+            after, peak = tracemalloc.get_traced_memory()
+            self.samples[name].append(peak - before)
+            self.retained[name].append(after - before)
+        else:
+            start = time.perf_counter_ns()
+            func(*args)
+            self.samples[name].append(time.perf_counter_ns() - start)
+
+
+class ScenarioDriver(object):
+
+    def __init__(self, controller_cls, params: Dict[str, Any], floors: int, cars: int, seed: int,
+                 real_proxies: bool = False, **building_kwargs):
+        self.building = SyntheticBuilding(floors, cars, seed=seed, **building_kwargs)
+        self.rng = self.building.rng
+        self.controller = create_controller(controller_cls, self.building, params)
+        self.real_proxies = real_proxies
+        client = self.building.client
+        if real_proxies:
+            # 库自带的代理对象, 每次属性访问都在状态中查找, 计入代理开销
+            self.elevators = [ProxyElevator(e.id, client) for e in self.building.state.elevators]
+            self.floors = [ProxyFloor(f.floor, client) for f in self.building.state.floors]
+        else:
+            self.elevators = self.building.elevators
+            self.floors = self.building.floors
+
+    def passenger(self, info):
+        return ProxyPassenger(info.id, self.building.client) if self.real_proxies else FakePassenger(info)
+
+    def setup(self) -> None:
+        """on_init 并把楼宇中已有的乘客登记给控制器"""
+        controller = self.controller
+        controller._internal_init(self.elevators, self.floors)
+        controller.current_tick = self.building.tick
+        for info in self.building.waiting_passengers():
+            direction = "up" if info.destination > info.origin else "down"
+            controller.on_passenger_call(self.passenger(info), self.floors[info.origin], direction)
+        for info in self.building.riding_passengers():
+            controller.on_passenger_board(self.elevators[info.elevator_id], self.passenger(info))
+        controller.command_buffer.flush()
+
+    def run(self, recorder: CallbackRecorder, rounds: int) -> None:
+        controller = self.controller
+        building = self.building
+        floor_num = building.floor_num
+        for _ in range(rounds):
+            # 乘客生命周期: 呼叫 -> 上车 -> 下车, 结束后楼宇状态复原
+            info = building.add_waiting(self.rng.randrange(floor_num))
+            if info is not None:
+                passenger = self.passenger(info)
+                direction = "up" if info.destination > info.origin else "down"
+                recorder.call("on_passenger_call", controller.on_passenger_call, passenger, self.floors[info.origin], direction)
+                elevator = self.rng.choice(self.elevators)
+                building.remove_waiting(info)
+                recorder.call("on_passenger_board", controller.on_passenger_board, elevator, passenger)
+                recorder.call("on_passenger_alight", controller.on_passenger_alight, elevator, passenger, self.floors[info.destination])
+                del building.state.passengers[info.id]
+            controller.command_buffer.flush()
+
+            elevator = self.rng.choice(self.elevators)
+            with building.stopped(elevator.id):
+                recorder.call("on_elevator_stopped", controller.on_elevator_stopped, elevator, self.floors[elevator.current_floor])
+            controller.command_buffer.flush()
+
+            moving = [e for e in self.elevators if not e.is_idle]
+            if moving:
+                elevator = self.rng.choice(moving)
+                # 运行中的电梯位于 current_floor 与下一层之间 (目标楼层在行进方向上, 下一层不会越界)
+                step = 1 if elevator.target_floor > elevator.current_floor else -1
+                direction = "up" if step > 0 else "down"
+                recorder.call("on_elevator_approaching", controller.on_elevator_approaching, elevator,
+                              self.floors[elevator.current_floor + step], direction)
+                controller.command_buffer.flush()
+
+            elevator = self.rng.choice(self.elevators)
+            with building.stopped(elevator.id):
+                recorder.call("on_elevator_idle", controller.on_elevator_idle, elevator)
+            controller.command_buffer.flush()
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def run_scenario(controller_cls, params: Dict[str, Any], floors: int, cars: int, rounds: int = 200,
+                 warmup: int = 20, seed: int = 0, real_proxies: bool = False,
+                 trace_alloc: bool = True, **building_kwargs) -> Dict[str, Dict[str, Optional[float]]]:
+    """
+    一个场景的统计 {回调: {"calls", "mean_us", "p50_us", "p95_us", "max_us", "alloc_kb", "retained_b"}},
+    alloc_kb 为每次调用的平均峰值分配 (KB), retained_b 为每次调用平均净增的内存 (字节)
+    """
+    results: Dict[str, Dict[str, Optional[float]]] = {}
+    passes = [False, True] if trace_alloc else [False]
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for alloc_pass in passes:
+            driver = ScenarioDriver(controller_cls, params, floors, cars, seed, real_proxies, **building_kwargs)
+            driver.setup()
+            recorder = CallbackRecorder(alloc_pass)
+            driver.run(recorder, warmup)
+            recorder.recording = True
+            if alloc_pass:
+                tracemalloc.start()
+            try:
+                driver.run(recorder, rounds)
+            finally:
+                if alloc_pass:
+                    tracemalloc.stop()
+
+            for name in CALLBACKS:
+                samples = recorder.samples[name]
+                row = results.setdefault(name, {"calls": 0, "mean_us": None, "p50_us": None, "p95_us": None,
+                                                "max_us": None, "alloc_kb": None, "retained_b": None})
+                if not samples:
+                    continue
+                if alloc_pass:
+                    row["alloc_kb"] = round(sum(samples) / len(samples) / 1024, 3)
+                    row["retained_b"] = round(sum(recorder.retained[name]) / len(samples), 1)
+                else:
+                    us = [ns / 1000 for ns in samples]
+                    row["calls"] = len(us)
+                    row["mean_us"] = round(sum(us) / len(us), 2)
+                    row["p50_us"] = round(percentile(us, 0.5), 2)
+                    row["p95_us"] = round(percentile(us, 0.95), 2)
+                    row["max_us"] = round(max(us), 2)
+    return results
@@ -0,0 +1,123 @@
+import argparse
+import json
+from typing import Any, Dict, List
+
+from controller import CONTROLLERS
+from tuning.cache import ResultCache
+from tuning.runner import Evaluator
+from tuning.search import bayesian_search, grid_candidates, random_candidates
+
+# 可选的优化目标及方向 (True 表示越大越好), 多个流量文件取平均
+OBJECTIVES = {
+    "average_arrival_wait_time": False,
+    "average_floor_wait_time": False,
+    "p95_arrival_wait_time": False,
+    "p95_floor_wait_time": False,
+    "completion_rate": True,
+    "completed_passengers": True,
+    "cost_total": False,
+}
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Elevator Saga controller parameter tuning")
+    parser.add_argument(
+        "--controller", choices=sorted(CONTROLLERS), default="scan", help="Controller to tune (default: scan)"
+    )
+    parser.add_argument(
+        "--search", choices=["grid", "random", "bayes"], default="random", help="Search strategy (default: random; bayes requires optuna)"
+    )
+    parser.add_argument(
+        "--trials", type=int, default=20, help="Number of parameter sets for random/bayes search (default: 20)"
+    )
+    parser.add_argument(
+        "--space", type=str, default="",
+        help="JSON overriding candidate values, e.g. '{\"bypass_min_boarding\": [1, 2, 3]}'; parameters not listed keep their default"
+    )
+    parser.add_argument(
+        "--traffic", type=str, default="", help="Comma separated traffic file names (default: all), e.g. 'up_peak,down_peak'"
+    )
+    parser.add_argument(
+        "--objective", choices=sorted(OBJECTIVES), default="average_arrival_wait_time", help="Metric to optimize (default: average_arrival_wait_time)"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=4, help="Parallel simulators (default: 4)"
+    )
+    parser.add_argument(
+        "--base_port", type=int, default=9000, help="Worker i uses ports base_port+2i (simulator) and base_port+2i+1 (WebSocket) (default: 9000)"
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0, help="Random seed for random/bayes search (default: 0)"
+    )
+    parser.add_argument(
+        "--cache", type=str, default="result_cache.sqlite3", help="Result cache file (default: result_cache.sqlite3)"
+    )
+    parser.add_argument(
+        "--cache_size", type=int, default=10000, help="Max cached results, least recently used are evicted (default: 10000)"
+    )
+    parser.add_argument(
+        "--top", type=int, default=5, help="Number of best parameter sets to print (default: 5)"
+    )
+    return parser.parse_args()
+
+def build_space(controller_cls, override: str) -> Dict[str, List[Any]]:
+    """--space 中列出的参数使用给定候选值, 未列出的固定为默认值; 不给 --space 时搜索全部 TUNABLE_PARAMS"""
+    space = dict(controller_cls.TUNABLE_PARAMS)
+    if not override:
+        return space
+    values = json.loads(override)
+    unknown = set(values) - set(space)
+    if unknown:
+        raise ValueError(f"Unknown parameters for {controller_cls.__name__}: {sorted(unknown)}")
+    return {name: values.get(name, candidates[:1]) for name, candidates in space.items()}
+
+
+class Tuner(object):
+
+    def __init__(self, args):
+        self.objective = args.objective
+        self.maximize = OBJECTIVES[args.objective]
+        self.cache = ResultCache(args.cache, max_entries=args.cache_size)
+        traffic = [name.strip() for name in args.traffic.split(",") if name.strip()]
+        self.evaluator = Evaluator(args.controller, traffic, workers=args.workers, base_port=args.base_port, cache=self.cache)
+        self.results: List[Dict[str, Any]] = []
+
+    def close(self) -> None:
+        self.evaluator.close()
+        self.cache.close()
+
+    def evaluate_batch(self, candidates: List[Dict[str, Any]]) -> List[float]:
+        """并行评测一批参数, 返回每组参数的得分 (越小越好)"""
+        scores = []
+        for params, per_traffic in zip(candidates, self.evaluator.run(candidates)):
+            values = list(per_traffic.values())
+            if any(v is None for v in values):
+                scores.append(float("inf"))  # 有评测失败的流量文件, 不参与排名
+                continue
+            value = sum(v[self.objective] for v in values) / len(values)
+            self.results.append({"params": params, self.objective: value})
+            scores.append(-value if self.maximize else value)
+        return scores
+
+    def report(self, top: int) -> None:
+        ranked = sorted(self.results, key=lambda r: -r[self.objective] if self.maximize else r[self.objective])
+        print(f"\n共评测 {len(ranked)} 组参数 × {len(self.evaluator.traffic)} 个流量文件，"
+              f"模拟 {self.evaluator.simulated} 次，缓存命中 {self.cache.hits} 次")
+        for rank, result in enumerate(ranked[:top], 1):
+            print(f"#{rank} {self.objective}={result[self.objective]:.2f}  --params '{json.dumps(result['params'])}'")
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    space = build_space(CONTROLLERS[args.controller], args.space)
+    tuner = Tuner(args)
+    try:
+        if args.search == "grid":
+            tuner.evaluate_batch(list(grid_candidates(space)))
+        elif args.search == "random":
+            tuner.evaluate_batch(list(random_candidates(space, args.trials, args.seed)))
+        else:
+            bayesian_search(space, args.trials, args.workers, args.seed, tuner.evaluate_batch)
+        tuner.report(args.top)
+    finally:
+        tuner.close()
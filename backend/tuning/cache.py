@@ -0,0 +1,117 @@
+"""
+评测结果缓存
+
+键 = 哈希(控制器源码指纹, 参数, 流量文件名, 流量文件内容), 值为该轮的评测指标。
+控制器或其依赖的仓库内模块的源码、已安装的模拟器 (elevator-py) 版本、参数、流量文件任一变化都会得到新的键,
+因此回归检查只模拟真正变化的组合。缓存保存在 SQLite 文件中, 超过 max_entries 时按最近使用时间淘汰 (LRU)。
+"""
+import hashlib
+import importlib.metadata
+import inspect
+import json
+import os
+import sqlite3
+import sys
+import time
+from typing import Any, Dict, Optional, Set
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SIMULATOR_PACKAGE = "elevator-py"
+
+
+def traffic_digest(path: str) -> str:
+    """流量文件内容的哈希"""
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+
+def simulator_version() -> str:
+    """已安装的模拟器版本 (模拟器与客户端库在同一个包中, 升级后同样的控制器可能得到不同的结果)"""
+    try:
+        return importlib.metadata.version(SIMULATOR_PACKAGE)
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def _is_local_module(module) -> bool:
+    path = getattr(module, "__file__", None)
+    return path is not None and os.path.abspath(path).startswith(BACKEND_DIR + os.sep)
+
+
+def controller_fingerprint(controller_cls) -> str:
+    """
+    控制器源码指纹: 控制器及其基类所在的仓库内模块, 以及这些模块 (递归) 引用的仓库内模块的源码哈希,
+    再加上已安装的模拟器版本。只修改无关的控制器不会让缓存失效。
+    """
+    pending = [sys.modules[cls.__module__] for cls in controller_cls.__mro__]
+    seen: Set[str] = set()
+    while pending:
+        module = pending.pop()
+        if not _is_local_module(module) or module.__name__ in seen:
+            continue
+        seen.add(module.__name__)
+        for value in vars(module).values():
+            if inspect.ismodule(value):
+                pending.append(value)
+            elif inspect.isclass(value) or inspect.isfunction(value):
+                owner = sys.modules.get(value.__module__)
+                if owner is not None:
+                    pending.append(owner)
+
+    digest = hashlib.sha256()
+    digest.update(f"{SIMULATOR_PACKAGE}=={simulator_version()}".encode("utf-8"))
+    for name in sorted(seen):
+        digest.update(name.encode("utf-8"))
+        with open(sys.modules[name].__file__, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+class ResultCache(object):
+
+    def __init__(self, path: str, max_entries: int = 10000):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.db = sqlite3.connect(path)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, metrics TEXT NOT NULL, last_used REAL NOT NULL)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)")
+        self.db.commit()
+
+    @staticmethod
+    def make_key(fingerprint: str, params: Dict[str, Any], traffic_name: str, digest: str) -> str:
+        text = json.dumps({"controller": fingerprint, "params": params, "traffic": traffic_name, "digest": digest},
+                          sort_keys=True)
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        row = self.db.execute("SELECT metrics FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.db.execute("UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key))
+        self.db.commit()
+        return json.loads(row[0])
+
+    def put(self, key: str, metrics: Dict[str, Any]) -> None:
+        self.db.execute("INSERT OR REPLACE INTO results (key, metrics, last_used) VALUES (?, ?, ?)",
+                        (key, json.dumps(metrics), time.time()))
+        self._evict()
+        self.db.commit()
+
+    def _evict(self) -> None:
+        excess = len(self) - self.max_entries
+        if excess > 0:
+            self.db.execute(
+                "DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY last_used LIMIT ?)", (excess,)
+            )
+
+    def __len__(self) -> int:
+        return self.db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def close(self) -> None:
+        self.db.close()
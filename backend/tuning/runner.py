@@ -0,0 +1,187 @@
+"""
+并行评测: 每个工作进程独占一个模拟器端口和一个 WebSocket 端口,
+每次评测启动一个新的模拟器进程、切换到指定流量文件、在进程内运行一轮控制器并返回指标。
+Evaluator 在模拟前先查结果缓存, 只把未命中的 (参数, 流量文件) 组合分发给工作进程。
+"""
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import elevator_saga
+
+from comm.websocket_broadcastor import SceneBroadcastor
+from controller import CONTROLLERS
+
+from .cache import ResultCache, controller_fingerprint, traffic_digest
+
+
+def list_traffic_files() -> List[Path]:
+    """模拟器自带的流量文件, 顺序与模拟器内部一致 (按文件名排序)"""
+    traffic_dir = Path(os.path.dirname(elevator_saga.__file__)) / "traffic"
+    return sorted(p for p in traffic_dir.glob("*.json") if p.is_file())
+
+
+class SimulatorProcess(object):
+    """在独立子进程中运行的模拟器, 用作上下文管理器"""
+
+    STARTUP_TIMEOUT = 30.0
+
+    def __init__(self, port: int):
+        self.port = port
+        self.base_url = "http://127.0.0.1:" + str(port)
+        self.process: Optional[subprocess.Popen] = None
+
+    def __enter__(self) -> "SimulatorProcess":
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "elevator_saga.server.simulator", "--port", str(self.port)],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            cwd=tempfile.gettempdir(),  # 模拟器在启动目录写 result.json
+        )
+        deadline = time.time() + self.STARTUP_TIMEOUT
+        while True:
+            try:
+                self._request("/api/traffic/info")
+                return self
+            except (urllib.error.URLError, OSError):
+                if time.time() > deadline or self.process.poll() is not None:
+                    self.__exit__(None, None, None)
+                    raise RuntimeError(f"simulator on port {self.port} failed to start")
+                time.sleep(0.2)
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self.process is not None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+            self.process = None
+
+    def _request(self, endpoint: str, data: Optional[dict] = None) -> dict:
+        body = json.dumps(data).encode("utf-8") if data is not None else None
+        req = urllib.request.Request(self.base_url + endpoint, data=body, headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(req, timeout=10) as response:
+            return json.loads(response.read().decode("utf-8"))
+
+    def select_traffic(self, index: int) -> None:
+        """模拟器启动时加载第 0 个流量文件, 之后每次 next 前进一个"""
+        for _ in range(index):
+            self._request("/api/traffic/next", {"full_reset": False})
+
+
+# -------------------
+# 工作进程
+# -------------------
+_worker_port = None
+_worker_broadcastor = None
+
+
+def init_worker(port_queue) -> None:
+    """进程池初始化: 领取端口, 创建本进程共用的广播器, 并屏蔽控制器与模拟器客户端的大量输出"""
+    global _worker_port, _worker_broadcastor
+    _worker_port = port_queue.get()
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    os.dup2(devnull, 2)
+    _worker_broadcastor = SceneBroadcastor(port=_worker_port + 1)
+
+
+def evaluate(task: Tuple[str, Dict[str, Any], int]) -> Tuple[Tuple[str, Dict[str, Any], int], Optional[Dict[str, Any]], str]:
+    """
+    task = (控制器名, 参数, 流量文件下标)
+    返回 (task, 指标, 错误信息), 失败时指标为 None
+    """
+    controller_name, params, traffic_index = task
+    try:
+        with SimulatorProcess(_worker_port) as simulator:
+            simulator.select_traffic(traffic_index)
+            controller = CONTROLLERS[controller_name](_worker_broadcastor, server_port=_worker_port, **params)
+            controller.start()
+        if not controller.last_run_metrics:
+            return task, None, "run finished without metrics"
+        return task, dict(controller.last_run_metrics), ""
+    except Exception as e:
+        return task, None, f"{type(e).__name__}: {e}"
+
+
+# -------------------
+# 主进程
+# -------------------
+class Evaluator(object):
+    """在选定的流量文件上评测一个控制器的若干组参数"""
+
+    def __init__(self, controller_name: str, traffic_names: List[str], workers: int = 4, base_port: int = 9000,
+                 cache: Optional[ResultCache] = None):
+        self.controller_name = controller_name
+        self.fingerprint = controller_fingerprint(CONTROLLERS[controller_name])
+        self.workers = workers
+        self.base_port = base_port
+        self.cache = cache
+        self.simulated = 0
+        self._pool = None
+
+        traffic_files = list_traffic_files()
+        known = [p.stem for p in traffic_files]
+        missing = [name for name in traffic_names if name not in known]
+        if missing:
+            raise ValueError(f"Unknown traffic files: {missing}, available: {known}")
+        selected = set(traffic_names) if traffic_names else set(known)
+        # (流量文件下标, 名称, 内容哈希); 下标即模拟器中的顺序
+        self.traffic = [(i, p.stem, traffic_digest(str(p))) for i, p in enumerate(traffic_files) if p.stem in selected]
+
+    def _get_pool(self):
+        # 全部命中缓存时不启动工作进程
+        if self._pool is None:
+            ports = multiprocessing.Queue()
+            for i in range(self.workers):
+                ports.put(self.base_port + 2 * i)
+            self._pool = multiprocessing.Pool(self.workers, initializer=init_worker, initargs=(ports,))
+        return self._pool
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def key(self, params: Dict[str, Any], traffic_name: str, digest: str) -> str:
+        return ResultCache.make_key(self.fingerprint, params, traffic_name, digest)
+
+    def run(self, candidates: List[Dict[str, Any]]) -> List[Dict[str, Optional[Dict[str, Any]]]]:
+        """返回每组参数在各流量文件上的指标 {流量文件名: 指标}, 评测失败的为 None"""
+        results: Dict[str, Optional[Dict[str, Any]]] = {}
+        tasks = []
+        for params in candidates:
+            for index, name, digest in self.traffic:
+                key = self.key(params, name, digest)
+                if key in results:
+                    continue
+                metrics = self.cache.get(key) if self.cache is not None else None
+                results[key] = metrics
+                if metrics is None:
+                    tasks.append((self.controller_name, params, index))
+
+        if tasks:
+            names = {index: (name, digest) for index, name, digest in self.traffic}
+            for (_, params, index), metrics, err in self._get_pool().imap_unordered(evaluate, tasks):
+                name, digest = names[index]
+                if metrics is None:
+                    print(f"  ✗ {name} {params}: {err}")
+                    continue
+                self.simulated += 1
+                key = self.key(params, name, digest)
+                results[key] = metrics
+                if self.cache is not None:
+                    self.cache.put(key, metrics)
+                print(f"  ✓ {name} {params}")
+
+        return [{name: results[self.key(params, name, digest)] for _, name, digest in self.traffic}
+                for params in candidates]
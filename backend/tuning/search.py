@@ -0,0 +1,60 @@
+"""
+参数搜索策略: 网格 / 随机 / 贝叶斯 (TPE)
+
+参数空间为 {参数名: [候选值, ...]}, 与控制器的 TUNABLE_PARAMS 格式一致。
+贝叶斯搜索依赖可选的 optuna, 只在使用时导入。
+"""
+import itertools
+import random
+from typing import Any, Callable, Dict, Iterator, List
+
+ParamSpace = Dict[str, List[Any]]
+Params = Dict[str, Any]
+
+
+def grid_candidates(space: ParamSpace) -> Iterator[Params]:
+    """遍历参数空间的笛卡尔积"""
+    names = list(space)
+    for values in itertools.product(*(space[name] for name in names)):
+        yield dict(zip(names, values))
+
+
+def random_candidates(space: ParamSpace, trials: int, seed: int = 0) -> Iterator[Params]:
+    """不重复地随机抽取 trials 组参数 (空间较小时抽完为止), 第一组总是默认值"""
+    rng = random.Random(seed)
+    size = 1
+    for values in space.values():
+        size *= len(values)
+    seen = set()
+    candidate = {name: values[0] for name, values in space.items()}
+    while len(seen) < min(trials, size):
+        key = tuple(candidate.values())
+        if key not in seen:
+            seen.add(key)
+            yield candidate
+        candidate = {name: rng.choice(values) for name, values in space.items()}
+
+
+def bayesian_search(space: ParamSpace, trials: int, batch_size: int, seed: int,
+                    evaluate_batch: Callable[[List[Params]], List[float]]) -> None:
+    """
+    用 optuna 的 TPE 采样器做贝叶斯搜索 (ask/tell 接口):
+    每批向采样器要 batch_size 组参数并行评测, 再把目标值 (越小越好) 告诉采样器。
+    """
+    try:
+        import optuna
+    except ImportError:
+        raise RuntimeError("Bayesian search requires optuna: pip install optuna")
+
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    study = optuna.create_study(direction="minimize", sampler=optuna.samplers.TPESampler(seed=seed))
+    # 参数值可能含 None / bool, 采样器只负责选下标
+    study.enqueue_trial({name: 0 for name in space})
+    done = 0
+    while done < trials:
+        batch = [study.ask() for _ in range(min(batch_size, trials - done))]
+        params = [{name: values[trial.suggest_categorical(name, list(range(len(values))))]
+                   for name, values in space.items()} for trial in batch]
+        for trial, value in zip(batch, evaluate_batch(params)):
+            study.tell(trial, value)
+        done += len(batch)
@@ -4,8 +4,22 @@ import Header from './body/header'
 import Body from './body/layout'
 import Footer from './body/footer'
 
-import { SocketContext, SceneDataContext, MetricsDataContext, LogsDataContext, useLogsData } from './contexts_and_type'
-import type { ConnectMethod, SceneData, SceneDict, MetricsData } from './contexts_and_type'
+import { SocketContext, SceneDataContext, MetricsDataContext, LogsDataContext, PerfDataContext, useLogsData } from './contexts_and_type'
+import type { ConnectMethod, SceneData, MetricsData, PerfData } from './contexts_and_type'
+import { sceneWorker, postToSceneWorker } from './workers/scene-worker-client'
+import type { FromWorkerMessage } from './workers/protocol'
+
+// 页面地址中的订阅参数, 例如 ?topics=scene,metrics&elevators=0,1&floors=0,1,2,3
+// (墙面显示屏只显示一组电梯时, 服务端只发送这部分场景); 没有参数时使用默认订阅 (全部)
+function subscriptionFromQuery(search: string) {
+    const query = new URLSearchParams(search);
+    if (!query.has('topics') && !query.has('elevators') && !query.has('floors')) {
+        return null;
+    }
+    const list = (name: string) => query.get(name)?.split(',').map(s => s.trim()).filter(s => s !== '') ?? null;
+    const ids = (name: string) => list(name)?.map(Number) ?? null;
+    return { topics: list('topics'), elevators: ids('elevators'), floors: ids('floors') };
+}
 
 function App() {
     const [connectMethod, setConnectMethod] = useState<ConnectMethod>('websocket_to_algorithm');
@@ -13,118 +27,75 @@ function App() {
     const [socket, setSocket] = useState<WebSocket | null>(null);
     const [sceneData, setSceneData] = useState<SceneData | null>(null);
     const [metricsData, setMetricsData] = useState<MetricsData | null>(null);
+    const [perfData, setPerfData] = useState<PerfData | null>(null);
     const { logs, addLog, clearLogs } = useLogsData();
 
     const [connected, setConnected] = useState(false);
     const [reconnecting, setReconnecting] = useState(false);
     const [reconnectSignal, setReconnectSignal] = useState(false);
-    const [inUpdating, setInUpdating] = useState(true);
+
+    // scene decoding, statistics and passenger drawing run in the scene worker,
+    // the main thread only receives snapshots and the remaining server messages
+    useEffect(() => {
+        const onWorkerMessage = (event: MessageEvent<FromWorkerMessage>) => {
+            const message = event.data;
+            if (message.kind === 'scene') {
+                setSceneData(message.scene);
+            } else if (message.type === 'server_metrics_update'){
+                // console.log('Received metrics update:', message.data);
+                setMetricsData(message.data);
+            } else if (message.type === 'server_perf_update'){
+                setPerfData(message.data);
+            } else if (message.type === 'server_subscribed'){
+                addLog('[Subscribed]:' + JSON.stringify(message.data));
+            } else if (message.type === 'server_log'){
+                console.log('[Log from server]', message.data);
+                addLog('[Log from server]:' + String(message.data));
+            } else if (message.type === 'server_error'){
+                console.error('[Error from server]:', message.data);
+                addLog('[Error from server]:' + String(message.data));
+            } else {
+                console.warn('[Unknown message type from server]', message.type);
+                addLog('[Unknown message type from server]:' + String(message.type));
+            }
+        };
+        sceneWorker.addEventListener('message', onWorkerMessage);
+        return () => sceneWorker.removeEventListener('message', onWorkerMessage);
+    }, []);
 
     useEffect(() => {
         console.log(`Connection method changed to ${connectMethod}`);
         if(connectMethod === 'http_to_server') {
-            const interval = setInterval(() => {
-
-                const statePromise = fetch('http://127.0.0.1:8000/api/state')
-                    .then(response => response.json())
-                    .catch(error => {
-                        console.error('Error fetching scene data:', error);
-                        addLog('[Error fetching scene data]:' + String(error));
-                        return null;
-                    });
-
-                const trafficPromise = fetch('http://127.0.0.1:8000/api/traffic/info')
-                    .then(response => response.json())
-                    .catch(error => {
-                        console.error('Error fetching traffic info:', error);
-                        addLog('[Error fetching traffic info]:' + String(error));
-                        return null;
-                    });
-
-                Promise.all([statePromise, trafficPromise])
-                    .then(([stateData, trafficInfo]) => {
-
-                        console.log('Fetched state data:', stateData);
-
-                        const curScene: SceneDict = {
-                            building: {
-                                // size of stateData.elevators and stateData.floors
-                                floors: Object.keys(stateData.floors).length,
-                                elevators: Object.keys(stateData.elevators).length,
-                                elevator_capacity: stateData.elevators[0]?.capacity || 8,
-                            },
-                            elevators: stateData.elevators.reduce((acc: any, e: any) => {
-                                acc[e.id] = {
-                                    id: e.id,
-                                    current_pos: Math.round(e.position.current_floor * 10 + e.position.floor_up_position) / 10, // 保留一位小数
-                                    target_floor: e.position.target_floor,
-                                    is_idle: e.run_status === 'stopped' ? true : false,
-                                    run_status: e.run_status,
-                                    target_floor_direction: e.current_floor_float < e.target_floor ? 'up' : (e.current_floor_float > e.target_floor ? 'down' : 'stopped'),
-                                    passengers: e.passengers,
-                                }
-                                return acc;
-                            }, {}),
-                            floors: stateData.floors.reduce((acc: any, f: any) => {
-                                acc[f.floor] = {
-                                    id: f.floor,
-                                    up_queue: f.up_queue,
-                                    down_queue: f.down_queue,
-                                }
-                                return acc;
-                            }, {}),
-                            passengers: Object.fromEntries(
-                                Object.entries(stateData.passengers).map(([id, p]: [string, any]) => [
-                                    id,
-                                    {
-                                        id: p.id,
-                                        origin: p.origin,
-                                        destination: p.destination,
-                                        arrive_tick: p.arrive_tick,
-                                        pickup_tick: p.pickup_tick,
-                                        dropoff_tick: p.dropoff_tick,
-                                        elevator_id: p.elevator_id,
-                                        status: p.arrived ? 'arrived' : (p.pickup_tick > 0 ? 'in_elevator' : 'waiting'),
-                                        wait_time: p.pickup_tick - p.arrive_tick,
-                                        system_time: p.dropoff_tick - p.arrive_tick,
-                                        travel_direction: p.destination > p.origin ? 'up' : (p.destination < p.origin ? 'down' : 'stopped'),
-                                    }
-                                ])
-                            ),
-                            current: {
-                                tick: stateData.tick,
-                                max_tick: trafficInfo?.max_tick || undefined,
-                            }
-                        }
-
-                        setSceneData((prevData) => {
-                            const newData = prevData ? {...prevData} : {};
-                            newData['status'] = 'updating';
-                            newData['scene'] = curScene;
-                            newData['prev_scene'] = curScene.current.tick > 0 ? (prevData?.scene ? {...prevData.scene} : undefined): prevData?.prev_scene;
-                            return newData;
+            // 长轮询后端状态网关 (backend/gateway.py), 不再直接访问模拟器；
+            // 携带上次的 ETag, 网关在出现新 tick 前挂起请求, 超时返回 304
+            const controller = new AbortController();
+            let etag: string | null = null;
+            const poll = async () => {
+                while (!controller.signal.aborted) {
+                    try {
+                        const response = await fetch('http://127.0.0.1:8002/api/scene?wait=10', {
+                            cache: 'no-store',
+                            headers: etag ? { 'If-None-Match': etag } : {},
+                            signal: controller.signal,
                         });
-
-                        if(trafficInfo && stateData.tick >= trafficInfo.max_tick-1 && inUpdating) {
-                            console.log(stateData.tick, trafficInfo.max_tick);
-                            setMetricsData(stateData.metrics);
-                            setInUpdating(false);
-                        }
-                        if(trafficInfo && stateData.tick < trafficInfo.max_tick-1 ) {
-                            setMetricsData(null);
-                            setInUpdating(true);
+                        if (response.status === 200) {
+                            etag = response.headers.get('ETag');
+                            postToSceneWorker({ kind: 'gateway_message', raw: await response.text() });
+                        } else if (response.status !== 304) {
+                            throw new Error(`HTTP ${response.status}`);
                         }
-                    })
-                    .catch(error => {
-                        console.error('Error fetching data:', error);
-                        addLog('[Error fetching data]:' + String(error));
-                    });
-                
-
-            }, 50); // 每0.05秒请求一次
+                    } catch (error) {
+                        if (controller.signal.aborted) break;
+                        console.error('Error fetching scene data:', error);
+                        addLog('[Error fetching scene data]:' + String(error));
+                        await new Promise(resolve => setTimeout(resolve, 1000));
+                    }
+                }
+            };
+            poll();
 
             return () => {
-                clearInterval(interval); // 清除定时器
+                controller.abort(); // 结束长轮询
             }
         } else if (connectMethod === 'websocket_to_algorithm') {
             const interval = setInterval(() => {
@@ -135,6 +106,10 @@ function App() {
 
                     socket.onopen = () => {
                         console.log('WebSocket connection established');
+                        const subscription = subscriptionFromQuery(window.location.search);
+                        if (subscription) {
+                            socket.send(JSON.stringify({ type: 'client_subscribe', data: subscription }));
+                        }
                         setConnected(() => true);
                         setReconnecting(() => false);
                     };
@@ -146,48 +121,8 @@ function App() {
                     }
 
                     socket.onmessage = (event) => {
-                        const message = JSON.parse(event.data);
-                        // console.log('Received message:', message);
-
-                        if (message.type === 'server_scene_update'){
-                            console.log(message.data);
-                            // if any record in message.data.passengers have pickup_tick>0 && dropoff_tick>0 && pickup_tick==dropoff_tick,
-                            // it means the scene has ended, set status to 'finished'
-                            var status = 'updating';
-                            if (Object.values(message.data.passengers).some((p: any) => 
-                                typeof p.pickup_tick === 'number' && p.pickup_tick > 0 && 
-                                typeof p.dropoff_tick === 'number' && p.dropoff_tick > 0 && 
-                                p.pickup_tick === p.dropoff_tick)) {
-                                console.log('Scene has ended.');
-                                status = 'finished';
-                            }
-                            setSceneData((prevData) => {
-                                const newData = prevData ? {...prevData} : {};
-                                newData['status'] = status;
-                                newData['scene'] = message.data;
-                                newData['prev_scene'] = prevData?.scene ? {...prevData.scene} : undefined;
-                                return newData;
-                            });
-                        } else if (message.type === 'server_metrics_update'){
-                            // console.log('Received metrics update:', message.data);
-                            setMetricsData(message.data);
-                        } else if (message.type === 'server_wait_for_confirmation'){
-                            console.log('Server is waiting for confirmation to proceed to next step.');
-                            setSceneData((prevData) => {
-                                const newData = prevData ? {...prevData} : {};
-                                newData['status'] = 'finished';
-                                return newData;
-                            });
-                        } else if (message.type === 'server_log'){
-                            console.log('[Log from server]', message.data);
-                            addLog('[Log from server]:' + String(message.data));
-                        } else if (message.type === 'server_error'){
-                            console.error('[Error from server]:', message.data);
-                            addLog('[Error from server]:' + String(message.data));
-                        } else {
-                            console.warn('[Unknown message type from server]', message.type);
-                            addLog('[Unknown message type from server]:' + String(message.type));
-                        }
+                        // decoded off the main thread
+                        postToSceneWorker({ kind: 'ws_message', raw: event.data });
                     }
 
                     setSocket(socket);
@@ -204,13 +139,14 @@ function App() {
                 }
             }
         }
-    }, [connectMethod, reconnectSignal, socket, inUpdating]);
+    }, [connectMethod, reconnectSignal, socket]);
 
     return (
         <SocketContext value={socket}>
             <SceneDataContext value={sceneData}>
                 <MetricsDataContext value={metricsData}>
                     <LogsDataContext value={logs}>  
+                    <PerfDataContext value={perfData}>
                         <div className='flex flex-col justifu-between min-h-screen'>
                             <div>
                                 <Header
@@ -226,6 +162,8 @@ function App() {
                                         }));
                                         clearLogs();
                                         setMetricsData(null);
+                                        setPerfData(null);
+                                        postToSceneWorker({ kind: 'start_run' });
                                     }}
                                 />
                             </div>
@@ -236,6 +174,7 @@ function App() {
                                 <Footer />
                             </div>
                         </div>
+                    </PerfDataContext>
                     </LogsDataContext>
                 </MetricsDataContext>
             </SceneDataContext>
@@ -0,0 +1,58 @@
+import { useEffect, useRef } from 'react';
+
+import { postToSceneWorker } from '@/workers/scene-worker-client';
+
+interface PassengerLayerProps {
+    width: number;
+    height: number;
+}
+
+// All passengers are drawn by the scene worker on an OffscreenCanvas,
+// the main thread only hands over the canvas, its size and the theme colors.
+export default function PassengerLayer({ width, height }: PassengerLayerProps) {
+    const containerRef = useRef<HTMLDivElement>(null);
+    const sizeRef = useRef({ width, height });
+    sizeRef.current = { width, height };
+
+    // control of a canvas can only be transferred once, so the element is
+    // created here instead of in JSX and replaced on every mount
+    useEffect(() => {
+        const container = containerRef.current;
+        if (!container) return;
+        const canvas = document.createElement('canvas');
+        canvas.style.width = '100%';
+        canvas.style.height = '100%';
+        container.appendChild(canvas);
+
+        const offscreen = canvas.transferControlToOffscreen();
+        const { width, height } = sizeRef.current;
+        postToSceneWorker({ kind: 'canvas', canvas: offscreen, width, height, dpr: window.devicePixelRatio || 1 }, [offscreen]);
+
+        const style = getComputedStyle(container);
+        const fill = style.getPropertyValue('--primary');
+        const text = style.getPropertyValue('--primary-foreground');
+        if (fill && text) postToSceneWorker({ kind: 'colors', colors: { fill, text } });
+
+        return () => {
+            container.removeChild(canvas);
+        };
+    }, []);
+
+    useEffect(() => {
+        postToSceneWorker({ kind: 'resize', width, height, dpr: window.devicePixelRatio || 1 });
+    }, [width, height]);
+
+    return (
+        <div
+            ref={containerRef}
+            style={{
+                position: 'absolute',
+                left: 0,
+                top: 0,
+                width: `${width}px`,
+                height: `${height}px`,
+                pointerEvents: 'none',
+            }}
+        />
+    );
+}
@@ -0,0 +1,131 @@
+import { durationTime, firstRenderDurationTime } from '@/contexts_and_type';
+
+type Context2D = CanvasRenderingContext2D | OffscreenCanvasRenderingContext2D;
+
+export type PassengerColors = {
+    fill: string;
+    text: string;
+};
+
+/**
+ * Draws passengers as rounded squares from typed-array positions.
+ *
+ * Positions are interpolated from the last drawn position to the new target
+ * over `durationTime`, like the spring animation of the DOM elements.
+ * Works with both a regular and an offscreen canvas context.
+ */
+export class PassengerRenderer {
+    ctx: Context2D;
+    width = 0;
+    height = 0;
+    size = 16;
+    colors: PassengerColors = { fill: '#f97316', text: '#ffffff' };
+
+    count = 0;
+    ids = new Int32Array(0);
+    fromX = new Float32Array(0);
+    fromY = new Float32Array(0);
+    toX = new Float32Array(0);
+    toY = new Float32Array(0);
+    curX = new Float32Array(0);
+    curY = new Float32Array(0);
+    appearing = new Uint8Array(0);
+    startTime = 0;
+
+    constructor(ctx: Context2D) {
+        this.ctx = ctx;
+    }
+
+    resize(width: number, height: number, dpr: number) {
+        this.width = width;
+        this.height = height;
+        this.ctx.canvas.width = Math.round(width * dpr);
+        this.ctx.canvas.height = Math.round(height * dpr);
+        this.ctx.setTransform(dpr, 0, 0, dpr, 0, 0);
+    }
+
+    setTargets(ids: Int32Array, xs: Float32Array, ys: Float32Array, count: number, size: number, now: number) {
+        if (count > this.curX.length) this.grow(Math.max(count, this.curX.length * 2));
+        for (let i = 0; i < count; i++) {
+            const known = i < this.count && this.ids[i] === ids[i] && !Number.isNaN(this.curX[i]);
+            this.ids[i] = ids[i];
+            this.toX[i] = xs[i];
+            this.toY[i] = ys[i];
+            this.appearing[i] = known ? 0 : 1;
+            this.fromX[i] = known ? this.curX[i] : xs[i];
+            this.fromY[i] = known ? this.curY[i] : ys[i];
+        }
+        this.count = count;
+        this.size = size;
+        this.startTime = now;
+    }
+
+    /** Draw one frame, returns true while the animation is still running. */
+    frame(now: number) {
+        const ctx = this.ctx;
+        ctx.clearRect(0, 0, this.width, this.height);
+        const elapsed = now - this.startTime;
+        const t = Math.min(1, elapsed / durationTime);
+        const appear = Math.min(1, elapsed / firstRenderDurationTime);
+        const size = this.size;
+
+        ctx.textAlign = 'center';
+        ctx.textBaseline = 'middle';
+        ctx.font = `bold ${size / 2}px sans-serif`;
+        for (let i = 0; i < this.count; i++) {
+            const tx = this.toX[i];
+            if (Number.isNaN(tx)) {
+                this.curX[i] = NaN;
+                continue;
+            }
+            const x = this.fromX[i] + (tx - this.fromX[i]) * t;
+            const y = this.fromY[i] + (this.toY[i] - this.fromY[i]) * t;
+            this.curX[i] = x;
+            this.curY[i] = y;
+
+            const alpha = this.opacityAt(x) * (this.appearing[i] ? appear : 1);
+            if (alpha <= 0) continue;
+            ctx.globalAlpha = alpha;
+            ctx.fillStyle = this.colors.fill;
+            ctx.beginPath();
+            ctx.roundRect(x, y, size, size, 4);
+            ctx.fill();
+            ctx.fillStyle = this.colors.text;
+            ctx.fillText(String(this.ids[i]), x + size / 2, y + size / 2);
+        }
+        ctx.globalAlpha = 1;
+        return t < 1 || appear < 1;
+    }
+
+    // fade out near the left / right edge of the canvas
+    private opacityAt(x: number) {
+        const fadeStartX = this.width * 0.85;
+        const fadeEndX = this.width * 0.96;
+        const showStartX = this.width * 0.025;
+        const showEndX = this.width * 0.15;
+        if (x < fadeStartX && x > showEndX) return 1;
+        if (x > fadeEndX || x < showStartX) return 0;
+        if (x >= fadeStartX) return 1 - (x - fadeStartX) / (fadeEndX - fadeStartX);
+        return (x - showStartX) / (showEndX - showStartX);
+    }
+
+    private grow(size: number) {
+        const copyF = (arr: Float32Array) => {
+            const next = new Float32Array(size);
+            next.set(arr);
+            return next;
+        };
+        const ids = new Int32Array(size);
+        ids.set(this.ids);
+        this.ids = ids;
+        const appearing = new Uint8Array(size);
+        appearing.set(this.appearing);
+        this.appearing = appearing;
+        this.fromX = copyF(this.fromX);
+        this.fromY = copyF(this.fromY);
+        this.toX = copyF(this.toX);
+        this.toY = copyF(this.toY);
+        this.curX = copyF(this.curX);
+        this.curY = copyF(this.curY);
+    }
+}
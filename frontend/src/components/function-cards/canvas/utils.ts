@@ -1,5 +1,7 @@
 
-import type { ElevatorDict, FloorDict, PassengerDict } from "@/contexts_and_type";
+import type { ElevatorDict } from "@/contexts_and_type";
+import { STATUS_WAITING, STATUS_IN_ELEVATOR, STATUS_ARRIVED } from "@/lib/scene-store";
+import type { SceneStore } from "@/lib/scene-store";
 
 export default class SceneCanvasUtils {
     floorHeight = 40;
@@ -57,82 +59,76 @@ export default class SceneCanvasUtils {
         return { x, y };
     }
 
-    getAllPassengersPosition(floorDicts: FloorDict[], elevatorDicts: ElevatorDict[], passengerDicts: PassengerDict[]) {
+    /**
+     * Lay out every passenger of the store into the typed arrays `xs` / `ys`
+     * (indexed by store slot). Passengers without a position get NaN.
+     */
+    layoutPassengers(store: SceneStore, xs: Float32Array, ys: Float32Array) {
+        xs.fill(NaN, 0, store.passengerCount);
+        ys.fill(NaN, 0, store.passengerCount);
+
         // waiting passengers on each floor
-        const waitingPassengersPosition: { [key: number]: { x: number; y: number; } } = {};
-        floorDicts.forEach((floor) => {
+        store.floors.forEach((floor) => {
             // two rows, first one for up passengers, second one for down passengers,
             // right align to the waitingQueueRightX
             const onY = this.getFloorY(floor.id+1) + this.padding_small * 1.5;
             const downY = this.getFloorY(floor.id+1) + this.elevatorCellSize + this.padding_small * 0.5;
-            
+
             floor.up_queue.forEach((pid, index) => {
-                if(passengerDicts.find(p=>p.id===pid)?.status !== 'waiting') return;
-                const x = this.waitingQueueRightX - (index+1) * this.elevatorCellSize + this.padding_small;
-                const y = onY;
-                waitingPassengersPosition[pid]=({ x, y });
+                const slot = store.slotOf.get(pid);
+                if (slot === undefined || store.status[slot] !== STATUS_WAITING) return;
+                xs[slot] = this.waitingQueueRightX - (index+1) * this.elevatorCellSize + this.padding_small;
+                ys[slot] = onY;
             });
 
             floor.down_queue.forEach((pid, index) => {
-                if(passengerDicts.find(p=>p.id===pid)?.status !== 'waiting') return;
-                const x = this.waitingQueueRightX - (index+1) * this.elevatorCellSize + this.padding_small;
-                const y = downY;
-                waitingPassengersPosition[pid]=({ x, y });
+                const slot = store.slotOf.get(pid);
+                if (slot === undefined || store.status[slot] !== STATUS_WAITING) return;
+                xs[slot] = this.waitingQueueRightX - (index+1) * this.elevatorCellSize + this.padding_small;
+                ys[slot] = downY;
             });
-            
         });
 
         // in-elevator passengers
-        const inElevatorPassengersPosition: { [key: number]: { x: number; y: number; } } = {};
-        elevatorDicts.forEach((elevator) => {
+        store.elevators.forEach((elevator) => {
             const { x: ex, y: ey } = this.getElevatorPosition(elevator);
             elevator.passengers.forEach((pid, index) => {
-                if(passengerDicts.find(p=>p.id===pid)?.status !== 'in_elevator') return;
+                const slot = store.slotOf.get(pid);
+                if (slot === undefined || store.status[slot] !== STATUS_IN_ELEVATOR) return;
                 const row = index % 2;
                 const col = Math.floor(index / 2);
-                const x = ex + this.floorHeight + this.padding_small + col * this.elevatorCellSize;
-                const y = row ==0 ? ey + this.padding_small*1.5 :
+                xs[slot] = ex + this.floorHeight + this.padding_small + col * this.elevatorCellSize;
+                ys[slot] = row ==0 ? ey + this.padding_small*1.5 :
                     ey + this.elevatorCellSize + this.padding_small*0.5;
-                inElevatorPassengersPosition[pid] = ({ x, y });
             });
         });
 
         // arrived passengers on each floor
-        const arrivedPassengersPosition: { [key: number]: { x: number; y: number; } } = {};
-        const arrivedPassengersOnEachFloor: { [key: number]: PassengerDict[] } = {};
-        passengerDicts.forEach((passenger) => {
-            if (passenger.status === 'arrived') {
-                if (!(passenger.destination in arrivedPassengersOnEachFloor)) {
-                    arrivedPassengersOnEachFloor[passenger.destination] = [];
-                }
-                arrivedPassengersOnEachFloor[passenger.destination].push(passenger);
-            }
-        });
-        // sort by arrival tick, later arrived at the beginning
-        Object.values(arrivedPassengersOnEachFloor).forEach((passengers) => {
-            passengers.sort((a, b) => b.arrive_tick - a.arrive_tick);
-            if (passengers.length % 2===1) {
-                // add to the front
-                passengers.unshift(null as unknown as PassengerDict);// for layout
+        const arrivedOnEachFloor = new Map<number, number[]>();
+        for (let slot = 0; slot < store.passengerCount; slot++) {
+            if (store.status[slot] !== STATUS_ARRIVED) continue;
+            const floorId = store.destination[slot];
+            let slots = arrivedOnEachFloor.get(floorId);
+            if (!slots) {
+                slots = [];
+                arrivedOnEachFloor.set(floorId, slots);
             }
-        });
-        Object.entries(arrivedPassengersOnEachFloor).forEach(([floorId, passengers]) => {
+            slots.push(slot);
+        }
+        arrivedOnEachFloor.forEach((slots, floorId) => {
+            // sort by arrival tick, later arrived at the beginning
+            slots.sort((a, b) => store.arriveTick[b] - store.arriveTick[a]);
+            // odd count: leave the first cell of the upper row empty for layout
+            const offset = slots.length % 2;
             // two row, left align to the arrivedQueueLeftX
-            const upperY = this.getFloorY(Number(floorId)+1) + this.padding_small * 1.5;
-            const lowerY = this.getFloorY(Number(floorId)+1) + this.elevatorCellSize + this.padding_small * 0.5;
-            var flag = false;
-            passengers.forEach((passenger, index) => {
-                if (!passenger){
-                    flag = true;
-                    return;
-                }
-                const x = this.arrivedQueueLeftX + Math.floor(index / 2) * this.elevatorCellSize + this.padding_small - ((index % 2 === 0&&flag)?this.elevatorCellSize:0);
-                arrivedPassengersPosition[passenger.id] = ({ x, y: index % 2 === 0 ? upperY : lowerY});
+            const upperY = this.getFloorY(floorId+1) + this.padding_small * 1.5;
+            const lowerY = this.getFloorY(floorId+1) + this.elevatorCellSize + this.padding_small * 0.5;
+            slots.forEach((slot, i) => {
+                const index = i + offset;
+                xs[slot] = this.arrivedQueueLeftX + Math.floor(index / 2) * this.elevatorCellSize + this.padding_small - ((index % 2 === 0 && offset === 1) ? this.elevatorCellSize : 0);
+                ys[slot] = index % 2 === 0 ? upperY : lowerY;
             });
         });
-
-        //merge all
-        return { ...waitingPassengersPosition, ...inElevatorPassengersPosition, ...arrivedPassengersPosition };
     }
     
 }
\ No newline at end of file
@@ -5,10 +5,10 @@ import { Table, TableBody, TableCell, TableHead, TableHeader, TableRow } from "@
 
 import WindowCard from "@/components/custom-ui/window-card"
 
-import { MetricsDataContext, LogsDataContext} from '@/contexts_and_type';
+import { MetricsDataContext, LogsDataContext, PerfDataContext } from '@/contexts_and_type';
 
 
-type InfoType = "metrics" | "logs";
+type InfoType = "metrics" | "perf" | "logs";
 
 interface InfoCardProps {
     defaultTab: InfoType;
@@ -17,6 +17,7 @@ function InfoCard({defaultTab}: InfoCardProps) {
 
     const metricsData = useContext(MetricsDataContext);
     const logsData = useContext(LogsDataContext);
+    const perfData = useContext(PerfDataContext);
 
     const [ selectedTab, setSelectedTab ] = useState(defaultTab);
     const logsContainerRef = useRef<HTMLDivElement>(null);
@@ -44,6 +45,7 @@ function InfoCard({defaultTab}: InfoCardProps) {
         <Tabs defaultValue={"metrics"} value={selectedTab} onValueChange={(value) => setSelectedTab(value as InfoType)}>
             <TabsList>
                 <TabsTrigger value="metrics">Metrics</TabsTrigger>
+                <TabsTrigger value="perf">Perf</TabsTrigger>
                 <TabsTrigger value="logs">Logs</TabsTrigger>
             </TabsList>
         </Tabs>
@@ -83,6 +85,43 @@ function InfoCard({defaultTab}: InfoCardProps) {
                 ) : (
                 <p>No metrics data available.</p>
                 )
+            ) : selectedTab === "perf" ? (
+                perfData && Object.keys(perfData.decisions).length > 0 ? (
+                <div className="overflow-hidden rounded-md border">
+                    <p className="text-sm px-2 py-1">
+                        Decision budget: {perfData.budget_ms === null ? "disabled" : `${perfData.budget_ms} ms`}
+                        {perfData.commands && `, commands: ${perfData.commands.issued} issued / ${perfData.commands.sent} sent`}
+                    </p>
+                    <Table>
+                        <TableHeader>
+                        <TableRow>
+                            <TableHead className="h-8">Decision</TableHead>
+                            <TableHead className="h-8">Runs</TableHead>
+                            <TableHead className="h-8">Overruns</TableHead>
+                            <TableHead className="h-8">Fallbacks</TableHead>
+                            <TableHead className="h-8">Bypassed</TableHead>
+                            <TableHead className="h-8">Avg ms</TableHead>
+                            <TableHead className="h-8">Max ms</TableHead>
+                        </TableRow>
+                        </TableHeader>
+                        <TableBody>
+                        {Object.entries(perfData.decisions).map(([kind, perf]) => (
+                            <TableRow key={kind}>
+                            <TableCell className="font-medium h-6 py-1">{kind}</TableCell>
+                            <TableCell className="h-6 py-1">{perf.decisions}</TableCell>
+                            <TableCell className="h-6 py-1">{perf.overruns}</TableCell>
+                            <TableCell className="h-6 py-1">{perf.fallbacks}</TableCell>
+                            <TableCell className="h-6 py-1">{perf.bypassed}</TableCell>
+                            <TableCell className="h-6 py-1">{perf.avg_ms.toFixed(2)}</TableCell>
+                            <TableCell className="h-6 py-1">{perf.max_ms.toFixed(2)}</TableCell>
+                            </TableRow>
+                        ))}
+                        </TableBody>
+                    </Table>
+                </div>
+                ) : (
+                <p>No decision timing data available.</p>
+                )
             ) : (
                 <div 
                 ref={logsContainerRef}
@@ -1,8 +1,9 @@
-import { useContext, useEffect, useState } from 'react';
+import { useContext, useMemo } from 'react';
 
 import { SceneDataContext } from '@/contexts_and_type';
 
-import {ElevatorRect, PassengerCircle, DirectionArrow} from './canvas/animated-elements';
+import {ElevatorRect, DirectionArrow} from './canvas/animated-elements';
+import PassengerLayer from './canvas/passenger-layer';
 import SceneCanvasUtils from './canvas/utils';
 
 
@@ -12,16 +13,19 @@ interface SceneCanvasProps {
 }
 
 export default function SceneCanvas({ width, height }: SceneCanvasProps) {
+    // sceneData is a snapshot posted by the scene worker, passengers are drawn there too
     const sceneData = useContext(SceneDataContext);
-    const [utils, setUtils] = useState<SceneCanvasUtils | null>(null);
+    const building = sceneData?.building;
 
-    useEffect(() => {
-        if (sceneData?.scene?.building) {
-            const { floors, elevators, elevator_capacity } = sceneData.scene.building;
-            const newUtils = new SceneCanvasUtils(width, height, floors, elevators, elevator_capacity);
-            setUtils(newUtils);
-        }
-    }, [sceneData]);
+    // layout only depends on the building and the card size, not on every update
+    // (the snapshot is cloned per message, so depend on the values, not the object)
+    const floors = building?.floors;
+    const elevators = building?.elevators;
+    const elevatorCapacity = building?.elevator_capacity;
+    const utils = useMemo(() => {
+        if (floors === undefined || elevators === undefined || elevatorCapacity === undefined) return null;
+        return new SceneCanvasUtils(width, height, floors, elevators, elevatorCapacity);
+    }, [width, height, floors, elevators, elevatorCapacity]);
 
     return (
         <div
@@ -51,18 +55,15 @@ export default function SceneCanvas({ width, height }: SceneCanvasProps) {
             })}
 
             {/* Direction Arrows */}
-            {utils && sceneData?.scene && (() => {
-                const scene_to_display = sceneData.status === 'updating' ? sceneData.scene : (sceneData.prev_scene ? sceneData.prev_scene : sceneData.scene);
-                const floorDicts = Object.values(scene_to_display.floors);
-                
+            {utils && sceneData && (() => {
                 const arrowX = utils.waitingQueueRightX + utils.padding_small;
-                
-                return floorDicts.flatMap((floor) => {
+
+                return sceneData.floors.flatMap((floor) => {
                     const arrows = [];
                     const upY = utils.getFloorY(floor.id + 1) + utils.padding_small * 1.5;
                     const downY = utils.getFloorY(floor.id + 1) + utils.elevatorCellSize + utils.padding_small * 0.5;
 
-                    if (floor.up_queue.length > 0) {
+                    if (floor.up > 0) {
                         arrows.push(
                             <DirectionArrow
                                 key={`arrow-up-${floor.id}`}
@@ -74,7 +75,7 @@ export default function SceneCanvas({ width, height }: SceneCanvasProps) {
                         );
                     }
 
-                    if (floor.down_queue.length > 0) {
+                    if (floor.down > 0) {
                         arrows.push(
                             <DirectionArrow
                                 key={`arrow-down-${floor.id}`}
@@ -91,48 +92,23 @@ export default function SceneCanvas({ width, height }: SceneCanvasProps) {
             })()}
 
             {/* Elevators */}
-            {
-            utils && sceneData?.scene && (() => {
-                const scene_to_display = sceneData.status === 'updating' ? sceneData.scene : (sceneData.prev_scene ? sceneData.prev_scene : sceneData.scene);
-                const elevators = Object.values(scene_to_display.elevators);
-                return elevators.map((elevator) => {
-                    const { x, y } = utils ? utils.getElevatorPosition(elevator) : { x: 0, y: 0 };
-                    return (
-                        <ElevatorRect
-                            key={'elevator' + elevator.id}
-                            id={String(elevator.id)}
-                            x={x}
-                            y={y}
-                            height={utils ? utils.floorHeight : 40}
-                            width={utils ? utils.elevatorWidth : 40}
-                            elevatorData={elevator}
-                        />
-                    );
-                });
-            })()}
+            {utils && sceneData && sceneData.elevators.map((elevator) => {
+                const { x, y } = utils.getElevatorPosition(elevator);
+                return (
+                    <ElevatorRect
+                        key={'elevator' + elevator.id}
+                        id={String(elevator.id)}
+                        x={x}
+                        y={y}
+                        height={utils.floorHeight}
+                        width={utils.elevatorWidth}
+                        elevatorData={elevator}
+                    />
+                );
+            })}
 
             {/* Passengers */}
-            {utils && sceneData?.scene && (() => {
-                const scene_to_display = sceneData.status === 'updating' ? sceneData.scene : (sceneData.prev_scene ? sceneData.prev_scene : sceneData.scene);
-                const floorDicts = Object.values(scene_to_display.floors);
-                const elevatorDicts = Object.values(scene_to_display.elevators);
-                const passengerDicts = Object.values(scene_to_display.passengers);
-                const PassengersPosition = utils.getAllPassengersPosition(floorDicts, elevatorDicts, passengerDicts);
-                return passengerDicts.map((passenger) => {
-                    const pos = PassengersPosition[passenger.id];
-                    if (!pos) return null;
-                    return (
-                        <PassengerCircle
-                            key={'passenger' + passenger.id}
-                            id={String(passenger.id)}
-                            x={pos.x}
-                            y={pos.y}
-                            size={utils.passengerSize}
-                            canvasWidth={width}
-                        />
-                    );
-                });
-            })()}
+            <PassengerLayer width={width} height={height} />
         </div>
     );
-}
\ No newline at end of file
+}
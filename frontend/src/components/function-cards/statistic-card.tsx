@@ -1,4 +1,4 @@
-import { useState, useEffect, useContext } from "react"
+import { useState, useContext } from "react"
 
 import { Tabs, TabsList, TabsTrigger } from "@/components/ui/tabs"
 import {
@@ -12,7 +12,6 @@ import { Bar, BarChart, CartesianGrid, XAxis } from "recharts"
 import WindowCard from "@/components/custom-ui/window-card"
 
 import { SceneDataContext } from '@/contexts_and_type';
-import { statisticStackNum } from '@/contexts_and_type';
 
 const chartConfig = {
   waiting: {
@@ -37,51 +36,9 @@ interface StatisticCardProps {
 }
 function StatisticCard({defaultTab}: StatisticCardProps) {
 
+    // bucket counts come from the backend histogram
     const sceneData = useContext(SceneDataContext);
-    const [statisticData, setStatisticData] = useState<Array<{timeCost: string, waiting: number, arrived: number}>>([]);
-
-    useEffect(() => {
-        const timeStart = 10;
-        const timeEnd = 90;
-        const timeStep = (timeEnd - timeStart) / (statisticStackNum-2);
-        // generate array like [5, 7.5, 10, ..., 45]
-        const timeArray = Array.from({ length: statisticStackNum }, (_, i) => +(timeStart + i * timeStep).toFixed(1));
-        
-        const currentTick = sceneData?.scene?.current.tick || 0;
-
-        if (sceneData?.scene) {
-            const scene_to_display = sceneData.status === 'updating' ? sceneData.scene : (sceneData.prev_scene ? sceneData.prev_scene : sceneData.scene);
-            const passengers = Object.values(scene_to_display.passengers);
-            // 统计每个时间段的waiting和arrived数量，0~timeStart, timeStart~timeStart+timeStep, ..., timeEnd~infinity
-            const newStatisticData = timeArray.map((time, index) => {
-                const lowerBound = index === 0 ? 0 : timeArray[index - 1];
-                const upperBound = index === statisticStackNum - 1 ? Infinity : time;
-                const waitingCount = passengers.filter(p => {
-                    const cost = currentTick - p.arrive_tick;
-                    return p.status === 'waiting' && cost >= lowerBound && cost < upperBound;
-                }).length;
-                const inElevatorCount = passengers.filter(p => {
-                    const cost = currentTick - p.arrive_tick;
-                    return p.status === 'in_elevator' && cost >= lowerBound && cost < upperBound;
-                }).length;
-                const arrivedCount = passengers.filter(p => {
-                    const cost = (p.dropoff_tick || currentTick) - p.arrive_tick;
-                    return p.status === 'arrived' && cost >= lowerBound && cost < upperBound;
-                }).length;
-                return {
-                    timeCost: index === statisticStackNum - 1 ? `>${timeArray[statisticStackNum - 2]}` : `<${time}`,
-                    waiting: waitingCount,
-                    inElevator: inElevatorCount,
-                    arrived: arrivedCount,
-                };
-            });
-            setStatisticData(newStatisticData);
-        } else {
-            setStatisticData([]);
-        }
-        
-
-    }, [sceneData]);
+    const statisticData = sceneData?.statistics ?? [];
 
     const [ selectedTab, setSelectedTab ] = useState(defaultTab);
 
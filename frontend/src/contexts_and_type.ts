@@ -59,13 +59,41 @@ export type SceneDict = {
     passengers: {
         [key: string]: PassengerDict
     };
-
+    // bucket counts maintained by the backend (controller or state gateway)
+    statistics?: HistogramDict;
 }
 
+export type HistogramDict = {
+    edges: number[];
+    waiting: number[];
+    in_elevator: number[];
+    arrived: number[];
+};
+
+export type SceneStatus = 'updating' | 'finished';
+
+export type FloorSummary = {
+    id: number;
+    up: number;
+    down: number;
+};
+
+export type StatisticRow = {
+    timeCost: string;
+    waiting: number;
+    inElevator: number;
+    arrived: number;
+};
+
+// Light snapshot posted by the scene worker; passengers stay inside the worker
 export type SceneData = {
-    status?: string;
-    scene?: SceneDict;
-    prev_scene?: SceneDict;
+    status: SceneStatus;
+    version: number;
+    building: SceneDict['building'] | null;
+    current: SceneDict['current'];
+    elevators: ElevatorDict[];
+    floors: FloorSummary[];
+    statistics: StatisticRow[];
 }
 
 export type MetricsData = {
@@ -76,6 +104,31 @@ export type MetricsData = {
     p95_floor_wait_time: number;
     p95_arrival_wait_time: number;
     completion_rate: number; // percentage
+    // per-run cost breakdown reported by the backend
+    cost_wait_ticks?: number;
+    cost_ride_ticks?: number;
+    cost_stops?: number;
+    cost_starts?: number;
+    cost_distance?: number;
+    cost_energy?: number;
+    cost_total?: number;
+}
+
+// 调度决策耗时统计 (server_perf_update)
+export interface DecisionPerf {
+    decisions: number;
+    overruns: number;
+    fallbacks: number;
+    bypassed: number;
+    avg_ms: number;
+    max_ms: number;
+}
+
+export interface PerfData {
+    budget_ms: number | null;
+    decisions: Record<string, DecisionPerf>;
+    // 电梯命令: 控制器下达的条数 / 按电梯合并后实际发送的条数
+    commands?: { issued: number; sent: number };
 }
 
 // Contexts
@@ -84,6 +137,7 @@ export const SocketContext = createContext(null as WebSocket | null);
 export const SceneDataContext = createContext({} as SceneData | null);
 export const MetricsDataContext = createContext({} as MetricsData | null);
 export const LogsDataContext = createContext([] as string[]);
+export const PerfDataContext = createContext(null as PerfData | null);
 export const LayoutChangeTriggerContext = createContext(false as boolean);
 
 // custom update log hook
@@ -0,0 +1,114 @@
+import type { ElevatorDict, FloorDict, PassengerStatus, SceneDict } from '@/contexts_and_type';
+
+// passenger status codes used in the typed arrays
+export const STATUS_WAITING = 0;
+export const STATUS_IN_ELEVATOR = 1;
+export const STATUS_ARRIVED = 2;
+
+const statusCode: Record<PassengerStatus, number> = {
+    waiting: STATUS_WAITING,
+    in_elevator: STATUS_IN_ELEVATOR,
+    arrived: STATUS_ARRIVED,
+};
+
+const initialCapacity = 256;
+
+/**
+ * Normalized scene store.
+ *
+ * Elevators and floors are kept as objects in Maps and updated in place;
+ * passengers are stored column-wise in typed arrays (one slot per passenger),
+ * so a scene update never copies the whole scene and the canvas / statistics
+ * can iterate plain numeric arrays instead of thousands of objects.
+ */
+export class SceneStore {
+    building: SceneDict['building'] | null = null;
+    current: SceneDict['current'] = { tick: 0 };
+    elevators = new Map<number, ElevatorDict>();
+    floors = new Map<number, FloorDict>();
+
+    // passenger columns, valid in [0, passengerCount)
+    passengerCount = 0;
+    slotOf = new Map<number, number>();
+    ids = new Int32Array(initialCapacity);
+    origin = new Int32Array(initialCapacity);
+    destination = new Int32Array(initialCapacity);
+    arriveTick = new Int32Array(initialCapacity);
+    dropoffTick = new Int32Array(initialCapacity);
+    status = new Uint8Array(initialCapacity);
+
+    // bumped on every applied update, used as a cheap change signal
+    version = 0;
+
+    reset() {
+        this.building = null;
+        this.current = { tick: 0 };
+        this.elevators.clear();
+        this.floors.clear();
+        this.passengerCount = 0;
+        this.slotOf.clear();
+        this.version++;
+    }
+
+    applyScene(scene: SceneDict) {
+        const building = scene.building;
+        // a different building or a tick going backwards means a new run
+        if (!this.building
+            || scene.current.tick < this.current.tick
+            || this.building.floors !== building.floors
+            || this.building.elevators !== building.elevators
+            || this.building.elevator_capacity !== building.elevator_capacity) {
+            this.reset();
+            this.building = { ...building };
+        }
+        this.current.tick = scene.current.tick;
+        this.current.max_tick = scene.current.max_tick;
+
+        for (const e of Object.values(scene.elevators)) {
+            const prev = this.elevators.get(e.id);
+            if (prev) Object.assign(prev, e);
+            else this.elevators.set(e.id, { ...e });
+        }
+        for (const f of Object.values(scene.floors)) {
+            const prev = this.floors.get(f.id);
+            if (prev) {
+                prev.up_queue = f.up_queue;
+                prev.down_queue = f.down_queue;
+            } else {
+                this.floors.set(f.id, { ...f });
+            }
+        }
+        for (const p of Object.values(scene.passengers)) {
+            let slot = this.slotOf.get(p.id);
+            if (slot === undefined) {
+                slot = this.passengerCount++;
+                this.ensureCapacity(this.passengerCount);
+                this.slotOf.set(p.id, slot);
+                this.ids[slot] = p.id;
+            }
+            this.origin[slot] = p.origin;
+            this.destination[slot] = p.destination;
+            this.arriveTick[slot] = p.arrive_tick;
+            this.dropoffTick[slot] = p.dropoff_tick ?? 0;
+            this.status[slot] = statusCode[p.status];
+        }
+        this.version++;
+    }
+
+    private ensureCapacity(size: number) {
+        if (size <= this.ids.length) return;
+        let capacity = this.ids.length;
+        while (capacity < size) capacity *= 2;
+        const grow = <T extends Int32Array | Uint8Array>(arr: T, make: (n: number) => T) => {
+            const next = make(capacity);
+            next.set(arr);
+            return next;
+        };
+        this.ids = grow(this.ids, n => new Int32Array(n));
+        this.origin = grow(this.origin, n => new Int32Array(n));
+        this.destination = grow(this.destination, n => new Int32Array(n));
+        this.arriveTick = grow(this.arriveTick, n => new Int32Array(n));
+        this.dropoffTick = grow(this.dropoffTick, n => new Int32Array(n));
+        this.status = grow(this.status, n => new Uint8Array(n));
+    }
+}
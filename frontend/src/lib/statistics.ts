@@ -0,0 +1,12 @@
+import type { HistogramDict, StatisticRow } from '@/contexts_and_type';
+
+// 后端已增量维护各区间计数时, 只需把计数转换为图表行
+export function statisticRowsFromHistogram(histogram: HistogramDict): StatisticRow[] {
+    const { edges } = histogram;
+    return histogram.arrived.map((_, index) => ({
+        timeCost: index === edges.length ? `>${edges[edges.length - 1]}` : `<${edges[index]}`,
+        waiting: histogram.waiting[index],
+        inElevator: histogram.in_elevator[index],
+        arrived: histogram.arrived[index],
+    }));
+}
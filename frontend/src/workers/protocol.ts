@@ -0,0 +1,16 @@
+import type { SceneData } from '@/contexts_and_type';
+import type { PassengerColors } from '@/components/function-cards/canvas/passenger-renderer';
+
+// main thread -> worker
+export type ToWorkerMessage =
+    | { kind: 'ws_message'; raw: string }
+    | { kind: 'gateway_message'; raw: string }
+    | { kind: 'start_run' }
+    | { kind: 'canvas'; canvas: OffscreenCanvas; width: number; height: number; dpr: number }
+    | { kind: 'resize'; width: number; height: number; dpr: number }
+    | { kind: 'colors'; colors: PassengerColors };
+
+// worker -> main thread
+export type FromWorkerMessage =
+    | { kind: 'scene'; scene: SceneData }
+    | { kind: 'server_message'; type: string; data: any };
@@ -0,0 +1,8 @@
+import type { ToWorkerMessage } from './protocol';
+
+// Single scene worker for the whole app lifetime (safe under StrictMode double effects)
+export const sceneWorker = new Worker(new URL('./scene-worker.ts', import.meta.url), { type: 'module' });
+
+export function postToSceneWorker(message: ToWorkerMessage, transfer: Transferable[] = []) {
+    sceneWorker.postMessage(message, transfer);
+}
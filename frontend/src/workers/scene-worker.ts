@@ -0,0 +1,157 @@
+// Scene worker: decodes server messages, owns the scene store, aggregates the
+// statistics and draws the passengers on an OffscreenCanvas, so the main thread
+// only receives a small snapshot per update.
+
+import type { HistogramDict, SceneDict, SceneStatus } from '@/contexts_and_type';
+import { SceneStore } from '@/lib/scene-store';
+import { statisticRowsFromHistogram } from '@/lib/statistics';
+import SceneCanvasUtils from '@/components/function-cards/canvas/utils';
+import { PassengerRenderer } from '@/components/function-cards/canvas/passenger-renderer';
+
+import type { FromWorkerMessage, ToWorkerMessage } from './protocol';
+
+// the project is type-checked against the DOM lib, so describe the worker scope locally
+const scope = self as unknown as {
+    postMessage(message: FromWorkerMessage): void;
+    addEventListener(type: 'message', listener: (event: MessageEvent<ToWorkerMessage>) => void): void;
+};
+
+const store = new SceneStore();
+let status: SceneStatus = 'updating';
+// latest server-side histogram, the passengers are never re-binned here
+let histogram: HistogramDict | null = null;
+
+let renderer: PassengerRenderer | null = null;
+let utils: SceneCanvasUtils | null = null;
+let canvasSize = { width: 0, height: 0 };
+let xs = new Float32Array(0);
+let ys = new Float32Array(0);
+let frameHandle = 0;
+
+function post(message: FromWorkerMessage) {
+    scope.postMessage(message);
+}
+
+function ensureUtils() {
+    const building = store.building;
+    if (!building || canvasSize.width === 0) {
+        utils = null;
+        return null;
+    }
+    if (!utils
+        || utils.width !== canvasSize.width
+        || utils.height !== canvasSize.height
+        || utils.floorNumber !== building.floors
+        || utils.elevatorsNumber !== building.elevators
+        || utils.elevatorCapacity !== building.elevator_capacity) {
+        utils = new SceneCanvasUtils(canvasSize.width, canvasSize.height, building.floors, building.elevators, building.elevator_capacity);
+    }
+    return utils;
+}
+
+function renderLoop(now: number) {
+    frameHandle = renderer && renderer.frame(now) ? requestAnimationFrame(renderLoop) : 0;
+}
+
+function renderPassengers() {
+    const layout = ensureUtils();
+    if (!renderer || !layout) return;
+    const count = store.passengerCount;
+    if (xs.length < count) {
+        xs = new Float32Array(Math.max(count, xs.length * 2));
+        ys = new Float32Array(xs.length);
+    }
+    layout.layoutPassengers(store, xs, ys);
+    renderer.setTargets(store.ids, xs, ys, count, layout.passengerSize, performance.now());
+    cancelAnimationFrame(frameHandle);
+    frameHandle = requestAnimationFrame(renderLoop);
+}
+
+function publish() {
+    post({
+        kind: 'scene',
+        scene: {
+            status,
+            version: store.version,
+            building: store.building,
+            current: store.current,
+            elevators: Array.from(store.elevators.values()),
+            floors: Array.from(store.floors.values(), f => ({ id: f.id, up: f.up_queue.length, down: f.down_queue.length })),
+            statistics: histogram ? statisticRowsFromHistogram(histogram) : [],
+        },
+    });
+    renderPassengers();
+}
+
+function onSceneUpdate(scene: SceneDict) {
+    // late frames of the finished run keep it finished,
+    // a smaller tick means a new run has started (the store resets itself)
+    const lateFrame = status === 'finished' && scene.current.tick >= store.current.tick;
+    store.applyScene(scene);
+    histogram = scene.statistics ?? null;
+    status = lateFrame ? 'finished' : 'updating';
+    publish();
+}
+
+function onServerMessage(raw: string) {
+    const message = JSON.parse(raw);
+    if (message.type === 'server_scene_update') {
+        onSceneUpdate(message.data);
+    } else if (message.type === 'server_run_finished' || message.type === 'server_wait_for_confirmation') {
+        status = 'finished';
+        publish();
+    } else {
+        post({ kind: 'server_message', type: message.type, data: message.data });
+    }
+}
+
+// payload of the backend state gateway: {tick, finished, scene, metrics}
+function onGatewayMessage(raw: string) {
+    const payload = JSON.parse(raw);
+    const wasFinished = status === 'finished';
+    store.applyScene(payload.scene);
+    histogram = payload.scene.statistics ?? null;
+    status = payload.finished ? 'finished' : 'updating';
+    publish();
+    if (payload.finished && !wasFinished) {
+        post({ kind: 'server_message', type: 'server_metrics_update', data: payload.metrics });
+    } else if (!payload.finished && wasFinished) {
+        post({ kind: 'server_message', type: 'server_metrics_update', data: null });
+    }
+}
+
+scope.addEventListener('message', (event: MessageEvent<ToWorkerMessage>) => {
+    const message = event.data;
+    switch (message.kind) {
+        case 'ws_message':
+            onServerMessage(message.raw);
+            break;
+        case 'gateway_message':
+            onGatewayMessage(message.raw);
+            break;
+        case 'start_run':
+            store.reset();
+            histogram = null;
+            status = 'updating';
+            publish();
+            break;
+        case 'canvas': {
+            const ctx = message.canvas.getContext('2d');
+            if (!ctx) break;
+            renderer = new PassengerRenderer(ctx);
+            canvasSize = { width: message.width, height: message.height };
+            renderer.resize(message.width, message.height, message.dpr);
+            renderPassengers();
+            break;
+        }
+        case 'resize':
+            canvasSize = { width: message.width, height: message.height };
+            renderer?.resize(message.width, message.height, message.dpr);
+            renderPassengers();
+            break;
+        case 'colors':
+            if (renderer) renderer.colors = message.colors;
+            renderPassengers();
+            break;
+    }
+});